@@ -6,7 +6,8 @@ Sources:
 - Standard Ebooks: beautifully formatted public domain texts
 - Government: technical/explanatory writing from US agencies
 - Project Gutenberg: plain text downloads of classic literature
-- Wikibooks: educational/instructional textbook prose
+- Wikibooks: educational/instructional textbook prose, through the MediaWiki
+  API (see mediawiki.py) unless --wikibooks-mode html is given
 
 Usage:
     uv run --group notebooks python scripts/fetch_samples.py
@@ -15,6 +16,13 @@ Usage:
     uv run --group notebooks python scripts/fetch_samples.py --source government
     uv run --group notebooks python scripts/fetch_samples.py --source gutenberg
     uv run --group notebooks python scripts/fetch_samples.py --source wikibooks
+    uv run --group notebooks python scripts/fetch_samples.py --source wikibooks-books
+    uv run --group notebooks python scripts/fetch_samples.py --no-dedupe
+
+New excerpts that nearly duplicate a sample already in the corpus are dropped
+(see near_duplicates.py). Their MinHash signatures are kept in
+samples/human_written/.minhash.json, so later runs only hash new or changed
+excerpts and skip the ones already dropped.
 """
 
 import argparse
@@ -26,6 +34,8 @@ from typing import TYPE_CHECKING, TypedDict
 
 import httpx
 from bs4 import BeautifulSoup
+from mediawiki import MediaWikiClient, MediaWikiError, page_title, page_url, wikitext_paragraphs
+from near_duplicates import THRESHOLD, Deduplicator
 
 if TYPE_CHECKING:
     from bs4.element import Tag
@@ -58,6 +68,15 @@ class WikibooksSource(TypedDict):
     title: str
     source: str
 
+
+class WikibooksBook(TypedDict):
+    """Configuration for a whole Wikibooks book or category."""
+
+    pages: str  # Book title, or a "Category:" title
+    prefix: str
+    source: str
+    max_pages: int
+
 # Curated list of nonfiction books: (author_slug, title_slug, output_filename)
 STANDARD_EBOOKS = [
     # Essays
@@ -172,7 +191,24 @@ WIKIBOOKS_SOURCES: list[WikibooksSource] = [
     },
 ]
 
+# Whole books and categories, fetched through the MediaWiki API
+WIKIBOOKS_BOOKS: list[WikibooksBook] = [
+    {
+        "pages": "First Aid",
+        "prefix": "howto_wikibooks_firstaid",
+        "source": "Wikibooks First Aid",
+        "max_pages": 100,
+    },
+    {
+        "pages": "Category:Book:Human Physiology",
+        "prefix": "textbook_wikibooks_physiology",
+        "source": "Wikibooks Human Physiology",
+        "max_pages": 100,
+    },
+]
+
 OUTPUT_DIR = Path(__file__).parent.parent / "notebooks" / "samples" / "human_written"
+SIGNATURES_FILE = OUTPUT_DIR / ".minhash.json"
 STANDARD_EBOOKS_URL = "https://standardebooks.org/ebooks/{author}/{title}/text/single-page"
 GUTENBERG_URL = "https://www.gutenberg.org/cache/epub/{book_id}/pg{book_id}.txt"
 GUTENBERG_EBOOK_URL = "https://www.gutenberg.org/ebooks/{book_id}"
@@ -330,6 +366,39 @@ def find_suitable_excerpt_from_paragraphs(
     return None
 
 
+def is_fetched(output_path: Path, dedupe: Deduplicator | None) -> bool:
+    """Whether an earlier run saved the sample or dropped it as a near-duplicate."""
+    return output_path.exists() or (dedupe is not None and dedupe.is_rejected(output_path.name))
+
+
+def save_sample(
+    output_path: Path,
+    output_text: str,
+    paragraphs: list[str],
+    *,
+    dedupe: Deduplicator | None = None,
+) -> bool:
+    """Write an excerpt unless it nearly duplicates one already in the corpus.
+
+    Returns True if the excerpt was saved or dropped as a duplicate.
+    """
+    if dedupe is not None:
+        match = dedupe.duplicate_of(output_path.name, "\n\n".join(paragraphs))
+        if match is not None:
+            name, score = match
+            print(f"  Dropped {output_path.name} (near-duplicate of {name}, similarity {score:.2f})")
+            return True
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(output_text, encoding="utf-8")
+    if dedupe is not None:
+        dedupe.record(output_path)
+    word_count = sum(len(p.split()) for p in paragraphs)
+    print(f"  Saved {output_path.name} ({len(paragraphs)} paragraphs, {word_count} words)")
+
+    return True
+
+
 def format_title(slug: str) -> str:
     """Convert a URL slug to a readable title."""
     return slug.replace("-", " ").title()
@@ -379,6 +448,7 @@ def process_standard_ebook(
     output_filename: str,
     *,
     force: bool = False,
+    dedupe: Deduplicator | None = None,
 ) -> bool:
     """Fetch and extract a sample from a single Standard Ebook.
 
@@ -386,8 +456,8 @@ def process_standard_ebook(
     """
     output_path = OUTPUT_DIR / output_filename
 
-    if output_path.exists() and not force:
-        print(f"  Skipping {output_filename} (already exists, use --force to overwrite)")
+    if is_fetched(output_path, dedupe) and not force:
+        print(f"  Skipping {output_filename} (already fetched, use --force to refetch)")
         return True
 
     url = STANDARD_EBOOKS_URL.format(author=author_slug, title=title_slug)
@@ -417,18 +487,14 @@ def process_standard_ebook(
         author_slug, title_slug, section_id, paragraphs
     )
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(output_text, encoding="utf-8")
-    word_count = sum(len(p.split()) for p in paragraphs)
-    print(f"  Saved {output_filename} ({len(paragraphs)} paragraphs, {word_count} words)")
-
-    return True
+    return save_sample(output_path, output_text, paragraphs, dedupe=dedupe)
 
 
 def process_government_source(
     source_config: GovernmentSource,
     *,
     force: bool = False,
+    dedupe: Deduplicator | None = None,
 ) -> bool:
     """Fetch and extract a sample from a government source.
 
@@ -437,8 +503,8 @@ def process_government_source(
     output_filename = source_config["output"]
     output_path = OUTPUT_DIR / output_filename
 
-    if output_path.exists() and not force:
-        print(f"  Skipping {output_filename} (already exists, use --force to overwrite)")
+    if is_fetched(output_path, dedupe) and not force:
+        print(f"  Skipping {output_filename} (already fetched, use --force to refetch)")
         return True
 
     url = source_config["url"]
@@ -492,15 +558,12 @@ def process_government_source(
 
     output_text = create_government_output(source, title, url, selected)
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(output_text, encoding="utf-8")
-    word_count = sum(len(p.split()) for p in selected)
-    print(f"  Saved {output_filename} ({len(selected)} paragraphs, {word_count} words)")
-
-    return True
+    return save_sample(output_path, output_text, selected, dedupe=dedupe)
 
 
-def fetch_standard_ebooks(*, force: bool = False) -> tuple[int, int]:
+def fetch_standard_ebooks(
+    *, force: bool = False, dedupe: Deduplicator | None = None
+) -> tuple[int, int]:
     """Fetch all Standard Ebooks sources.
 
     Returns (success_count, total_count).
@@ -513,13 +576,15 @@ def fetch_standard_ebooks(*, force: bool = False) -> tuple[int, int]:
         if i > 0:
             time.sleep(1)
 
-        if process_standard_ebook(author, title, filename, force=force):
+        if process_standard_ebook(author, title, filename, force=force, dedupe=dedupe):
             success_count += 1
 
     return success_count, len(STANDARD_EBOOKS)
 
 
-def fetch_government_sources(*, force: bool = False) -> tuple[int, int]:
+def fetch_government_sources(
+    *, force: bool = False, dedupe: Deduplicator | None = None
+) -> tuple[int, int]:
     """Fetch all government sources.
 
     Returns (success_count, total_count).
@@ -532,7 +597,7 @@ def fetch_government_sources(*, force: bool = False) -> tuple[int, int]:
         if i > 0:
             time.sleep(1)
 
-        if process_government_source(source_config, force=force):
+        if process_government_source(source_config, force=force, dedupe=dedupe):
             success_count += 1
 
     return success_count, len(GOVERNMENT_SOURCES)
@@ -654,6 +719,7 @@ def process_gutenberg_source(
     source_config: GutenbergSource,
     *,
     force: bool = False,
+    dedupe: Deduplicator | None = None,
 ) -> bool:
     """Fetch and extract a sample from a Gutenberg source.
 
@@ -662,8 +728,8 @@ def process_gutenberg_source(
     output_filename = source_config["output"]
     output_path = OUTPUT_DIR / output_filename
 
-    if output_path.exists() and not force:
-        print(f"  Skipping {output_filename} (already exists, use --force to overwrite)")
+    if is_fetched(output_path, dedupe) and not force:
+        print(f"  Skipping {output_filename} (already fetched, use --force to refetch)")
         return True
 
     book_id = source_config["id"]
@@ -706,15 +772,12 @@ def process_gutenberg_source(
 
     output_text = create_gutenberg_output(title, author, book_id, selected)
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(output_text, encoding="utf-8")
-    word_count = sum(len(p.split()) for p in selected)
-    print(f"  Saved {output_filename} ({len(selected)} paragraphs, {word_count} words)")
-
-    return True
+    return save_sample(output_path, output_text, selected, dedupe=dedupe)
 
 
-def fetch_gutenberg_sources(*, force: bool = False) -> tuple[int, int]:
+def fetch_gutenberg_sources(
+    *, force: bool = False, dedupe: Deduplicator | None = None
+) -> tuple[int, int]:
     """Fetch all Gutenberg sources.
 
     Returns (success_count, total_count).
@@ -727,7 +790,7 @@ def fetch_gutenberg_sources(*, force: bool = False) -> tuple[int, int]:
         if i > 0:
             time.sleep(1)
 
-        if process_gutenberg_source(source_config, force=force):
+        if process_gutenberg_source(source_config, force=force, dedupe=dedupe):
             success_count += 1
 
     return success_count, len(GUTENBERG_SOURCES)
@@ -812,20 +875,52 @@ def create_wikibooks_output(
     return header + body + "\n"
 
 
+def select_wikibooks_excerpt(paragraphs: list[str], url: str) -> list[str] | None:
+    """Pick an excerpt from a Wikibooks page's prose paragraphs.
+
+    Returns None, with a warning, for stubs and pages without a suitable run.
+    """
+    # Check if page is a stub (< 100 words total)
+    total_words = sum(len(p.split()) for p in paragraphs)
+    if total_words < 100:
+        print(
+            f"  Warning: Page appears to be a stub ({total_words} words) at {url}",
+            file=sys.stderr,
+        )
+        return None
+
+    if len(paragraphs) < MIN_PARAGRAPHS:
+        print(
+            f"  Warning: Not enough prose paragraphs found at {url} (found {len(paragraphs)}, need {MIN_PARAGRAPHS})",
+            file=sys.stderr,
+        )
+        return None
+
+    # Find suitable excerpt
+    selected = find_suitable_excerpt_from_paragraphs(paragraphs)
+    if selected is None:
+        print(
+            f"  Warning: Could not find suitable excerpt from {url}",
+            file=sys.stderr,
+        )
+    return selected
+
+
 def process_wikibooks_source(
     source_config: WikibooksSource,
     *,
     force: bool = False,
+    dedupe: Deduplicator | None = None,
 ) -> bool:
-    """Fetch and extract a sample from a Wikibooks source.
+    """Fetch and extract a sample from a rendered Wikibooks page.
 
     Returns True if successful.
     """
     output_filename = source_config["output"]
     output_path = OUTPUT_DIR / output_filename
 
-    if output_path.exists() and not force:
-        print(f"  Skipping {output_filename} (already exists, use --force to overwrite)")
+    if is_fetched(output_path, dedupe) and not force:
+        print(f"  Skipping {output_filename} (already fetched, use --force to refetch)")
         return True
 
     url = source_config["url"]
@@ -843,60 +938,182 @@ def process_wikibooks_source(
     # Extract paragraphs
     paragraphs = extract_wikibooks_paragraphs(soup)
 
-    # Check if page is a stub (< 100 words total)
-    total_words = sum(len(p.split()) for p in paragraphs)
-    if total_words < 100:
-        print(
-            f"  Warning: Page appears to be a stub ({total_words} words) at {url}",
-            file=sys.stderr,
-        )
+    selected = select_wikibooks_excerpt(paragraphs, url)
+    if selected is None:
         return False
 
-    if len(paragraphs) < MIN_PARAGRAPHS:
-        print(
-            f"  Warning: Not enough prose paragraphs found at {url} (found {len(paragraphs)}, need {MIN_PARAGRAPHS})",
-            file=sys.stderr,
-        )
-        return False
+    output_text = create_wikibooks_output(source, title, url, selected)
 
-    # Find suitable excerpt
-    selected = find_suitable_excerpt_from_paragraphs(paragraphs)
+    return save_sample(output_path, output_text, selected, dedupe=dedupe)
+
+
+def process_wikibooks_wikitext(
+    wikitext: str,
+    *,
+    output_filename: str,
+    title: str,
+    source: str,
+    url: str,
+    dedupe: Deduplicator | None = None,
+) -> bool:
+    """Extract and save a sample from a page's wikitext.
+
+    Returns True if successful.
+    """
+    paragraphs = [
+        text
+        for text in (clean_wikibooks_text(p) for p in wikitext_paragraphs(wikitext))
+        if len(text.split()) >= MIN_PARAGRAPH_WORDS
+    ]
+    selected = select_wikibooks_excerpt(paragraphs, url)
     if selected is None:
-        print(
-            f"  Warning: Could not find suitable excerpt from {url}",
-            file=sys.stderr,
-        )
         return False
 
     output_text = create_wikibooks_output(source, title, url, selected)
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(output_text, encoding="utf-8")
-    word_count = sum(len(p.split()) for p in selected)
-    print(f"  Saved {output_filename} ({len(selected)} paragraphs, {word_count} words)")
+    return save_sample(OUTPUT_DIR / output_filename, output_text, selected, dedupe=dedupe)
 
-    return True
 
+def _print_api_usage(client: MediaWikiClient) -> None:
+    print(f"  {client.requests} API requests, {client.bytes_received / 1024:.0f} KiB received")
 
-def fetch_wikibooks_sources(*, force: bool = False) -> tuple[int, int]:
-    """Fetch all Wikibooks sources.
+
+def fetch_wikibooks_sources(
+    *,
+    force: bool = False,
+    dedupe: Deduplicator | None = None,
+    api: bool = True,
+) -> tuple[int, int]:
+    """Fetch all hand-picked Wikibooks pages.
+
+    With ``api``, every page comes from one batched MediaWiki API request;
+    otherwise each rendered page is downloaded and scraped.
 
     Returns (success_count, total_count).
     """
     print("Fetching from Wikibooks...")
     print()
 
-    success_count = 0
-    for i, source_config in enumerate(WIKIBOOKS_SOURCES):
-        if i > 0:
-            time.sleep(1)
+    if not api:
+        success_count = 0
+        for i, source_config in enumerate(WIKIBOOKS_SOURCES):
+            if i > 0:
+                time.sleep(1)
 
-        if process_wikibooks_source(source_config, force=force):
+            if process_wikibooks_source(source_config, force=force, dedupe=dedupe):
+                success_count += 1
+
+        return success_count, len(WIKIBOOKS_SOURCES)
+
+    success_count = 0
+    pending: dict[str, WikibooksSource] = {}
+    for source_config in WIKIBOOKS_SOURCES:
+        output_filename = source_config["output"]
+        if is_fetched(OUTPUT_DIR / output_filename, dedupe) and not force:
+            print(f"  Skipping {output_filename} (already fetched, use --force to refetch)")
             success_count += 1
+        else:
+            pending[page_title(source_config["url"])] = source_config
+
+    if pending:
+        client = MediaWikiClient(user_agent=USER_AGENT)
+        print(f"  Fetching {len(pending)} pages from the MediaWiki API...")
+        try:
+            pages = client.wikitext(pending)
+        except (MediaWikiError, OSError) as e:
+            print(f"  Warning: MediaWiki API request failed: {e}", file=sys.stderr)
+            return success_count, len(WIKIBOOKS_SOURCES)
+        _print_api_usage(client)
+
+        for page, source_config in pending.items():
+            wikitext = pages.get(page)
+            if wikitext is None:
+                print(f"  Warning: Page not found: {page}", file=sys.stderr)
+                continue
+            if process_wikibooks_wikitext(
+                wikitext,
+                output_filename=source_config["output"],
+                title=source_config["title"],
+                source=source_config["source"],
+                url=source_config["url"],
+                dedupe=dedupe,
+            ):
+                success_count += 1
 
     return success_count, len(WIKIBOOKS_SOURCES)
 
 
+def wikibooks_output_name(prefix: str, title: str) -> str:
+    """Name the sample file for a page of a book, such as ``prefix_overview.txt``."""
+    subpage = title.rsplit("/", 1)[-1] if "/" in title else "main"
+    slug = re.sub(r"\W+", "_", subpage.lower()).strip("_")
+    return f"{prefix}_{slug}.txt"
+
+
+def fetch_wikibooks_books(
+    *, force: bool = False, dedupe: Deduplicator | None = None
+) -> tuple[int, int]:
+    """Fetch excerpts from every page of whole Wikibooks books and categories.
+
+    Each book takes one request to list its pages and one per
+    ``mediawiki.BATCH_SIZE`` pages for their wikitext.
+
+    Returns (success_count, total_count).
+    """
+    print("Fetching whole books from Wikibooks...")
+    print()
+
+    client = MediaWikiClient(user_agent=USER_AGENT)
+    success_count = 0
+    total_count = 0
+    for book in WIKIBOOKS_BOOKS:
+        pages = book["pages"]
+        print(f"  Listing {pages}...")
+        try:
+            if pages.startswith("Category:"):
+                titles = client.category_pages(pages)
+            else:
+                titles = client.book_pages(pages)
+        except (MediaWikiError, OSError) as e:
+            print(f"  Warning: Could not list {pages}: {e}", file=sys.stderr)
+            continue
+        titles = titles[: book["max_pages"]]
+        total_count += len(titles)
+
+        pending: dict[str, str] = {}
+        for title in titles:
+            output_filename = wikibooks_output_name(book["prefix"], title)
+            if is_fetched(OUTPUT_DIR / output_filename, dedupe) and not force:
+                success_count += 1
+            else:
+                pending[title] = output_filename
+        if not pending:
+            print(f"  Skipping {pages} (all pages already fetched, use --force to refetch)")
+            continue
+
+        print(f"  Fetching {len(pending)} pages...")
+        try:
+            wikitexts = client.wikitext(pending)
+        except (MediaWikiError, OSError) as e:
+            print(f"  Warning: MediaWiki API request failed: {e}", file=sys.stderr)
+            continue
+
+        for title, output_filename in pending.items():
+            wikitext = wikitexts.get(title)
+            if wikitext is not None and process_wikibooks_wikitext(
+                wikitext,
+                output_filename=output_filename,
+                title=title,
+                source=book["source"],
+                url=page_url(title),
+                dedupe=dedupe,
+            ):
+                success_count += 1
+
+    _print_api_usage(client)
+    return success_count, total_count
+
+
 def main() -> int:
     """Run the sample fetcher."""
     parser = argparse.ArgumentParser(
@@ -909,39 +1126,81 @@ def main() -> int:
     )
     parser.add_argument(
         "--source",
-        choices=["standard-ebooks", "government", "gutenberg", "wikibooks", "all"],
+        choices=[
+            "standard-ebooks",
+            "government",
+            "gutenberg",
+            "wikibooks",
+            "wikibooks-books",
+            "all",
+        ],
         default="all",
         help="Which sources to fetch (default: all)",
     )
+    parser.add_argument(
+        "--wikibooks-mode",
+        choices=["api", "html"],
+        default="api",
+        help="Fetch Wikibooks pages in batches from the MediaWiki API or scrape each rendered page (default: api)",
+    )
+    parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Keep excerpts that nearly duplicate existing samples",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help=f"Similarity at which an excerpt counts as a duplicate (default: {THRESHOLD})",
+    )
     args = parser.parse_args()
 
+    dedupe = None
+    if not args.no_dedupe:
+        dedupe = Deduplicator(SIGNATURES_FILE, args.threshold)
+        hashed = dedupe.load(sorted(OUTPUT_DIR.glob("*.txt")))
+        print(f"Loaded {len(dedupe.index.signatures)} sample signatures ({hashed} newly hashed)")
+        print()
+
     total_success = 0
     total_count = 0
 
     if args.source in ("standard-ebooks", "all"):
-        success, count = fetch_standard_ebooks(force=args.force)
+        success, count = fetch_standard_ebooks(force=args.force, dedupe=dedupe)
         total_success += success
         total_count += count
         print()
 
     if args.source in ("government", "all"):
-        success, count = fetch_government_sources(force=args.force)
+        success, count = fetch_government_sources(force=args.force, dedupe=dedupe)
         total_success += success
         total_count += count
         print()
 
     if args.source in ("gutenberg", "all"):
-        success, count = fetch_gutenberg_sources(force=args.force)
+        success, count = fetch_gutenberg_sources(force=args.force, dedupe=dedupe)
         total_success += success
         total_count += count
         print()
 
     if args.source in ("wikibooks", "all"):
-        success, count = fetch_wikibooks_sources(force=args.force)
+        success, count = fetch_wikibooks_sources(
+            force=args.force, dedupe=dedupe, api=args.wikibooks_mode == "api"
+        )
         total_success += success
         total_count += count
         print()
 
+    if args.source == "wikibooks-books":
+        success, count = fetch_wikibooks_books(force=args.force, dedupe=dedupe)
+        total_success += success
+        total_count += count
+        print()
+
+    if dedupe is not None:
+        dedupe.save()
+
     print(f"Completed: {total_success}/{total_count} sources processed successfully")
 
     return 0 if total_success == total_count else 1
@@ -0,0 +1,229 @@
+"""Batched MediaWiki API client for fetching Wikibooks prose.
+
+Fetching rendered pages costs one request per page plus the navigation
+chrome around every article. The API returns the wikitext of up to
+``BATCH_SIZE`` pages per request, gzip-compressed, and lists every page of
+a book or category in a request or two, so whole textbooks arrive in a few
+round trips.
+
+Raw wikitext is the only form of a page's content that the API batches.
+``action=parse`` renders one page per request, and TextExtracts
+(``prop=extracts``) returns whole-page extracts for only one page per
+request as well. So this module fetches wikitext and turns it into prose
+itself, with :func:`wikitext_paragraphs`.
+
+Only the standard library is used, so the tests can run this module
+against a local stand-in server without the notebooks dependencies.
+"""
+
+import gzip
+import json
+import re
+from typing import TYPE_CHECKING, cast
+from urllib.parse import unquote, urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+WIKIBOOKS_API = "https://en.wikibooks.org/w/api.php"
+# Most titles the API accepts in one query for clients without bot rights.
+BATCH_SIZE = 50
+LIST_LIMIT = 500
+
+Query = dict[str, object]
+
+
+class MediaWikiError(Exception):
+    """Raised when the API reports an error."""
+
+
+class MediaWikiClient:
+    """Client for the query module of one MediaWiki API endpoint.
+
+    Attributes:
+        requests: Number of HTTP requests made so far.
+        bytes_received: Response bytes read so far, before decompression.
+    """
+
+    def __init__(self, api_url: str = WIKIBOOKS_API, *, user_agent: str, timeout: float = 30.0) -> None:
+        """Query ``api_url``, identifying as ``user_agent`` as the API asks clients to."""
+        self.api_url: str = api_url
+        self.user_agent: str = user_agent
+        self.timeout: float = timeout
+        self.requests: int = 0
+        self.bytes_received: int = 0
+
+    def _get(self, params: dict[str, str]) -> dict[str, object]:
+        query = urlencode({**params, "format": "json", "formatversion": "2"})
+        request = Request(
+            f"{self.api_url}?{query}",
+            headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip"},
+        )
+        with urlopen(request, timeout=self.timeout) as response:
+            body = cast("bytes", response.read())
+            encoding = cast("str | None", response.headers.get("Content-Encoding"))
+        self.requests += 1
+        self.bytes_received += len(body)
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        data = cast("dict[str, object]", json.loads(body))
+        if "error" in data:
+            error = cast("dict[str, str]", data["error"])
+            msg = f"{error.get('code')}: {error.get('info')}"
+            raise MediaWikiError(msg)
+        return data
+
+    def query(self, params: dict[str, str]) -> "Iterator[Query]":
+        """Run an ``action=query`` request and yield each continuation's results."""
+        params = {"action": "query", **params}
+        while True:
+            data = self._get(params)
+            if "query" in data:
+                yield cast("Query", data["query"])
+            if "continue" not in data:
+                return
+            params = {**params, **cast("dict[str, str]", data["continue"])}
+
+    def book_pages(self, book: str) -> list[str]:
+        """Return the titles of a book's main page and all its subpages."""
+        titles = [book]
+        for result in self.query(
+            {"list": "allpages", "apprefix": f"{book}/", "aplimit": str(LIST_LIMIT)}
+        ):
+            titles.extend(_titles(result, "allpages"))
+        return titles
+
+    def category_pages(self, category: str) -> list[str]:
+        """Return the titles of the main-namespace pages in a category."""
+        titles: list[str] = []
+        for result in self.query(
+            {
+                "list": "categorymembers",
+                "cmtitle": category,
+                "cmnamespace": "0",
+                "cmlimit": str(LIST_LIMIT),
+            }
+        ):
+            titles.extend(_titles(result, "categorymembers"))
+        return titles
+
+    def wikitext(self, titles: "Iterable[str]") -> dict[str, str]:
+        """Return the current wikitext of pages, ``BATCH_SIZE`` titles per request.
+
+        Results are keyed by the titles as requested, following
+        normalization and redirects. Missing pages are left out.
+        """
+        pages: dict[str, str] = {}
+        pending = list(dict.fromkeys(titles))
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = pending[start : start + BATCH_SIZE]
+            resolved = {title: title for title in batch}
+            content: dict[str, str] = {}
+            for result in self.query(
+                {
+                    "titles": "|".join(batch),
+                    "prop": "revisions",
+                    "rvprop": "content",
+                    "rvslots": "main",
+                    "redirects": "1",
+                }
+            ):
+                for key in ("normalized", "redirects"):
+                    for change in cast("list[dict[str, str]]", result.get(key, [])):
+                        for title, target in resolved.items():
+                            if target == change["from"]:
+                                resolved[title] = change["to"]
+                for page in cast("list[dict[str, object]]", result.get("pages", [])):
+                    revisions = cast("list[dict[str, object]]", page.get("revisions", []))
+                    if revisions:
+                        slots = cast("dict[str, dict[str, str]]", revisions[0]["slots"])
+                        content[cast("str", page["title"])] = slots["main"]["content"]
+            for title, target in resolved.items():
+                if target in content:
+                    pages[title] = content[target]
+        return pages
+
+
+def _titles(result: Query, key: str) -> list[str]:
+    return [page["title"] for page in cast("list[dict[str, str]]", result.get(key, []))]
+
+
+def page_title(url: str) -> str:
+    """Return the page title of a ``/wiki/`` URL."""
+    path = urlsplit(url).path
+    return unquote(path.split("/wiki/", 1)[1]).replace("_", " ")
+
+
+def page_url(title: str, api_url: str = WIKIBOOKS_API) -> str:
+    """Return the article URL of ``title`` on the wiki that serves ``api_url``."""
+    base = api_url.removesuffix("/w/api.php")
+    return f"{base}/wiki/{title.replace(' ', '_')}"
+
+
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_REF = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+_TEMPLATE = re.compile(r"\{\{([^{}|]*)((?:\|[^{}]*)?)\}\}")
+# Templates that link to a sister project and render as their label, such as
+# ``{{w|Guido van Rossum}}`` or ``{{w|Python (programming language)|Python}}``.
+_LINK_TEMPLATES = frozenset({"w", "wp", "wikt"})
+_TABLE = re.compile(r"^\{\|.*?^\|\}", re.DOTALL | re.MULTILINE)
+# Media, categories, and interlanguage links render nowhere in the prose.
+_HIDDEN = r"(?:File|Image|Category|[a-z]{2,3}(?:-[a-z]+)?):"
+_MEDIA_LINK = re.compile(rf"\[\[(?i:{_HIDDEN})[^\[\]]*\]\]")
+_LINK = re.compile(rf"\[\[(?!(?i:{_HIDDEN}))(?:[^\[\]|]*\|)?([^\[\]|]*)\]\]")
+_EXTERNAL_LINK = re.compile(r"\[(?:https?:)?//\S+(?: ([^\]]*))?\]")
+_EMPHASIS = re.compile(r"'{2,}")
+_TAG = re.compile(r"<[^>]+>")
+# Headings, lists, indents, definitions, and table or template remnants.
+_NOT_PROSE = re.compile(r"^\s*[=*#:;|!{}]")
+
+
+def _strip_nested(
+    pattern: re.Pattern[str], replacement: "str | Callable[[re.Match[str]], str]", text: str
+) -> str:
+    """Apply ``pattern`` until it stops matching, innermost constructs first."""
+    while True:
+        text, count = pattern.subn(replacement, text)
+        if not count:
+            return text
+
+
+def _template_text(match: re.Match[str]) -> str:
+    """Return the text a template renders in running prose.
+
+    Link templates render as their label, which is their last positional
+    argument. Other templates are boxes, infoboxes, or markup and are dropped.
+    """
+    name = match.group(1).strip().replace("_", " ")
+    if name[:1].lower() + name[1:] not in _LINK_TEMPLATES:
+        return ""
+    positional = [arg for arg in match.group(2).split("|")[1:] if "=" not in arg]
+    return positional[-1].strip() if positional else ""
+
+
+def wikitext_paragraphs(wikitext: str) -> list[str]:
+    """Return the prose paragraphs of ``wikitext`` as plain text.
+
+    Tables, references, media, categories, and templates other than link
+    templates are dropped. Links and link templates keep only their label.
+    Headings, lists, and indented lines end a paragraph and are left out.
+    """
+    text = _COMMENT.sub("", wikitext)
+    text = _REF.sub("", text)
+    text = _strip_nested(_TEMPLATE, _template_text, text)
+    text = _TABLE.sub("", text)
+    text = _strip_nested(_MEDIA_LINK, "", _strip_nested(_LINK, r"\1", text))
+    text = _EXTERNAL_LINK.sub(lambda m: m.group(1) or "", text)
+    text = _TAG.sub("", _EMPHASIS.sub("", text))
+
+    paragraphs: list[str] = []
+    lines: list[str] = []
+    for line in [*text.splitlines(), ""]:
+        if line.strip() and not _NOT_PROSE.match(line):
+            lines.append(line)
+            continue
+        if paragraph := " ".join(" ".join(lines).split()):
+            paragraphs.append(paragraph)
+        lines = []
+    return paragraphs
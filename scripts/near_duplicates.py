@@ -0,0 +1,257 @@
+"""Near-duplicate detection for the sample corpus with MinHash and LSH.
+
+Each excerpt becomes a set of word shingles (runs of ``SHINGLE_SIZE``
+consecutive words). A MinHash signature summarizes that set in
+``NUM_PERMUTATIONS`` integers, and the fraction of positions where two
+signatures agree estimates the Jaccard similarity of the two sets.
+
+Comparing every new excerpt against every stored one is quadratic, so
+signatures are split into ``BANDS`` bands of ``ROWS`` rows and indexed by
+band. Only excerpts that share at least one whole band become candidates,
+and only candidates get the full signature comparison. With 32 bands of 4
+rows, pairs at a similarity of 0.5 share a band about 87% of the time,
+while pairs at 0.2 do so about 5% of the time.
+
+Signatures are stored as JSON next to the samples, keyed by a digest of each
+file's contents, so an incremental fetch only hashes the excerpts it adds or
+changes. The store also records the excerpts that were dropped, so later
+fetches skip them without downloading and hashing them again.
+"""
+
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 128
+BANDS = 32
+ROWS = NUM_PERMUTATIONS // BANDS
+THRESHOLD = 0.5
+SEED = 1
+
+# Mersenne prime above the 32-bit shingle hashes, for universal hashing.
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+# Bump when the layout of the signature store changes.
+_STORE_VERSION = 2
+
+Signature = tuple[int, ...]
+
+
+class _Entry(TypedDict):
+    digest: str
+    signature: list[int]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Return the lowercase word shingles of ``text``.
+
+    Texts shorter than ``size`` words yield one shingle of all their words.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest())
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class MinHasher:
+    """Computes MinHash signatures with a fixed family of hash functions."""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = SEED) -> None:
+        """Draw ``num_permutations`` hash functions from ``seed``."""
+        generator = random.Random(seed)
+        self.permutations: list[tuple[int, int]] = [
+            (generator.randrange(1, _PRIME), generator.randrange(_PRIME))
+            for _ in range(num_permutations)
+        ]
+
+    def signature(self, text: str) -> Signature:
+        """Return the MinHash signature of the shingles of ``text``."""
+        hashes = [_hash(shingle) for shingle in shingles(text)] or [0]
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes) for a, b in self.permutations
+        )
+
+
+def similarity(first: Signature, second: Signature) -> float:
+    """Estimate the Jaccard similarity of the sets behind two signatures."""
+    return sum(a == b for a, b in zip(first, second, strict=True)) / len(first)
+
+
+class LSHIndex:
+    """Banded index of signatures for sub-quadratic near-duplicate lookup."""
+
+    def __init__(self, bands: int = BANDS, rows: int = ROWS) -> None:
+        """Create an empty index of ``bands`` bands with ``rows`` rows each."""
+        self.bands: int = bands
+        self.rows: int = rows
+        self.signatures: dict[str, Signature] = {}
+        self._buckets: dict[tuple[int, Signature], set[str]] = {}
+
+    def _keys(self, signature: Signature) -> list[tuple[int, Signature]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, name: str, signature: Signature) -> None:
+        """Index ``signature`` under ``name``, replacing any earlier one."""
+        self.remove(name)
+        self.signatures[name] = signature
+        for key in self._keys(signature):
+            self._buckets.setdefault(key, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        """Drop the signature stored under ``name``, if any."""
+        signature = self.signatures.pop(name, None)
+        if signature is None:
+            return
+        for key in self._keys(signature):
+            bucket = self._buckets[key]
+            bucket.discard(name)
+            if not bucket:
+                del self._buckets[key]
+
+    def candidates(self, signature: Signature) -> set[str]:
+        """Return the names that share at least one band with ``signature``."""
+        names: set[str] = set()
+        for key in self._keys(signature):
+            names.update(self._buckets.get(key, ()))
+        return names
+
+    def nearest(
+        self, signature: Signature, *, exclude: str | None = None
+    ) -> tuple[str, float] | None:
+        """Return the most similar candidate and its estimated similarity."""
+        scored = [
+            (similarity(signature, self.signatures[name]), name)
+            for name in self.candidates(signature)
+            if name != exclude
+        ]
+        if not scored:
+            return None
+        score, name = max(scored)
+        return name, score
+
+
+class Deduplicator:
+    """Rejects excerpts that nearly duplicate ones already in the corpus.
+
+    Signatures persist in ``store`` with a digest of the file each came
+    from. Loading reuses a stored signature only while its file's contents
+    are unchanged and hashes the rest. The store also keeps ``rejected``,
+    the names of dropped excerpts and the samples they duplicated.
+    """
+
+    def __init__(self, store: Path, threshold: float = THRESHOLD) -> None:
+        """Use ``store`` for signatures and flag pairs at ``threshold`` or above."""
+        self.store: Path = store
+        self.threshold: float = threshold
+        self.hasher: MinHasher = MinHasher()
+        self.index: LSHIndex = LSHIndex()
+        self.rejected: dict[str, str] = {}
+        self._digests: dict[str, str] = {}
+
+    def _parameters(self) -> dict[str, int]:
+        return {
+            "shingle_size": SHINGLE_SIZE,
+            "num_permutations": NUM_PERMUTATIONS,
+            "bands": BANDS,
+            "seed": SEED,
+            "version": _STORE_VERSION,
+        }
+
+    def load(self, samples: "Iterable[Path]" = ()) -> int:
+        """Load stored signatures and index ``samples`` not yet stored.
+
+        Samples whose contents changed since their signature was stored are
+        hashed again. Stored signatures for files missing from ``samples``
+        are dropped, and so are rejections of excerpts that now exist or
+        whose duplicated sample is gone. If the hashing parameters have
+        changed, the whole store is discarded. Returns the number of files
+        hashed.
+        """
+        stored: dict[str, _Entry] = {}
+        rejected: dict[str, str] = {}
+        if self.store.exists():
+            data = cast("dict[str, object]", json.loads(self.store.read_text()))
+            if data.get("parameters") == self._parameters():
+                stored = cast("dict[str, _Entry]", data["signatures"])
+                rejected = cast("dict[str, str]", data["rejected"])
+        hashed = 0
+        for path in samples:
+            content = path.read_bytes()
+            digest = _digest(content)
+            entry = stored.get(path.name)
+            if entry is not None and entry["digest"] == digest:
+                signature = tuple(entry["signature"])
+            else:
+                text = content.decode("utf-8", errors="replace")
+                signature = self.hasher.signature(excerpt_body(text))
+                hashed += 1
+            self.index.add(path.name, signature)
+            self._digests[path.name] = digest
+        self.rejected = {
+            name: original
+            for name, original in rejected.items()
+            if name not in self.index.signatures and original in self.index.signatures
+        }
+        return hashed
+
+    def is_rejected(self, name: str) -> bool:
+        """Whether an earlier run dropped the excerpt ``name`` as a duplicate."""
+        return name in self.rejected
+
+    def duplicate_of(self, name: str, text: str) -> tuple[str, float] | None:
+        """Return the sample that ``text`` nearly duplicates, or index it.
+
+        A sample doesn't count as a duplicate of the earlier version of
+        itself, so ``--force`` refetches replace their own signatures.
+        """
+        signature = self.hasher.signature(text)
+        match = self.index.nearest(signature, exclude=name)
+        if match is not None and match[1] >= self.threshold:
+            self.rejected[name] = match[0]
+            return match
+        _ = self.rejected.pop(name, None)
+        self.index.add(name, signature)
+        return None
+
+    def record(self, path: Path) -> None:
+        """Note the digest of a sample written after :meth:`duplicate_of`."""
+        self._digests[path.name] = _digest(path.read_bytes())
+
+    def save(self) -> None:
+        """Write the signatures and rejections to the store."""
+        data = {
+            "parameters": self._parameters(),
+            "signatures": {
+                name: {"digest": self._digests.get(name, ""), "signature": list(signature)}
+                for name, signature in sorted(self.index.signatures.items())
+            },
+            "rejected": dict(sorted(self.rejected.items())),
+        }
+        _ = self.store.write_text(json.dumps(data) + "\n")
+
+
+def excerpt_body(text: str) -> str:
+    """Strip the ``#`` header lines that precede a saved excerpt."""
+    lines = text.splitlines()
+    while lines and (lines[0].startswith("#") or not lines[0].strip()):
+        del lines[0]
+    return "\n".join(lines)
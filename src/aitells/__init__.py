@@ -1,10 +1,31 @@
 """AI Tells: Detect linguistic patterns commonly associated with AI-generated prose."""
 
 from importlib import metadata
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from aitells.analyzer import Analyzer
+    from aitells.findings import Finding
 
 __version__ = metadata.version("aitells")
-__all__ = ["__version__", "main"]
+__all__ = ["Analyzer", "Finding", "__version__", "main"]
+
+# Public names resolved on first access so that `import aitells` stays cheap.
+_LAZY = {"Analyzer": "aitells.analyzer", "Finding": "aitells.findings"}
+
+
+def __getattr__(name: str) -> object:
+    if module := _LAZY.get(name):
+        from importlib import import_module  # noqa: PLC0415
+
+        return cast("object", getattr(import_module(module), name))
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
+def main() -> None:
+    """Run the ``aitells`` console script."""
+    # Deferred so that `import aitells` stays cheap for library users.
+    from aitells.cli import main as run  # noqa: PLC0415
 
-def main() -> None:  # noqa: D103
-    print("Hello from aitells!")  # noqa: T201
+    raise SystemExit(run())
@@ -0,0 +1,6 @@
+"""Allow running as ``python -m aitells``."""
+
+from aitells import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Reusable analyzer for embedding aitells in other programs."""
+
+from __future__ import annotations
+
+import functools
+from itertools import batched
+from typing import TYPE_CHECKING, final
+
+from aitells.config import Settings, load_settings, with_overrides
+from aitells.documents import adapter_for
+from aitells.escalation import escalate
+from aitells.pipeline import Pipeline
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Executor
+    from pathlib import Path
+
+    from aitells.escalation import Candidate, Escalation, Judge
+    from aitells.findings import Finding
+    from aitells.rules import Rule
+
+DEFAULT_PATH = "<text>"
+DEFAULT_BATCH_SIZE = 64
+
+
+@final
+class Analyzer:
+    """Analyzes text with a fixed configuration.
+
+    Building an analyzer resolves the rule selection and compiles patterns;
+    build one and reuse it. An analyzer holds no per-call state, so one
+    instance can serve many threads at once.
+
+    Example:
+        ```python
+        from aitells import Analyzer
+
+        analyzer = Analyzer()
+        for finding in analyzer.analyze("We delve into the details."):
+            print(finding.line, finding.column, finding.name)
+        ```
+    """
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        """Build an analyzer from settings, or from the defaults.
+
+        Raises:
+            UnknownRuleError: If the settings select an unknown rule.
+        """
+        self.settings: Settings = settings or Settings()
+        self._pipeline: Pipeline = Pipeline(
+            self.settings.rules(), self.settings.thresholds
+        )
+
+    @classmethod
+    def from_config(
+        cls,
+        path: Path | None = None,
+        *,
+        select: Iterable[str] | None = None,
+        ignore: Iterable[str] | None = None,
+    ) -> Analyzer:
+        """Build an analyzer from a configuration file.
+
+        Without ``path``, uses the nearest ``aitells.toml`` or
+        ``pyproject.toml`` as the CLI does. ``select`` and ``ignore`` replace
+        the configured selectors.
+
+        Raises:
+            ConfigError: If the configuration file is invalid.
+            UnknownRuleError: If the configuration selects an unknown rule.
+        """
+        settings = with_overrides(
+            load_settings(path),
+            select=None if select is None else tuple(select),
+            ignore=None if ignore is None else tuple(ignore),
+        )
+        return cls(settings)
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """The rules this analyzer runs."""
+        return self._pipeline.rules
+
+    def analyze(
+        self,
+        text: str,
+        *,
+        path: str = DEFAULT_PATH,
+        candidates: list[Candidate] | None = None,
+    ) -> list[Finding]:
+        """Analyze a string and return its findings in source order.
+
+        ``path`` labels the findings and chooses the format adapter by suffix;
+        pass a name ending in ``.md`` to analyze Markdown. If ``candidates``
+        is given, segments that qualify for selected semantic rules are
+        appended to it for :meth:`escalate`.
+        """
+        segments = adapter_for(path).segments(path, text)
+        return self._pipeline.analyze_segments(segments, candidates=candidates)
+
+    def analyze_file(
+        self, path: str | Path, *, candidates: list[Candidate] | None = None
+    ) -> list[Finding]:
+        """Read and analyze one file, collecting ``candidates`` as :meth:`analyze` does.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        return self._pipeline.analyze_file(path, candidates=candidates)
+
+    def escalate(self, candidates: Iterable[Candidate], judge: Judge) -> Escalation:
+        """Judge candidates from a whole run with semantic rules, within budget.
+
+        Candidates are judged highest score first, and the run stops cleanly
+        once the ``[llm]`` token or time budget is spent.
+
+        Example:
+            ```python
+            analyzer = Analyzer(Settings(extend_select=("SE",)))
+            candidates = []
+            for path in paths:
+                findings = analyzer.analyze_file(path, candidates=candidates)
+            result = analyzer.escalate(candidates, judge)
+            ```
+        """
+        return escalate(candidates, judge, self.settings.llm.budget)
+
+    def analyze_many(
+        self,
+        texts: Iterable[str],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        path: str = DEFAULT_PATH,
+    ) -> Iterator[list[Finding]]:
+        """Analyze texts lazily, yielding one list of findings per text, in order.
+
+        Each text's findings are yielded as soon as it's analyzed. Texts are
+        read from ``texts`` at most ``batch_size`` ahead, which bounds memory
+        for unbounded inputs; no setup is shared across a batch yet, and the
+        batch size is there for a path that hands whole batches to a spaCy
+        model's ``nlp.pipe``.
+
+        Raises:
+            ValueError: If ``batch_size`` is less than one.
+        """
+        if batch_size < 1:
+            msg = "batch_size must be at least 1"
+            raise ValueError(msg)
+        for batch in batched(texts, batch_size, strict=False):
+            for text in batch:
+                yield self.analyze(text, path=path)
+
+    async def analyze_async(
+        self,
+        text: str,
+        *,
+        path: str = DEFAULT_PATH,
+        executor: Executor | None = None,
+    ) -> list[Finding]:
+        """Analyze a string in an executor without blocking the event loop.
+
+        Uses the event loop's default executor unless ``executor`` is given.
+        """
+        # Deferred so that the CLI, which has no event loop, doesn't import it.
+        import asyncio  # noqa: PLC0415
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.analyze, text, path=path)
+        return await loop.run_in_executor(executor, call)
@@ -0,0 +1,416 @@
+"""Command-line interface."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+from dataclasses import dataclass
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING, cast, override
+
+from aitells.analyzer import Analyzer
+from aitells.config import ConfigError, load_settings, with_overrides
+from aitells.discovery import FileFinder
+from aitells.output import FORMATS, create_writer, pluralize
+from aitells.rules import Layer, UnknownRuleError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from aitells.config import Settings
+    from aitells.output import Writer
+    from aitells.shard import Shard
+
+EXIT_OK = 0
+EXIT_FINDINGS = 1
+EXIT_ERROR = 2
+
+
+def _split_selectors(value: str) -> tuple[str, ...]:
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+def _error(message: str) -> int:
+    print(f"aitells: {message}", file=sys.stderr)  # noqa: T201
+    return EXIT_ERROR
+
+
+def _shard(value: str) -> Shard:
+    from aitells.shard import parse_shard  # noqa: PLC0415
+
+    try:
+        return parse_shard(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def _add_rule_options(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument(
+        "--select",
+        type=_split_selectors,
+        help="Run only these rules or prefixes (comma-separated).",
+    )
+    _ = parser.add_argument(
+        "--ignore",
+        type=_split_selectors,
+        help="Skip these rules or prefixes (comma-separated).",
+    )
+    _ = parser.add_argument("--config", type=Path, help="Path to configuration file.")
+
+
+def _add_analysis_options(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument("paths", nargs="*", default=["."], type=Path)
+    _add_rule_options(parser)
+    _ = parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=sorted(FORMATS),
+        help="Output format (default: text).",
+    )
+    _ = parser.add_argument(
+        "--quiet", action="store_true", help="Suppress non-error output."
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="aitells",
+        description="Detect linguistic patterns commonly associated with AI prose.",
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    check = subcommands.add_parser(
+        "check", help="Analyze files for AI writing patterns."
+    )
+    _add_analysis_options(check)
+    _ = check.add_argument(
+        "--shard",
+        type=_shard,
+        metavar="I/N",
+        help="Analyze only shard I of N, balanced by file size (for CI runners).",
+    )
+    _ = check.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help=(
+            "Workers to analyze files in: threads on free-threaded Python, "
+            "processes otherwise; 0 for one per CPU (default: 1)."
+        ),
+    )
+
+    merge = subcommands.add_parser(
+        "merge", help="Combine JSON, NDJSON, or SARIF reports from sharded runs."
+    )
+    _ = merge.add_argument("reports", nargs="+", type=Path)
+    _ = merge.add_argument(
+        "--format",
+        dest="output_format",
+        choices=sorted(FORMATS),
+        default="text",
+        help="Output format (default: text).",
+    )
+    _ = merge.add_argument(
+        "--quiet", action="store_true", help="Suppress non-error output."
+    )
+
+    watch = subcommands.add_parser(
+        "watch", help="Re-analyze files as they change, keeping the pipeline loaded."
+    )
+    _add_analysis_options(watch)
+    _ = watch.add_argument(
+        "--debounce",
+        type=float,
+        help="Seconds of quiet before re-analyzing a burst of changes.",
+    )
+    _ = watch.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll modification times instead of using file-system events.",
+    )
+
+    serve = subcommands.add_parser(
+        "serve", help="Serve analysis over HTTP, batching concurrent requests."
+    )
+    _add_rule_options(serve)
+    _ = serve.add_argument("--host", help="Address to bind.")
+    _ = serve.add_argument("--port", type=int, help="Port to listen on.")
+    _ = serve.add_argument(
+        "--workers",
+        type=int,
+        default=os.process_cpu_count() or 1,
+        help="Worker processes (default: number of CPUs).",
+    )
+    _ = serve.add_argument(
+        "--batch-size",
+        type=int,
+        help="Most documents analyzed in one batch.",
+    )
+    _ = serve.add_argument(
+        "--max-latency",
+        type=float,
+        help="Seconds the first document in a batch waits for others.",
+    )
+    _ = serve.add_argument(
+        "--queue-size",
+        type=int,
+        help="Documents waiting before requests are refused with 429.",
+    )
+    _ = serve.add_argument(
+        "--max-body",
+        type=int,
+        help="Largest request body in bytes; larger ones get 413.",
+    )
+    _ = serve.add_argument("--quiet", action="store_true", help="Don't log requests.")
+    return parser
+
+
+class _Discard(io.StringIO):
+    """Output stream for ``--quiet`` that drops everything written to it."""
+
+    @override
+    def write(self, s: str, /) -> int:
+        return len(s)
+
+
+@dataclass(frozen=True)
+class _Context:
+    settings: Settings
+    analyzer: Analyzer
+    finder: FileFinder
+
+
+def _settings(args: argparse.Namespace) -> Settings:
+    """Load settings and apply the rule options that every command shares."""
+    return with_overrides(
+        load_settings(cast("Path | None", args.config)),
+        select=cast("tuple[str, ...] | None", args.select),
+        ignore=cast("tuple[str, ...] | None", args.ignore),
+    )
+
+
+def _context(args: argparse.Namespace) -> _Context:
+    settings = with_overrides(
+        _settings(args),
+        output_format=cast("str | None", args.output_format),
+        quiet=cast("bool", args.quiet) or None,
+    )
+    if settings.output_format not in FORMATS:
+        msg = f"Unknown output format: {settings.output_format!r}"
+        raise ConfigError(msg)
+    analyzer = Analyzer(settings)
+    if not settings.quiet:
+        _warn_semantic(analyzer)
+    return _Context(settings, analyzer, FileFinder(settings.paths, settings.root))
+
+
+def _warn_semantic(analyzer: Analyzer) -> None:
+    """Warn that selected semantic rules won't run from the command line."""
+    codes = [rule.code for rule in analyzer.rules if rule.layer is Layer.LLM]
+    if codes:
+        message = (
+            "warning: semantic rules need a model to judge them and run only "
+            f"through Analyzer.escalate(); skipping {', '.join(codes)}"
+        )
+        _status(message)
+
+
+def _report(
+    context: _Context, paths: Iterable[str], jobs: int = 1
+) -> tuple[Writer, int]:
+    """Analyze files and stream their findings.
+
+    Returns the writer, which holds the counts, and the number of files that
+    couldn't be read.
+    """
+    from aitells.pool import analyze_files  # noqa: PLC0415
+
+    stream = _Discard() if context.settings.quiet else sys.stdout
+    writer = create_writer(context.settings.output_format, stream)
+    errors = 0
+    writer.begin()
+    results = analyze_files(context.analyzer, paths, jobs=jobs, render=writer.render)
+    for path, result, text in results:
+        if isinstance(result, OSError):
+            errors += 1
+            _ = _error(f"{path}: {result.strerror}")
+            continue
+        writer.write(path, result, text)
+    writer.end()
+    return writer, errors
+
+
+def _check(args: argparse.Namespace) -> int:
+    jobs = cast("int", args.jobs)
+    if jobs < 0:
+        return _error("--jobs must be 0 or more")
+    try:
+        context = _context(args)
+    except (ConfigError, UnknownRuleError) as error:
+        return _error(str(error))
+    paths: Iterable[str] = context.finder.discover(cast("list[Path]", args.paths))
+    if (shard := cast("Shard | None", args.shard)) is not None:
+        from aitells.shard import shard_files  # noqa: PLC0415
+
+        paths = shard_files(paths, shard)
+    writer, errors = _report(context, paths, jobs or os.process_cpu_count() or 1)
+    if errors:
+        return EXIT_ERROR
+    return EXIT_FINDINGS if writer.findings else EXIT_OK
+
+
+def _merge(args: argparse.Namespace) -> int:
+    from aitells.shard import Report, ReportError, parse_report  # noqa: PLC0415
+
+    merged = Report()
+    for path in cast("list[Path]", args.reports):
+        try:
+            merged.merge(parse_report(path.read_text(encoding="utf-8")))
+        except OSError as error:
+            return _error(f"{path}: {error.strerror}")
+        except ReportError as error:
+            return _error(f"{path}: {error}")
+    stream = _Discard() if cast("bool", args.quiet) else sys.stdout
+    writer = create_writer(cast("str", args.output_format), stream)
+    writer.begin()
+    for path, findings in groupby(sorted(merged.findings), key=lambda f: f.path):
+        writer.write(path, list(findings))
+    writer.count_clean(max(0, merged.files - writer.files))
+    writer.end()
+    return EXIT_FINDINGS if writer.findings else EXIT_OK
+
+
+def _watch(args: argparse.Namespace) -> int:
+    # Imported here so that other commands don't load ctypes and inotify.
+    from aitells.watch import DEFAULT_DEBOUNCE, Session, create_watcher  # noqa: PLC0415
+
+    try:
+        context = _context(args)
+    except (ConfigError, UnknownRuleError) as error:
+        return _error(str(error))
+    paths = [str(path) for path in cast("list[Path]", args.paths)]
+    quiet = context.settings.quiet
+
+    def analyze(batch: Sequence[str]) -> None:
+        writer, _ = _report(context, batch)
+        if not quiet:
+            files = pluralize(len(batch), "file")
+            _status(f"checked {files}, {pluralize(writer.findings, 'finding')}")
+
+    analyze(list(context.finder.discover(paths)))
+    watcher = create_watcher(context.finder, paths, poll=cast("bool", args.poll))
+    debounce = _option(cast("float | None", args.debounce), DEFAULT_DEBOUNCE)
+    session = Session(context.finder, paths, analyze, watcher, debounce)
+    if not quiet:
+        _status("watching for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            _ = session.step()
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        watcher.close()
+
+
+def _serve(args: argparse.Namespace) -> int:
+    # Imported here so that other commands don't load the HTTP server.
+    from aitells.serve import (  # noqa: PLC0415
+        DEFAULT_BATCH_SIZE,
+        DEFAULT_HOST,
+        DEFAULT_MAX_BODY,
+        DEFAULT_MAX_LATENCY,
+        DEFAULT_PORT,
+        DEFAULT_QUEUE_SIZE,
+        AnalysisServer,
+        Batcher,
+        create_executor,
+    )
+
+    for name in ("workers", "batch_size", "queue_size", "max_body"):
+        value = cast("int | None", getattr(args, name))
+        if value is not None and value < 1:
+            return _error(f"--{name.replace('_', '-')} must be at least 1")
+    try:
+        settings = _settings(args)
+        # Fail on unknown rules here rather than in every worker.
+        analyzer = Analyzer(settings)
+    except (ConfigError, UnknownRuleError) as error:
+        return _error(str(error))
+    _warn_semantic(analyzer)
+    workers = cast("int", args.workers)
+    executor = create_executor(settings, workers)
+    batcher = Batcher(
+        executor,
+        slots=workers,
+        batch_size=_option(cast("int | None", args.batch_size), DEFAULT_BATCH_SIZE),
+        max_latency=_option(
+            cast("float | None", args.max_latency), DEFAULT_MAX_LATENCY
+        ),
+        queue_size=_option(cast("int | None", args.queue_size), DEFAULT_QUEUE_SIZE),
+    )
+    address = (
+        _option(cast("str | None", args.host), DEFAULT_HOST),
+        _option(cast("int | None", args.port), DEFAULT_PORT),
+    )
+    try:
+        server = AnalysisServer(
+            address,
+            batcher,
+            log_requests=not cast("bool", args.quiet),
+            max_body=_option(cast("int | None", args.max_body), DEFAULT_MAX_BODY),
+        )
+    except OSError as error:
+        batcher.close()
+        executor.shutdown()
+        return _error(f"{address[0]}:{address[1]}: {error.strerror}")
+    host, port = server.server_address[:2]
+    _status(f"serving on http://{host!s}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        server.server_close()
+        batcher.close()
+        executor.shutdown()
+    return EXIT_OK
+
+
+def _option[T](value: T | None, default: T) -> T:
+    """Return an option's value, or ``default`` if it wasn't given.
+
+    Options of commands whose modules load lazily default to ``None`` in the
+    parser, so that building it doesn't import those modules for their
+    defaults.
+    """
+    return default if value is None else value
+
+
+def _status(message: str) -> None:
+    print(f"aitells: {message}", file=sys.stderr, flush=True)  # noqa: T201
+
+
+_COMMANDS: dict[str, Callable[[argparse.Namespace], int]] = {
+    "check": _check,
+    "merge": _merge,
+    "watch": _watch,
+    "serve": _serve,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line and return the process exit code."""
+    args = build_parser().parse_args(argv)
+    try:
+        return _COMMANDS[cast("str", args.command)](args)
+    except BrokenPipeError:
+        # The consumer stopped reading (`aitells check | head`). Point stdout at
+        # devnull so the interpreter's final flush doesn't raise again.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        _ = os.dup2(devnull, sys.stdout.fileno())
+    return EXIT_ERROR
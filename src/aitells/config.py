@@ -0,0 +1,338 @@
+"""Configuration loading from ``aitells.toml`` or ``pyproject.toml``."""
+
+from __future__ import annotations
+
+import tomllib
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from aitells.density import DENSITY_RULES
+from aitells.escalation import ESCALATION_RULES, Budget
+from aitells.rules import DEFAULT_SELECT, UnknownRuleError, get_rule, select_rules
+
+if TYPE_CHECKING:
+    from aitells.rules import Rule
+
+CONFIG_FILENAME = "aitells.toml"
+
+DEFAULT_INCLUDE: tuple[str, ...] = ("*.md", "*.txt", "*.rst")
+DEFAULT_EXCLUDE: tuple[str, ...] = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".mypy_cache/",
+    ".nox/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".tox/",
+    ".venv/",
+    "__pycache__/",
+    "build/",
+    "dist/",
+    "node_modules/",
+    "site-packages/",
+    "venv/",
+)
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration file is missing or invalid."""
+
+
+@dataclass(frozen=True)
+class PathSettings:
+    """File selection settings from the ``[paths]`` table.
+
+    Attributes:
+        include: Glob patterns for files to analyze.
+        exclude: Glob patterns for files and directories to skip. Replaces
+            the default list of tool and dependency directories.
+        extend_exclude: Glob patterns to skip in addition to ``exclude``.
+        respect_gitignore: Whether to skip files ignored by ``.gitignore``.
+    """
+
+    include: tuple[str, ...] = DEFAULT_INCLUDE
+    exclude: tuple[str, ...] = DEFAULT_EXCLUDE
+    extend_exclude: tuple[str, ...] = ()
+    respect_gitignore: bool = True
+
+    @property
+    def all_excludes(self) -> tuple[str, ...]:
+        """Combined ``exclude`` and ``extend-exclude`` patterns."""
+        return self.exclude + self.extend_exclude
+
+
+@dataclass(frozen=True)
+class LlmSettings:
+    """Semantic analysis settings from the ``[llm]`` table.
+
+    Attributes:
+        enabled: Whether to run semantic (SE) rules.
+        model: Model to use for semantic analysis.
+        api_key_env: Environment variable containing the API key.
+        max_tokens: Most tokens to spend per run, or ``None`` for no limit.
+        max_seconds: Most seconds to spend per run, or ``None`` for no limit.
+    """
+
+    enabled: bool = False
+    model: str = "claude-3-haiku-20240307"
+    api_key_env: str = "ANTHROPIC_API_KEY"
+    max_tokens: int | None = None
+    max_seconds: float | None = None
+
+    @property
+    def budget(self) -> Budget:
+        """The per-run budget for escalating segments to semantic rules."""
+        return Budget(self.max_tokens, self.max_seconds)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Resolved aitells configuration.
+
+    Attributes:
+        select: Rule codes or prefixes to enable.
+        ignore: Rule codes or prefixes to disable.
+        extend_select: Rule codes or prefixes to enable in addition to ``select``.
+        extend_ignore: Rule codes or prefixes to disable in addition to ``ignore``.
+        paths: File selection settings.
+        thresholds: Density and semantic rule thresholds by rule code.
+        output_format: Output format name.
+        quiet: Whether to suppress non-error output.
+        llm: Semantic analysis settings.
+        root: Directory containing the configuration file, if any.
+    """
+
+    select: tuple[str, ...] = DEFAULT_SELECT
+    ignore: tuple[str, ...] = ()
+    extend_select: tuple[str, ...] = ()
+    extend_ignore: tuple[str, ...] = ()
+    paths: PathSettings = field(default_factory=PathSettings)
+    thresholds: dict[str, int] = field(default_factory=dict[str, int])
+    output_format: str = "text"
+    quiet: bool = False
+    llm: LlmSettings = field(default_factory=LlmSettings)
+    root: Path | None = None
+
+    def rules(self) -> tuple[Rule, ...]:
+        """Resolve the selectors to the rules to run.
+
+        Raises:
+            UnknownRuleError: If a selector matches no rule.
+        """
+        return select_rules(
+            self.select + self.extend_select, self.ignore + self.extend_ignore
+        )
+
+
+def _string_list(
+    table: dict[str, object], key: str, default: tuple[str, ...]
+) -> tuple[str, ...]:
+    value = table.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, list) or not all(
+        isinstance(item, str) for item in cast("list[object]", value)
+    ):
+        msg = f"{key!r} must be a list of strings"
+        raise ConfigError(msg)
+    return tuple(cast("list[str]", value))
+
+
+def _bool(table: dict[str, object], key: str, *, default: bool) -> bool:
+    value = table.get(key, default)
+    if not isinstance(value, bool):
+        msg = f"{key!r} must be true or false"
+        raise ConfigError(msg)
+    return value
+
+
+def _str(table: dict[str, object], key: str, default: str) -> str:
+    value = table.get(key, default)
+    if not isinstance(value, str):
+        msg = f"{key!r} must be a string"
+        raise ConfigError(msg)
+    return value
+
+
+def _table(
+    table: dict[str, object], key: str, keys: set[str] | None, prefix: str = ""
+) -> dict[str, object]:
+    """Return a sub-table, checking its keys unless ``keys`` is ``None``."""
+    value = table.get(key, {})
+    if not isinstance(value, dict):
+        msg = f"{prefix + key!r} must be a table"
+        raise ConfigError(msg)
+    section = cast("dict[str, object]", value)
+    if keys is not None:
+        _check_keys(section, keys, f"{prefix}{key}.")
+    return section
+
+
+def _check_keys(table: dict[str, object], keys: set[str], prefix: str = "") -> None:
+    if unknown := sorted(set(table) - keys):
+        msg = f"Unknown setting: {prefix}{unknown[0]}"
+        raise ConfigError(msg)
+
+
+def _parse_paths(table: dict[str, object]) -> PathSettings:
+    default = PathSettings()
+    return PathSettings(
+        include=_string_list(table, "include", default.include),
+        exclude=_string_list(table, "exclude", default.exclude),
+        extend_exclude=_string_list(table, "extend-exclude", default.extend_exclude),
+        respect_gitignore=_bool(
+            table, "respect-gitignore", default=default.respect_gitignore
+        ),
+    )
+
+
+def _parse_thresholds(table: dict[str, object]) -> dict[str, int]:
+    thresholds: dict[str, int] = {}
+    for key in table:
+        options = _table(table, key, _RULE_KEYS, "rules.")
+        try:
+            rule = get_rule(key)
+        except UnknownRuleError:
+            msg = f"Unknown rule in rules table: {key!r}"
+            raise ConfigError(msg) from None
+        threshold = options.get("threshold")
+        if threshold is None:
+            continue
+        if rule.code not in DENSITY_RULES and rule.code not in ESCALATION_RULES:
+            msg = f"'threshold' applies only to density and semantic rules, not {key!r}"
+            raise ConfigError(msg)
+        if (
+            not isinstance(threshold, int)
+            or isinstance(threshold, bool)
+            or threshold < 1
+        ):
+            msg = f"'threshold' for {key!r} must be a positive integer"
+            raise ConfigError(msg)
+        thresholds[rule.code] = threshold
+    return thresholds
+
+
+def _positive(table: dict[str, object], key: str, kind: type[float]) -> float | None:
+    """Return a positive number, or ``None`` if absent; ``kind=int`` forbids floats."""
+    value = table.get(key)
+    if value is None:
+        return None
+    if (
+        not isinstance(value, int | float)
+        or isinstance(value, bool)
+        or (kind is int and not isinstance(value, int))
+        or value <= 0
+    ):
+        noun = "integer" if kind is int else "number"
+        msg = f"{key!r} must be a positive {noun}"
+        raise ConfigError(msg)
+    return value
+
+
+def _parse_llm(table: dict[str, object]) -> LlmSettings:
+    default = LlmSettings()
+    max_tokens = _positive(table, "max-tokens", int)
+    return LlmSettings(
+        enabled=_bool(table, "enabled", default=default.enabled),
+        model=_str(table, "model", default.model),
+        api_key_env=_str(table, "api-key-env", default.api_key_env),
+        max_tokens=None if max_tokens is None else int(max_tokens),
+        max_seconds=_positive(table, "max-seconds", float),
+    )
+
+
+_TOP_LEVEL_KEYS = {
+    "select",
+    "ignore",
+    "extend-select",
+    "extend-ignore",
+    "paths",
+    "output",
+    "rules",
+    "llm",
+}
+_PATHS_KEYS = {"include", "exclude", "extend-exclude", "respect-gitignore"}
+_OUTPUT_KEYS = {"format", "quiet"}
+_LLM_KEYS = {"enabled", "model", "api-key-env", "max-tokens", "max-seconds"}
+# `enabled` and `ignore-patterns` are reserved for per-rule settings to come.
+_RULE_KEYS = {"enabled", "threshold", "ignore-patterns"}
+
+
+def parse_settings(table: dict[str, object], root: Path | None = None) -> Settings:
+    """Build settings from a parsed ``aitells.toml`` or ``[tool.aitells]`` table.
+
+    Raises:
+        ConfigError: If a setting is unknown or has the wrong type.
+    """
+    _check_keys(table, _TOP_LEVEL_KEYS)
+    paths = _table(table, "paths", _PATHS_KEYS)
+    output = _table(table, "output", _OUTPUT_KEYS)
+    rules = _table(table, "rules", None)
+    llm = _table(table, "llm", _LLM_KEYS)
+    default = Settings()
+    return Settings(
+        select=_string_list(table, "select", default.select),
+        ignore=_string_list(table, "ignore", default.ignore),
+        extend_select=_string_list(table, "extend-select", default.extend_select),
+        extend_ignore=_string_list(table, "extend-ignore", default.extend_ignore),
+        paths=_parse_paths(paths),
+        thresholds=_parse_thresholds(rules),
+        output_format=_str(output, "format", default.output_format),
+        quiet=_bool(output, "quiet", default=default.quiet),
+        llm=_parse_llm(llm),
+        root=root,
+    )
+
+
+def _read_toml(path: Path) -> dict[str, object]:
+    try:
+        with path.open("rb") as file:
+            return tomllib.load(file)
+    except OSError as error:
+        msg = f"Cannot read {path}: {error.strerror}"
+        raise ConfigError(msg) from error
+    except tomllib.TOMLDecodeError as error:
+        msg = f"Invalid TOML in {path}: {error}"
+        raise ConfigError(msg) from error
+
+
+def _tool_table(pyproject: dict[str, object]) -> dict[str, object] | None:
+    tool = pyproject.get("tool")
+    if not isinstance(tool, dict):
+        return None
+    section = cast("dict[str, object]", tool).get("aitells")
+    return cast("dict[str, object]", section) if isinstance(section, dict) else None
+
+
+def load_settings(path: Path | None = None, start: Path | None = None) -> Settings:
+    """Load settings from an explicit file or the nearest configuration file.
+
+    Without an explicit ``path``, searches ``start`` (default: the current
+    directory) and its parents for ``aitells.toml``, or a ``pyproject.toml``
+    with a ``[tool.aitells]`` table. Returns default settings if neither exists.
+
+    Raises:
+        ConfigError: If the configuration file is unreadable or invalid.
+    """
+    if path is not None:
+        document = _read_toml(path)
+        if path.name == "pyproject.toml":
+            document = _tool_table(document) or {}
+        return parse_settings(document, path.resolve().parent)
+    directory = (start or Path.cwd()).resolve()
+    for candidate in (directory, *directory.parents):
+        config = candidate / CONFIG_FILENAME
+        if config.is_file():
+            return parse_settings(_read_toml(config), candidate)
+        pyproject = candidate / "pyproject.toml"
+        if pyproject.is_file() and (section := _tool_table(_read_toml(pyproject))):
+            return parse_settings(section, candidate)
+    return Settings()
+
+
+def with_overrides(settings: Settings, **overrides: object) -> Settings:
+    """Return a copy of ``settings`` with non-``None`` overrides applied."""
+    changes = {k: v for k, v in overrides.items() if v is not None}
+    return replace(settings, **changes)
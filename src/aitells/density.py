@@ -0,0 +1,154 @@
+"""Sliding-window density rules over the pattern layer's hits.
+
+A density rule flags text where hits from some pattern rules cluster: at
+least ``threshold`` of them within ``window`` consecutive sentences or
+paragraphs. All density rules share one :class:`DensityCounter`, which
+consumes the hit stream and the unit boundaries once, in offset order. Each
+rule keeps a ring buffer of per-unit counts and a running total, so advancing
+a unit or adding a hit is constant work per rule; nothing rescans text or
+re-sorts hits.
+
+New density rules are declarations in :data:`DENSITY_RULES`.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+class Unit(Enum):
+    """Unit that a density window spans."""
+
+    SENTENCE = "sentence"
+    PARAGRAPH = "paragraph"
+
+
+@dataclass(frozen=True)
+class DensityRule:
+    """Declaration of a density rule.
+
+    Attributes:
+        code: Code of the rule, such as ``ST003``.
+        sources: Codes of the pattern rules whose hits are counted.
+        noun: What one hit is called in messages, such as ``hedge``.
+        unit: Unit the window spans.
+        window: Number of consecutive units in the window.
+        threshold: Default number of hits in one window that triggers the rule.
+    """
+
+    code: str
+    sources: frozenset[str]
+    noun: str
+    unit: Unit
+    window: int
+    threshold: int
+
+
+DENSITY_RULES: dict[str, DensityRule] = {
+    rule.code: rule
+    for rule in (
+        DensityRule(
+            "ST003",
+            frozenset({"RM002", "VF007"}),
+            "hedge",
+            Unit.SENTENCE,
+            window=3,
+            threshold=3,
+        ),
+        DensityRule(
+            "ST004",
+            frozenset({"VF003"}),
+            "formal transition",
+            Unit.PARAGRAPH,
+            window=4,
+            threshold=3,
+        ),
+    )
+}
+
+
+def _count(count: int, noun: str) -> str:
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+@final
+class _Window:
+    """Ring buffer of per-unit hit counts for one density rule."""
+
+    __slots__ = ("counts", "rule", "threshold", "total")
+
+    def __init__(self, rule: DensityRule, threshold: int) -> None:
+        self.rule: DensityRule = rule
+        self.threshold: int = threshold
+        self.counts: deque[int] = deque(maxlen=rule.window)
+        self.total: int = 0
+
+    def advance(self) -> None:
+        if len(self.counts) == self.rule.window:
+            self.total -= self.counts[0]
+        self.counts.append(0)
+
+    def add(self) -> bool:
+        """Count a hit and return whether the total just reached the threshold."""
+        self.counts[-1] += 1
+        self.total += 1
+        return self.total == self.threshold
+
+    @property
+    def message(self) -> str:
+        rule = self.rule
+        hits = _count(self.threshold, rule.noun)
+        return f"{hits} within {_count(rule.window, rule.unit.value)}"
+
+
+@final
+class DensityCounter:
+    """Windowed hit counts for a set of density rules over one document.
+
+    Call :meth:`paragraph` at the start of every segment, :meth:`sentence` at
+    every later sentence start, and :meth:`add` for every hit, all in offset
+    order. Create a new counter for each document.
+    """
+
+    def __init__(
+        self, rules: Iterable[DensityRule], thresholds: Mapping[str, int]
+    ) -> None:
+        """Set up windows for ``rules``, with optional threshold overrides by code."""
+        windows = [_Window(r, thresholds.get(r.code, r.threshold)) for r in rules]
+        self._windows: list[_Window] = windows
+        self._sentence_windows: list[_Window] = [
+            w for w in windows if w.rule.unit is Unit.SENTENCE
+        ]
+        self._by_source: dict[str, list[_Window]] = {}
+        for window in windows:
+            for source in window.rule.sources:
+                self._by_source.setdefault(source, []).append(window)
+
+    def paragraph(self) -> None:
+        """Start a new paragraph, which also starts a new sentence."""
+        for window in self._windows:
+            window.advance()
+
+    def sentence(self) -> None:
+        """Start a new sentence within the current paragraph."""
+        for window in self._sentence_windows:
+            window.advance()
+
+    def add(self, code: str) -> list[tuple[str, str]]:
+        """Count a hit and return ``(code, message)`` for each rule it triggers.
+
+        A rule triggers when its window total reaches the threshold, so a
+        cluster is reported once, at the hit that completes it, rather than at
+        every further hit while the window stays dense.
+        """
+        return [
+            (window.rule.code, window.message)
+            for window in self._by_source.get(code, ())
+            if window.add()
+        ]
@@ -0,0 +1,385 @@
+"""Document processing: format adapters that extract prose segments."""
+
+from __future__ import annotations
+
+import mmap
+import re
+import sys
+from array import array
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, cast, final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """A unit of prose extracted from a source file.
+
+    A segment is a view of ``source[start:end]``: the segments of one file
+    share its text rather than each holding a copy, and detectors scan the
+    range in place. Adapters mask markup they strip (list markers, inline
+    code, link targets) with spaces rather than deleting it, so offsets
+    within the text map back to source columns without a lookup table.
+
+    Attributes:
+        path: Path of the source file.
+        source: Text the segment is part of, with markup masked.
+        line: One-based line where the segment starts.
+        column: One-based column where the segment starts.
+        context: Element type, such as ``paragraph`` or ``heading``.
+        start: Offset of the segment's first character in ``source``.
+        end: Offset one past its last character, or -1 for the end of
+            ``source``.
+    """
+
+    path: str
+    source: str
+    line: int
+    column: int = 1
+    context: str = "paragraph"
+    start: int = 0
+    end: int = -1
+
+    def __post_init__(self) -> None:
+        """Resolve an open ``end`` to the length of ``source``."""
+        if self.end < 0:
+            object.__setattr__(self, "end", len(self.source))
+
+    @property
+    def text(self) -> str:
+        """Prose content of the segment, copied out of ``source`` on each access."""
+        return self.source[self.start : self.end]
+
+    def position(self, offset: int) -> tuple[int, int]:
+        """Map a character offset within the segment to a source line and column."""
+        start = self.start
+        newlines = self.source.count("\n", start, start + offset)
+        if newlines == 0:
+            return self.line, self.column + offset
+        line_start = self.source.rfind("\n", start, start + offset) + 1
+        return self.line + newlines, start + offset - line_start + 1
+
+    def detached(self) -> Segment:
+        """Return a copy that holds only its own text, not the whole source.
+
+        Keeping a detached segment doesn't keep the rest of the file alive.
+        """
+        return replace(self, source=self.text, start=0, end=-1)
+
+
+class Adapter(Protocol):
+    """Extracts prose segments from the text of one source format."""
+
+    def segments(self, path: str, text: str) -> Iterator[Segment]:
+        """Yield the analyzable prose segments of ``text`` in source order."""
+        ...
+
+
+_PARAGRAPH = re.compile(r"\S(?:[^\n]|\n(?![ \t]*(?:\n|\Z)))*")
+
+
+class PlainTextAdapter:
+    """Treats the whole file as prose, one segment per blank-line paragraph."""
+
+    def segments(self, path: str, text: str, line: int = 1) -> Iterator[Segment]:
+        """Yield one segment per paragraph.
+
+        ``line`` is the source line where ``text`` starts, for text that is
+        part of a larger file.
+        """
+        path = sys.intern(path)
+        consumed = 0
+        line_start = 0
+        for match in _PARAGRAPH.finditer(text):
+            start, end = match.span()
+            newlines = text.count("\n", consumed, start)
+            if newlines:
+                line += newlines
+                line_start = text.rfind("\n", consumed, start) + 1
+            consumed = start
+            column = start - line_start + 1
+            yield Segment(path, text, line, column, start=start, end=end)
+
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HEADING = re.compile(r"^ {0,3}#{1,6}(?:[ \t]+|$)")
+_LIST_ITEM = re.compile(r"^[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+")
+_BLOCK_QUOTE = re.compile(r"^ {0,3}(?:>[ \t]?)+")
+_TABLE_ROW = re.compile(r"^[ \t]*\|")
+_HTML_BLOCK = re.compile(r"^ {0,3}<[A-Za-z!/?]")
+_INDENTED_CODE = re.compile(r"^(?: {4}|\t)")
+_FRONT_MATTER = {"---", "+++"}
+_INLINE_CODE = re.compile(r"(`+)(?:(?!\1).)+?\1")
+_LINK_TARGET = re.compile(r"(?<=\])\([^)\s]*(?:\s+\"[^\"]*\")?\)")
+_TABLE_PIPE = re.compile(r"\|")
+
+
+def _blank(match: re.Match[str]) -> str:
+    return " " * len(match.group())
+
+
+def _mask_inline(line: str) -> str:
+    line = _INLINE_CODE.sub(_blank, line)
+    return _LINK_TARGET.sub(_blank, line)
+
+
+@final
+class _Block:
+    """Consecutive source lines that form one element, by offsets in the file."""
+
+    __slots__ = ("context", "end", "line", "start")
+
+    def __init__(self, line: int, start: int, context: str) -> None:
+        self.line: int = line
+        self.start: int = start
+        self.end: int = start
+        self.context: str = context
+
+
+@final
+class _Blocks:
+    """Closed prose blocks in flat arrays, which the garbage collector skips.
+
+    A large file has tens of thousands of blocks; as objects they would
+    trigger collections while they wait for the file to be rejoined.
+    """
+
+    __slots__ = ("contexts", "spans")
+
+    def __init__(self) -> None:
+        self.spans: array[int] = array("q")
+        self.contexts: list[str] = []
+
+    def add(self, block: _Block) -> None:
+        self.spans.extend((block.line, block.start, block.end))
+        self.contexts.append(block.context)
+
+    def __iter__(self) -> Iterator[tuple[int, int, int, str]]:
+        spans = self.spans
+        for index, context in enumerate(self.contexts):
+            yield spans[3 * index], spans[3 * index + 1], spans[3 * index + 2], context
+
+
+class MarkdownAdapter:
+    """Extracts prose from Markdown, skipping code, raw HTML, and front matter.
+
+    The adapter works line by line on block structure. It recognizes fenced
+    and indented code blocks, HTML blocks, headings, list items, block quotes,
+    and table rows. Prose lines are masked in place and the lines rejoined,
+    so all of a file's segments are views of one buffer the size of the file.
+    """
+
+    def segments(self, path: str, text: str) -> Iterator[Segment]:
+        """Yield one segment per prose block."""
+        path = sys.intern(path)
+        lines = text.split("\n")
+        blocks = self._blocks(lines)
+        source = "\n".join(lines)
+        lines.clear()
+        for line, first, last, context in blocks:
+            start, end = first, last
+            while start < end and source[start] in " \t":
+                start += 1
+            while end > start and source[end - 1].isspace():
+                end -= 1
+            if start < end:
+                column = start - first + 1
+                yield Segment(path, source, line, column, context, start, end)
+
+    def _blocks(self, lines: list[str]) -> _Blocks:
+        """Find the prose blocks of ``lines``, masking their lines in place."""
+        blocks = _Blocks()
+        index = self._skip_front_matter(lines)
+        # Offset of the current line in the rejoined text.
+        offset = sum(len(line) + 1 for line in lines[:index])
+        block: _Block | None = None
+        fence: str | None = None
+        while index < len(lines):
+            raw = lines[index]
+            if fence is not None:
+                if raw.strip().startswith(fence):
+                    fence = None
+            elif match := _FENCE.match(raw):
+                self._close(blocks, block)
+                block, fence = None, match.group(1)
+            else:
+                block = self._feed(blocks, block, lines, index, offset)
+            offset += len(raw) + 1
+            index += 1
+        self._close(blocks, block)
+        return blocks
+
+    @staticmethod
+    def _skip_front_matter(lines: list[str]) -> int:
+        if not lines or lines[0].strip() not in _FRONT_MATTER:
+            return 0
+        delimiter = lines[0].strip()
+        for index in range(1, len(lines)):
+            if lines[index].strip() == delimiter:
+                return index + 1
+        return 0
+
+    def _feed(
+        self,
+        blocks: _Blocks,
+        block: _Block | None,
+        lines: list[str],
+        index: int,
+        offset: int,
+    ) -> _Block | None:
+        raw = lines[index]
+        if not raw.strip() or _HTML_BLOCK.match(raw):
+            self._close(blocks, block)
+            return _Block(index + 1, offset, "html") if raw.strip() else None
+        if block is not None and block.context == "html":
+            return block
+        if block is None and _INDENTED_CODE.match(raw):
+            return None
+        context, masked = self._classify(raw)
+        if block is None or not self._continues(block, context):
+            self._close(blocks, block)
+            block = _Block(index + 1, offset, context)
+        lines[index] = _mask_inline(masked)
+        block.end = offset + len(raw)
+        return block
+
+    @staticmethod
+    def _continues(block: _Block, context: str) -> bool:
+        if block.context in {"heading", "table_cell"}:
+            return False
+        return context == "paragraph" or context == block.context == "block_quote"
+
+    @staticmethod
+    def _classify(raw: str) -> tuple[str, str]:
+        for pattern, context in (
+            (_HEADING, "heading"),
+            (_LIST_ITEM, "list_item"),
+            (_BLOCK_QUOTE, "block_quote"),
+        ):
+            if match := pattern.match(raw):
+                return context, " " * match.end() + raw[match.end() :]
+        if _TABLE_ROW.match(raw):
+            return "table_cell", _TABLE_PIPE.sub(" ", raw)
+        return "paragraph", raw
+
+    @staticmethod
+    def _close(blocks: _Blocks, block: _Block | None) -> None:
+        if block is not None and block.context != "html":
+            blocks.add(block)
+
+
+_ADAPTERS: dict[str, Adapter] = {
+    ".md": MarkdownAdapter(),
+    ".markdown": MarkdownAdapter(),
+    ".txt": PlainTextAdapter(),
+    ".rst": PlainTextAdapter(),
+}
+
+
+def adapter_for(path: str | Path) -> Adapter:
+    """Return the adapter for a file, falling back to plain text."""
+    return _ADAPTERS.get(Path(path).suffix.lower(), _ADAPTERS[".txt"])
+
+
+def read_segments(path: str | Path) -> Iterator[Segment]:
+    """Read a file and yield its prose segments."""
+    text = Path(path).read_text(encoding="utf-8", errors="replace")
+    return adapter_for(path).segments(str(path), text)
+
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# A blank line ends every paragraph, so cutting just after one never splits a
+# segment. Line endings are matched in their untranslated forms, and a CRLF
+# pair is one line ending, never two.
+_BLANK_LINE = re.compile(rb"(?:\r\n|\n|\r(?!\n))[ \t]*(?:\r\n|\n|\r(?!\n))")
+_CARRIAGE_RETURN = re.compile(r"\r\n?")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Consecutive segments from part of a file.
+
+    Attributes:
+        segments: Segments in source order. A chunk without lead segments
+            may stream them, so iterate them only once.
+        lead: Number of leading segments repeated from earlier chunks as
+            context for window rules. Findings located in them belong to the
+            chunk that first read them.
+    """
+
+    segments: Iterable[Segment]
+    lead: int = 0
+
+    def owns(self, line: int, column: int) -> bool:
+        """Whether a source position falls after the chunk's lead segments."""
+        if not self.lead:
+            return True
+        segments = cast("Sequence[Segment]", self.segments)
+        if self.lead >= len(segments):
+            return False
+        first = segments[self.lead]
+        return (line, column) >= (first.line, first.column)
+
+
+def read_chunks(
+    path: str | Path, *, overlap: int = 0, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Chunk]:
+    """Read a file as a series of chunks.
+
+    Plain-text files larger than ``chunk_size`` bytes are memory-mapped and
+    decoded a chunk at a time, cutting at blank lines, so memory use doesn't
+    grow with the file. Each chunk repeats the last ``overlap`` segments
+    before it as lead context. Other files are read whole as one chunk.
+    """
+    adapter = adapter_for(path)
+    if not isinstance(adapter, PlainTextAdapter) or (
+        Path(path).stat().st_size <= chunk_size
+    ):
+        # Whole files have no lead, so segments can stream through analysis.
+        yield Chunk(read_segments(path))
+        return
+    with (
+        Path(path).open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        yield from _map_chunks(adapter, str(path), data, overlap, chunk_size)
+
+
+def _map_chunks(
+    adapter: PlainTextAdapter,
+    path: str,
+    data: mmap.mmap,
+    overlap: int,
+    chunk_size: int,
+) -> Iterator[Chunk]:
+    recent: deque[Segment] = deque(maxlen=overlap)
+    start = 0
+    line = 1
+    while start < len(data):
+        separator = _BLANK_LINE.search(data, start + chunk_size)
+        end = separator.end() if separator else len(data)
+        text = data[start:end].decode("utf-8", errors="replace")
+        text = _CARRIAGE_RETURN.sub("\n", text)
+        segments = tuple(adapter.segments(path, text, line))
+        yield Chunk((*recent, *segments), len(recent))
+        if overlap:
+            # Lead segments outlive their chunk; copying them frees its text.
+            recent.extend(segment.detached() for segment in segments[-overlap:])
+        line += text.count("\n")
+        _release(data, start, end)
+        start = end
+
+
+def _release(data: mmap.mmap, start: int, end: int) -> None:
+    """Drop processed pages from the resident set where the platform allows."""
+    if not hasattr(mmap, "MADV_DONTNEED"):
+        return
+    first = start - start % mmap.PAGESIZE
+    last = end - end % mmap.PAGESIZE
+    if last > first:
+        data.madvise(mmap.MADV_DONTNEED, first, last - first)
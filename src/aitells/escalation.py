@@ -0,0 +1,210 @@
+"""Budgeted escalation of segments from the earlier layers to LLM rules.
+
+Semantic rules judge whether a pattern is appropriate in context, which
+costs a model call per segment. Most segments give them nothing to judge:
+a paragraph without a single hedge can't hedge excessively. Each semantic
+rule therefore declares the pattern and density rules that precede it, and
+a segment becomes a candidate for the rule only once the weighted count of
+their hits in that segment reaches the rule's threshold.
+
+Candidates from the whole run are ranked by score, so the most suspicious
+segments are judged first, and judged under a per-run budget of tokens and
+seconds. When the budget runs out the run stops cleanly: the findings so
+far stand, and the remaining candidates are counted as skipped.
+
+New escalation rules are declarations in :data:`ESCALATION_RULES`.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+from aitells.findings import Finding
+from aitells.rules import get_rule
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from aitells.documents import Segment
+    from aitells.rules import Rule
+
+# Rough size of the instructions sent with every segment, and the average
+# characters per token of English prose. Used to estimate a call's cost
+# before making it; the judge reports the actual cost afterwards.
+PROMPT_TOKENS = 400
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class EscalationRule:
+    """Declaration of when a semantic rule judges a segment.
+
+    Attributes:
+        code: Code of the semantic rule, such as ``SE005``.
+        weights: Score each hit of an earlier-layer rule adds, by rule code.
+        threshold: Default score at which a segment becomes a candidate.
+    """
+
+    code: str
+    weights: Mapping[str, int]
+    threshold: int
+
+
+ESCALATION_RULES: dict[str, EscalationRule] = {
+    rule.code: rule
+    for rule in (
+        # ST010 premature-summarization joins the sources once it's implemented.
+        EscalationRule("SE001", {"RM004": 1}, threshold=2),
+        EscalationRule("SE002", {"RM003": 1, "RM008": 1}, threshold=2),
+        EscalationRule("SE003", {"RM001": 1, "RM007": 1, "RM012": 1}, threshold=2),
+        EscalationRule(
+            "SE005", {"RM002": 1, "RM009": 1, "VF007": 1, "ST003": 2}, threshold=3
+        ),
+    )
+}
+
+
+class Candidate(NamedTuple):
+    """A segment whose earlier-layer score qualifies it for a semantic rule."""
+
+    score: int
+    code: str
+    segment: Segment
+
+
+def score_segment(
+    segment: Segment,
+    codes: Iterable[str],
+    rules: Iterable[EscalationRule],
+    thresholds: Mapping[str, int],
+) -> list[Candidate]:
+    """Score a segment by the codes of its earlier-layer hits.
+
+    Returns a candidate for each rule whose score reaches its threshold,
+    using ``thresholds`` overrides by code where given.
+    """
+    hits: dict[str, int] = {}
+    for code in codes:
+        hits[code] = hits.get(code, 0) + 1
+    candidates: list[Candidate] = []
+    for rule in rules:
+        score = sum(weight * hits.get(code, 0) for code, weight in rule.weights.items())
+        if score >= thresholds.get(rule.code, rule.threshold):
+            # Candidates outlive the file; keep the segment, not the file's text.
+            candidates.append(Candidate(score, rule.code, segment.detached()))
+    return candidates
+
+
+def estimate_tokens(segment: Segment) -> int:
+    """Estimate the tokens a call to judge ``segment`` consumes."""
+    return PROMPT_TOKENS + (segment.end - segment.start) // CHARS_PER_TOKEN
+
+
+class Verdict(NamedTuple):
+    """A judge's answer for one candidate.
+
+    ``message`` describes the finding, or is ``None`` when the pattern is
+    appropriate in context. ``tokens`` is what the call actually consumed.
+    """
+
+    message: str | None
+    tokens: int
+
+
+class Judge(Protocol):
+    """Judges one segment against one semantic rule, usually with a model call."""
+
+    def __call__(self, rule: Rule, segment: Segment) -> Verdict:
+        """Return the verdict for ``segment`` under ``rule``."""
+        ...
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Per-run limits on semantic analysis; ``None`` means unlimited.
+
+    Attributes:
+        max_tokens: Most tokens to spend across all calls.
+        max_seconds: Most wall-clock seconds to spend across all calls.
+    """
+
+    max_tokens: int | None = None
+    max_seconds: float | None = None
+
+
+@dataclass
+class Escalation:
+    """Outcome of a budgeted escalation run.
+
+    Attributes:
+        findings: Findings from the semantic rules, in source order.
+        judged: Number of candidates judged.
+        skipped: Number of candidates left unjudged by the budget.
+        tokens: Tokens spent.
+        seconds: Seconds spent.
+        exhausted: ``"tokens"`` or ``"seconds"`` if that budget left
+            candidates unjudged.
+    """
+
+    findings: list[Finding] = field(default_factory=list[Finding])
+    judged: int = 0
+    skipped: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+    exhausted: str | None = None
+
+
+def _rank(candidate: Candidate) -> tuple[int, str, int, int, str]:
+    segment = candidate.segment
+    return -candidate.score, segment.path, segment.line, segment.column, candidate.code
+
+
+def escalate(
+    candidates: Iterable[Candidate],
+    judge: Judge,
+    budget: Budget,
+    *,
+    clock: Callable[[], float] = time.monotonic,
+) -> Escalation:
+    """Judge candidates, highest score first, until they or the budget run out.
+
+    A candidate whose estimated cost exceeds the tokens left is skipped, and
+    smaller ones after it are still judged. Once the seconds run out, every
+    remaining candidate is skipped. A call already under way always
+    finishes, so the spend can overshoot the budget by one call.
+    """
+    ranked = sorted(candidates, key=_rank)
+    result = Escalation()
+    start = clock()
+    for position, candidate in enumerate(ranked):
+        result.seconds = clock() - start
+        if budget.max_seconds is not None and result.seconds >= budget.max_seconds:
+            result.exhausted = "seconds"
+            result.skipped += len(ranked) - position
+            break
+        left = None if budget.max_tokens is None else budget.max_tokens - result.tokens
+        if left is not None and estimate_tokens(candidate.segment) > left:
+            result.exhausted = "tokens"
+            result.skipped += 1
+            continue
+        rule = get_rule(candidate.code)
+        verdict = judge(rule, candidate.segment)
+        result.judged += 1
+        result.tokens += verdict.tokens
+        if verdict.message is not None:
+            segment = candidate.segment
+            result.findings.append(
+                Finding(
+                    segment.path,
+                    segment.line,
+                    segment.column,
+                    rule.code,
+                    rule.name,
+                    f"{rule.summary}: {verdict.message}",
+                )
+            )
+    result.seconds = clock() - start
+    result.findings.sort()
+    return result
@@ -0,0 +1,31 @@
+"""Findings reported by the analysis layers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class Finding:
+    """A detected pattern at a source location.
+
+    Findings sort by file, then position, then rule code. A large run
+    creates them by the million, so they have slots rather than a
+    ``__dict__``, and share their path, code, and name strings with the
+    segment and rule they came from.
+
+    Attributes:
+        path: Path of the source file, as given on the command line.
+        line: One-based line number.
+        column: One-based column number.
+        code: Rule code, such as ``ST003``.
+        name: Kebab-case rule name, such as ``hedge-stacking``.
+        message: Human-readable description of the finding.
+    """
+
+    path: str
+    line: int
+    column: int
+    code: str
+    name: str
+    message: str
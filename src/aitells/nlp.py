@@ -0,0 +1,104 @@
+"""NLP layer: sentence segmentation and token counts for structural rules.
+
+Statistical rules, such as sentence and paragraph uniformity, need only
+sentence boundaries and token counts. :class:`RuleSegmenter` provides both
+with two regular expressions, so runs that select only these rules cost about
+as much as the pattern layer and never load a spaCy model. Rules that need
+part-of-speech tags or a dependency parse will use spaCy when they land.
+
+``notebooks/ST006_sentence_segmentation.ipynb`` compares the rule-based
+boundaries against spaCy's parser on the sample corpus.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Sentence(NamedTuple):
+    """A sentence within a text.
+
+    Attributes:
+        start: Offset of the sentence's first character.
+        end: Offset one past its last non-space character.
+        tokens: Number of word tokens, not counting punctuation.
+    """
+
+    start: int
+    end: int
+    tokens: int
+
+
+class Segmenter(Protocol):
+    """Splits prose into sentences."""
+
+    def sentences(
+        self, text: str, start: int = 0, end: int = sys.maxsize
+    ) -> list[Sentence]:
+        """Return the sentences of ``text[start:end]`` in order.
+
+        Sentence offsets are offsets into ``text``.
+        """
+        ...
+
+
+# Terminal punctuation, any closing quotes or brackets, then whitespace before
+# something that doesn't start with a lowercase letter.
+_BOUNDARY = re.compile(r"[.!?\u2026]+[\"'\u2019\u201d)\]]*\s+(?![a-z])(?=\S)")
+_WORD = re.compile(r"\w+(?:['\u2019-]\w+)*")
+_LAST_WORD = re.compile(r"(\w+(?:\.\w+)*)\.$")
+_ABBREVIATIONS = frozenset(
+    {"cf", "dr", "e.g", "fig", "i.e", "jr", "mr", "mrs", "ms", "prof", "sr", "st", "vs"}
+)
+
+
+def _abbreviated(text: str, end: int, start: int = 0) -> bool:
+    """Whether the period ending ``text[start:end]`` follows an abbreviation.
+
+    Initials, single capital letters, count as abbreviations.
+    """
+    match = _LAST_WORD.search(text, max(start, end - 16), end)
+    if match is None:
+        return False
+    word = match.group(1)
+    return word.lower() in _ABBREVIATIONS or (len(word) == 1 and word.isupper())
+
+
+def sentence_starts(text: str, start: int = 0, end: int = sys.maxsize) -> Iterator[int]:
+    """Yield the offsets where the second and later sentences begin.
+
+    Only ``text[start:end]`` is split; offsets are offsets into ``text``.
+    """
+    for match in _BOUNDARY.finditer(text, start, end):
+        punctuation_end = match.start() + 1
+        if text[match.start()] == "." and _abbreviated(text, punctuation_end, start):
+            continue
+        yield match.end()
+
+
+class RuleSegmenter:
+    """Rule-based sentence splitter and word counter with no model to load."""
+
+    def sentences(
+        self, text: str, start: int = 0, end: int = sys.maxsize
+    ) -> list[Sentence]:
+        """Split ``text[start:end]`` at sentence-final punctuation and count the words.
+
+        The range is split in place; sentence offsets are offsets into ``text``.
+        """
+        end = min(end, len(text))
+        sentences: list[Sentence] = []
+        for stop in (*sentence_starts(text, start, end), end):
+            last = stop
+            while last > start and text[last - 1].isspace():
+                last -= 1
+            if last > start:
+                words = sum(1 for _ in _WORD.finditer(text, start, last))
+                sentences.append(Sentence(start, last, words))
+            start = stop
+        return sentences
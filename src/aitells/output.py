@@ -0,0 +1,349 @@
+"""Streaming output writers.
+
+Writers receive findings one file at a time and write them immediately, so
+memory stays flat no matter how many findings a run produces. Formats that
+wrap findings in a single document (JSON, SARIF) write their opening
+structure up front and their summary or rule table as a trailer.
+
+Formatting a file's findings is separate from writing them: :meth:`Writer.render`
+is a pure function of one file's findings, so worker threads can format
+files while the main thread writes the results in order.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, ClassVar, TextIO, override
+
+from aitells.rules import UnknownRuleError, get_rule
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from aitells.findings import Finding
+
+SARIF_SCHEMA = "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/main/sarif-2.1/schema/sarif-schema-2.1.0.json"
+
+
+def finding_to_dict(finding: Finding) -> dict[str, str | int]:
+    """Convert a finding to its JSON representation."""
+    return {
+        "file": finding.path,
+        "line": finding.line,
+        "column": finding.column,
+        "code": finding.code,
+        "rule": finding.name,
+        "message": finding.message,
+    }
+
+
+def pluralize(count: int, noun: str) -> str:
+    """Format a count with a singular or plural noun."""
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+class Writer(ABC):
+    """Base class for output writers.
+
+    Call :meth:`begin` once, :meth:`write` once per analyzed file (including
+    files without findings), then :meth:`end` once. Subclasses implement
+    :meth:`render`, and :meth:`_emit` if writing depends on what came before.
+
+    Attributes:
+        files: Number of files written so far.
+        findings: Number of findings written so far.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the writer for an output stream."""
+        self.stream: TextIO = stream
+        self.files: int = 0
+        self.findings: int = 0
+
+    @property
+    def summary(self) -> dict[str, int]:
+        """Counts of files and findings written so far."""
+        return {"files": self.files, "findings": self.findings}
+
+    def begin(self) -> None:  # noqa: B027
+        """Write any leading structure."""
+
+    def write(
+        self, path: str, findings: Sequence[Finding], text: str | None = None
+    ) -> None:
+        """Write the findings for one file and flush the stream.
+
+        ``text`` is the output of :meth:`render` for the same arguments, if
+        it was already rendered elsewhere.
+        """
+        self.files += 1
+        self._emit(findings, self.render(path, findings) if text is None else text)
+        self.findings += len(findings)
+        self.stream.flush()
+
+    @abstractmethod
+    def render(self, path: str, findings: Sequence[Finding]) -> str:
+        """Format one file's findings without writing them.
+
+        Rendering reads no writer state, so any thread can call it.
+        """
+
+    def count_clean(self, files: int) -> None:
+        """Count files without findings that were analyzed elsewhere.
+
+        ``aitells merge`` uses this for files that other runs checked, so
+        summaries count them without a write call per file.
+        """
+        self.files += files
+
+    def end(self) -> None:
+        """Write any trailing structure and flush the stream."""
+        self._write_trailer()
+        self.stream.flush()
+
+    def _emit(self, findings: Sequence[Finding], text: str) -> None:
+        del findings
+        _ = self.stream.write(text)
+
+    def _write_trailer(self) -> None:  # noqa: B027
+        pass
+
+
+class TextWriter(Writer):
+    """Standard linter format: ``file:line:col: rule - message``."""
+
+    @override
+    def render(self, path: str, findings: Sequence[Finding]) -> str:
+        del path
+        return "".join(
+            f"{f.path}:{f.line}:{f.column}: {f.name} - {f.message}\n" for f in findings
+        )
+
+
+class GithubWriter(Writer):
+    """GitHub Actions workflow commands that annotate pull requests."""
+
+    @override
+    def render(self, path: str, findings: Sequence[Finding]) -> str:
+        del path
+        return "".join(
+            f"::warning {_properties(f)}::{_escape_data(f.message)}\n" for f in findings
+        )
+
+
+def _properties(finding: Finding) -> str:
+    """Return the properties of a finding's workflow command, escaped."""
+    return ",".join(
+        (
+            f"file={_escape_property(finding.path)}",
+            f"line={finding.line}",
+            f"col={finding.column}",
+            f"title={_escape_property(finding.name)}",
+        )
+    )
+
+
+def _escape_data(value: str) -> str:
+    """Escape a workflow command's message, which ends at a newline."""
+    return value.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _escape_property(value: str) -> str:
+    """Escape a workflow command property, which also ends at ``,`` or ``::``."""
+    return _escape_data(value).replace(":", "%3A").replace(",", "%2C")
+
+
+class MarkdownWriter(Writer):
+    """Markdown report with one section per file that has findings."""
+
+    @override
+    def begin(self) -> None:
+        """Write the report heading."""
+        _ = self.stream.write("## AI writing analysis\n")
+
+    @override
+    def render(self, path: str, findings: Sequence[Finding]) -> str:
+        if not findings:
+            return ""
+        items = "".join(
+            f"- **Line {f.line}**: {f.name} - {f.message}\n" for f in findings
+        )
+        return f"\n### {path}\n\n{items}"
+
+    @override
+    def _write_trailer(self) -> None:
+        findings = pluralize(self.findings, "finding")
+        files = pluralize(self.files, "file")
+        _ = self.stream.write(f"\n{findings} in {files}.\n")
+
+
+class NdjsonWriter(Writer):
+    """Newline-delimited JSON, one record per line.
+
+    Each finding is a ``{"type": "finding", ...}`` record written as soon as
+    its file finishes, so consumers can process results while the run is
+    still going. The last record is ``{"type": "summary", ...}``.
+    """
+
+    @override
+    def render(self, path: str, findings: Sequence[Finding]) -> str:
+        del path
+        return "".join(
+            _record({"type": "finding", **finding_to_dict(f)}) for f in findings
+        )
+
+    @override
+    def _write_trailer(self) -> None:
+        _ = self.stream.write(_record({"type": "summary", **self.summary}))
+
+
+def _record(record: dict[str, str | int]) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class _ArrayWriter(Writer, ABC):
+    """Streams findings as elements of a JSON array inside one document."""
+
+    _indent: ClassVar[str] = "    "
+
+    @abstractmethod
+    def _element(self, finding: Finding) -> object:
+        """Return the JSON value of one finding in the array."""
+
+    @override
+    def render(self, path: str, findings: Sequence[Finding]) -> str:
+        del path
+        return ",".join(
+            f"\n{self._indent}{json.dumps(self._element(f), ensure_ascii=False)}"
+            for f in findings
+        )
+
+    @override
+    def _emit(self, findings: Sequence[Finding], text: str) -> None:
+        # Elements after the first in the array need a separator.
+        if findings and self.findings:
+            text = "," + text
+        _ = self.stream.write(text)
+
+
+class JsonWriter(_ArrayWriter):
+    """A single JSON document with a ``findings`` array and a ``summary``."""
+
+    @override
+    def begin(self) -> None:
+        """Open the document and the findings array."""
+        _ = self.stream.write('{\n  "findings": [')
+
+    @override
+    def _element(self, finding: Finding) -> object:
+        return finding_to_dict(finding)
+
+    @override
+    def _write_trailer(self) -> None:
+        newline = "\n  " if self.findings else ""
+        summary = json.dumps(self.summary)
+        _ = self.stream.write(f'{newline}],\n  "summary": {summary}\n}}\n')
+
+
+class SarifWriter(_ArrayWriter):
+    """SARIF 2.1.0 log with one run.
+
+    Results stream as they arrive. The tool driver, with its table of the
+    rules that produced results, follows the results array; SARIF objects
+    are unordered, so consumers read it the same as a leading driver.
+    """
+
+    _indent: ClassVar[str] = "        "
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the writer for an output stream."""
+        super().__init__(stream)
+        self._names: dict[str, str] = {}
+
+    @override
+    def begin(self) -> None:
+        """Open the log, the run, and the results array."""
+        schema = json.dumps(SARIF_SCHEMA)
+        head = (
+            f'{{\n  "$schema": {schema},\n  "version": "2.1.0",\n'
+            '  "runs": [\n    {\n      "results": ['
+        )
+        _ = self.stream.write(head)
+
+    @override
+    def _emit(self, findings: Sequence[Finding], text: str) -> None:
+        self._names.update((f.code, f.name) for f in findings)
+        super()._emit(findings, text)
+
+    @override
+    def _element(self, finding: Finding) -> object:
+        return {
+            "ruleId": finding.code,
+            "message": {"text": finding.message},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": finding.path},
+                        "region": {
+                            "startLine": finding.line,
+                            "startColumn": finding.column,
+                        },
+                    }
+                }
+            ],
+        }
+
+    @override
+    def _write_trailer(self) -> None:
+        newline = "\n      " if self.findings else ""
+        rules = [_descriptor(code, name) for code, name in sorted(self._names.items())]
+        tool = json.dumps({"driver": {"name": "aitells", "rules": rules}})
+        # SARIF has no summary; a property bag keeps the file count for merging.
+        summary = json.dumps(self.summary)
+        tail = (
+            f'{newline}],\n      "tool": {tool},\n      "properties": {summary}\n'
+            "    }\n  ]\n}\n"
+        )
+        _ = self.stream.write(tail)
+
+
+FORMATS: dict[str, type[Writer]] = {
+    "text": TextWriter,
+    "json": JsonWriter,
+    "ndjson": NdjsonWriter,
+    "sarif": SarifWriter,
+    "markdown": MarkdownWriter,
+    "github": GithubWriter,
+}
+
+
+def _descriptor(code: str, name: str) -> dict[str, object]:
+    """Describe a rule for the SARIF rule table.
+
+    ``aitells merge`` can carry results from other tools' logs, whose rule
+    codes aren't in the catalog; those keep the name their findings carry.
+    """
+    try:
+        rule = get_rule(code)
+    except UnknownRuleError:
+        return {"id": code, "name": name}
+    return {
+        "id": rule.code,
+        "name": rule.name,
+        "shortDescription": {"text": rule.summary},
+    }
+
+
+def create_writer(output_format: str, stream: TextIO) -> Writer:
+    """Create the writer for an output format name.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    try:
+        writer_class = FORMATS[output_format]
+    except KeyError:
+        msg = f"Unknown output format: {output_format!r}"
+        raise ValueError(msg) from None
+    return writer_class(stream)
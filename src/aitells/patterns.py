@@ -0,0 +1,167 @@
+"""Pattern matching layer for vocabulary, rhetorical, and formatting tells.
+
+Every selected rule's patterns compile into one alternation with a named group
+per rule, so a single left-to-right scan finds hits for all rules at once.
+Hyperscan would do the same with SIMD; the standard library engine keeps the
+layer dependency-free until pattern counts make the difference matter.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+PATTERNS: dict[str, tuple[str, ...]] = {
+    "VF001": (
+        r"delv(?:e|es|ed|ing)",
+        r"tapestr(?:y|ies)",
+        r"multifaceted",
+        r"testament to",
+        r"intricate",
+        r"pivotal",
+        r"realm",
+        r"underscor(?:e|es|ed|ing)",
+    ),
+    "VF002": (
+        r"utiliz(?:e|es|ed|ing)",
+        r"facilitat(?:e|es|ed|ing)",
+        r"commenc(?:e|es|ed|ing)",
+        r"endeavou?r(?:s|ed|ing)?",
+        r"leverag(?:e|es|ed|ing)",
+    ),
+    "VF003": (
+        r"moreover",
+        r"furthermore",
+        r"additionally",
+        r"consequently",
+        r"nevertheless",
+    ),
+    "VF004": (
+        r"a wide (?:range|array|variety) of",
+        r"in order to",
+        r"due to the fact that",
+        r"at the end of the day",
+    ),
+    "VF005": (
+        r"rich tapestry",
+        r"delicate balance",
+        r"ever-evolving landscape",
+        r"vibrant community",
+    ),
+    "VF006": (r"(?:emerges?|flows?|follows?) naturally",),
+    "VF007": (
+        r"it['\u2019]?s generally (?:considered|accepted|agreed)",
+        r"it is generally (?:considered|accepted|agreed)",
+    ),
+    "RM001": (
+        r"great question",
+        r"i['\u2019]?d be (?:happy|glad) to help",
+        r"what a (?:great|fantastic|wonderful) (?:question|idea)",
+    ),
+    "RM002": (
+        r"it['\u2019]?s worth (?:noting|mentioning)",
+        r"it is worth (?:noting|mentioning)",
+        r"generally speaking",
+        r"to some extent",
+        r"arguably",
+        r"in many cases",
+        r"it could be argued",
+        r"may potentially",
+    ),
+    "RM003": (
+        r"both sides have merit",
+        r"nuanced approach",
+        r"on the other hand",
+    ),
+    "RM004": (
+        r"in conclusion",
+        r"to summarize",
+        r"in summary",
+        r"ultimately",
+    ),
+    "RM005": (
+        r"in today['\u2019]?s (?:rapidly |fast-paced |ever-)?(?:evolving|changing)",
+        r"in the (?:modern|digital) (?:era|age|world)",
+    ),
+    "RM006": (
+        r"let me explain",
+        r"the key here is",
+        r"let['\u2019]?s (?:dive|break (?:it|this) down)",
+    ),
+    "RM007": (
+        r"that['\u2019]?s the beauty of",
+        r"here['\u2019]?s the thing",
+    ),
+    "RM008": (
+        r"it['\u2019]?s not (?:just )?\w+(?: \w+)?[;,—-]\s*(?:it['\u2019]?s|but)",
+    ),
+    "RM009": (r"this (?:may|might) seem \w+, but",),
+    "RM010": (
+        r"ask yourself:",
+        r"the test:",
+    ),
+    "RM012": (r"you make a (?:great|good|fair|valid) point, (?:and|but)",),
+    "FT001": (r"—[^—\n]{1,80}—",),
+    "FT002": (r"[*_](?:is|are|was|were)[*_]",),
+}
+
+
+class Hit(NamedTuple):
+    """A pattern match within a text.
+
+    Attributes:
+        code: Code of the rule whose pattern matched.
+        start: Offset of the first matched character.
+        end: Offset one past the last matched character.
+    """
+
+    code: str
+    start: int
+    end: int
+
+
+# Formatting patterns match punctuation, so word boundaries don't apply.
+_UNBOUNDED = frozenset({"FT001", "FT002"})
+
+
+def _group(code: str, patterns: tuple[str, ...]) -> str:
+    # Phrases may wrap across lines within a paragraph.
+    body = "|".join(patterns).replace(" ", r"\s+")
+    if code in _UNBOUNDED:
+        return rf"(?P<{code}>{body})"
+    return rf"(?P<{code}>(?<![\w-])(?:{body})(?![\w-]))"
+
+
+class PatternMatcher:
+    """Compiled matcher for a set of pattern-layer rules.
+
+    Build once and reuse: compilation dominates the cost of short texts.
+    """
+
+    def __init__(self, codes: Iterable[str]) -> None:
+        """Compile the patterns for the given rule codes.
+
+        Codes without patterns, such as NLP-layer rules, are ignored.
+        """
+        self.codes: tuple[str, ...] = tuple(c for c in codes if c in PATTERNS)
+        self._regex: re.Pattern[str] | None = None
+        if self.codes:
+            alternation = "|".join(_group(c, PATTERNS[c]) for c in self.codes)
+            self._regex = re.compile(alternation, re.IGNORECASE)
+
+    def scan(self, text: str, start: int = 0, end: int = sys.maxsize) -> Iterator[Hit]:
+        """Yield hits for all compiled rules in offset order.
+
+        Only ``text[start:end]`` is scanned, in place; hit offsets are
+        offsets into ``text``.
+        """
+        if self._regex is None:
+            return
+        for match in self._regex.finditer(text, start, end):
+            code = match.lastgroup
+            if code is not None:
+                yield Hit(code, match.start(), match.end())
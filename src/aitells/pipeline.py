@@ -0,0 +1,215 @@
+"""Analysis pipeline: runs the selected rules over prose segments."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from aitells.density import DENSITY_RULES, DensityCounter, Unit
+from aitells.documents import CHUNK_SIZE, read_chunks
+from aitells.escalation import ESCALATION_RULES, score_segment
+from aitells.findings import Finding
+from aitells.nlp import RuleSegmenter
+from aitells.patterns import PatternMatcher
+from aitells.rules import get_rule
+from aitells.uniformity import UNIFORMITY_RULES, UniformityCounter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from aitells.density import DensityRule
+    from aitells.documents import Segment
+    from aitells.escalation import Candidate, EscalationRule
+    from aitells.nlp import Segmenter, Sentence
+    from aitells.patterns import Hit
+    from aitells.rules import Rule
+    from aitells.uniformity import UniformityRule
+
+
+class Pipeline:
+    """Compiled analysis state for a fixed set of rules.
+
+    Building a pipeline compiles patterns once; analyzing a file reuses them.
+    Density rules count hits from pattern rules in the same scan, so their
+    source patterns are compiled even when those rules aren't selected.
+    Likewise, semantic rules score segments by the pattern and density rules
+    that precede them, which run unreported when they aren't selected.
+    Sentences are split only when a selected rule needs them or word counts.
+    """
+
+    def __init__(
+        self, rules: Sequence[Rule], thresholds: Mapping[str, int] | None = None
+    ) -> None:
+        """Build the pipeline for the given rules and thresholds by code."""
+        self.rules: tuple[Rule, ...] = tuple(rules)
+        codes = [rule.code for rule in self.rules]
+        self.escalation: tuple[EscalationRule, ...] = tuple(
+            ESCALATION_RULES[code] for code in codes if code in ESCALATION_RULES
+        )
+        signals = {code for rule in self.escalation for code in rule.weights}
+        self.density: tuple[DensityRule, ...] = tuple(
+            DENSITY_RULES[code]
+            for code in dict.fromkeys([*codes, *sorted(signals)])
+            if code in DENSITY_RULES
+        )
+        self.uniformity: tuple[UniformityRule, ...] = tuple(
+            UNIFORMITY_RULES[code] for code in codes if code in UNIFORMITY_RULES
+        )
+        self.thresholds: dict[str, int] = dict(thresholds or {})
+        sources = {source for rule in self.density for source in rule.sources}
+        sources.update(signals.difference(DENSITY_RULES))
+        self._reported: frozenset[str] = frozenset(codes)
+        self.matcher: PatternMatcher = PatternMatcher(
+            [*codes, *sorted(sources.difference(codes))]
+        )
+        windows = (*self.density, *self.uniformity)
+        self.segmenter: Segmenter | None = None
+        if self.uniformity or any(rule.unit is Unit.SENTENCE for rule in windows):
+            self.segmenter = RuleSegmenter()
+        # Preceding paragraphs that window rules look at. Every paragraph holds
+        # at least one sentence, so a window of N units never reaches back
+        # more than N paragraphs. Chunked reads overlap by this much so each
+        # chunk's findings match a whole-file run.
+        self.context: int = max((rule.window for rule in windows), default=0)
+
+    def analyze_segments(
+        self,
+        segments: Iterable[Segment],
+        *,
+        candidates: list[Candidate] | None = None,
+    ) -> list[Finding]:
+        """Analyze prose segments and return their findings in source order.
+
+        The segments are treated as one document: window rules carry over
+        from each segment to the next. If ``candidates`` is given, segments
+        that qualify for a selected semantic rule are appended to it, to be
+        judged later with :func:`aitells.escalation.escalate`.
+        """
+        findings: list[Finding] = []
+        escalating = candidates is not None and bool(self.escalation)
+        if not self.context and not escalating:
+            for segment in segments:
+                findings.extend(
+                    self._match(segment, hit)
+                    for hit in self.matcher.scan(
+                        segment.source, segment.start, segment.end
+                    )
+                )
+        else:
+            density = DensityCounter(self.density, self.thresholds)
+            uniformity = UniformityCounter(self.uniformity)
+            for segment in segments:
+                sentences = (
+                    self.segmenter.sentences(segment.source, segment.start, segment.end)
+                    if self.segmenter
+                    else []
+                )
+                self._measure(segment, sentences, uniformity, findings)
+                signals: list[str] | None = [] if escalating else None
+                self._scan_counted(segment, sentences, density, findings, signals)
+                if candidates is not None and signals is not None:
+                    candidates.extend(
+                        score_segment(
+                            segment, signals, self.escalation, self.thresholds
+                        )
+                    )
+        findings.sort()
+        return findings
+
+    def _scan_counted(
+        self,
+        segment: Segment,
+        sentences: list[Sentence],
+        counter: DensityCounter,
+        findings: list[Finding],
+        signals: list[str] | None = None,
+    ) -> None:
+        """Scan a segment, feeding hits and unit boundaries to the counter in order.
+
+        Codes of the hits and triggered window rules go to ``signals``, if given.
+        """
+        counter.paragraph()
+        starts = iter(sentences[1:])
+        pending = next(starts, None)
+        for hit in self.matcher.scan(segment.source, segment.start, segment.end):
+            while pending is not None and pending.start <= hit.start:
+                counter.sentence()
+                pending = next(starts, None)
+            if hit.code in self._reported:
+                findings.append(self._match(segment, hit))
+            if signals is not None:
+                signals.append(hit.code)
+            for code, message in counter.add(hit.code):
+                if code in self._reported:
+                    findings.append(_window_finding(segment, code, hit.start, message))
+                if signals is not None:
+                    signals.append(code)
+        # Sentences after the last hit still slide the windows.
+        if pending is not None:
+            counter.sentence()
+            for _ in starts:
+                counter.sentence()
+
+    @staticmethod
+    def _measure(
+        segment: Segment,
+        sentences: list[Sentence],
+        counter: UniformityCounter,
+        findings: list[Finding],
+    ) -> None:
+        """Feed sentence and paragraph lengths to the uniformity counter."""
+        # Headings, list items, and table cells are short by design.
+        if segment.context != "paragraph":
+            return
+        for sentence in sentences:
+            for code, message in counter.sentence(sentence.tokens):
+                findings.append(_window_finding(segment, code, sentence.start, message))
+        words = sum(sentence.tokens for sentence in sentences)
+        for code, message in counter.paragraph(words):
+            findings.append(_window_finding(segment, code, segment.start, message))
+
+    @staticmethod
+    def _match(segment: Segment, hit: Hit) -> Finding:
+        rule = get_rule(hit.code)
+        matched = " ".join(segment.source[hit.start : hit.end].split())
+        return _finding(segment, rule, hit.start, f'{rule.summary}: "{matched}"')
+
+    def analyze_file(
+        self,
+        path: str | Path,
+        *,
+        chunk_size: int = CHUNK_SIZE,
+        candidates: list[Candidate] | None = None,
+    ) -> list[Finding]:
+        """Read and analyze one file.
+
+        Large plain-text files are analyzed in chunks of about ``chunk_size``
+        bytes. Findings and candidates in a chunk's lead context were already
+        reported with the previous chunk and are dropped.
+        """
+        findings: list[Finding] = []
+        for chunk in read_chunks(path, overlap=self.context, chunk_size=chunk_size):
+            found: list[Candidate] | None = None if candidates is None else []
+            findings.extend(
+                finding
+                for finding in self.analyze_segments(chunk.segments, candidates=found)
+                if chunk.owns(finding.line, finding.column)
+            )
+            if candidates is not None and found:
+                candidates.extend(
+                    candidate
+                    for candidate in found
+                    if chunk.owns(candidate.segment.line, candidate.segment.column)
+                )
+        return findings
+
+
+def _finding(segment: Segment, rule: Rule, offset: int, message: str) -> Finding:
+    """Build a finding at ``offset``, an offset into the segment's source."""
+    line, column = segment.position(offset - segment.start)
+    return Finding(segment.path, line, column, rule.code, rule.name, message)
+
+
+def _window_finding(segment: Segment, code: str, offset: int, message: str) -> Finding:
+    rule = get_rule(code)
+    return _finding(segment, rule, offset, f"{rule.summary}: {message}")
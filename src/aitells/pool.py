@@ -0,0 +1,196 @@
+"""Worker processes that share one warmed analyzer copy-on-write.
+
+Building an analyzer compiles patterns and resolves the rule plan, and will
+load a spaCy model once rules need one. Doing that in every worker costs
+the load time and the memory once per worker. Instead, the parent builds
+the analyzer, moves everything it has allocated into the permanent
+generation with :func:`gc.freeze`, and forks the workers. Each worker
+starts with the analyzer in place, and because the collector never
+touches frozen objects, their pages stay shared with the parent instead
+of being copied on the first collection.
+
+Forking is only safe from a single-threaded process on a platform whose
+system libraries tolerate it. Anywhere else the pool spawns fresh workers
+that each build their own analyzer from the same settings.
+
+On a free-threaded build with the GIL disabled, threads run Python code in
+parallel, so the pool is a thread pool instead. Threads share the one
+analyzer, its compiled patterns, and the findings they produce: nothing is
+pickled or copied, and workers also render each file's output for the
+writer.
+"""
+
+from __future__ import annotations
+
+import functools
+import gc
+import sys
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+
+from aitells.analyzer import Analyzer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from concurrent.futures import Executor
+
+    from aitells.config import Settings
+    from aitells.findings import Finding
+
+# Files per task. Small enough that workers finish together, large enough
+# that sending tasks and results costs little next to analyzing them.
+CHUNK_SIZE = 8
+
+_analyzer: Analyzer | None = None
+
+
+class FileResult(NamedTuple):
+    """One analyzed file, as :func:`analyze_files` yields it.
+
+    Attributes:
+        path: Path of the file.
+        findings: The file's findings, or the error that kept it from being read.
+        text: The findings as rendered by a worker thread, if one rendered them.
+    """
+
+    path: str
+    findings: list[Finding] | OSError
+    text: str | None = None
+
+
+def _build_analyzer(settings: Settings) -> None:
+    global _analyzer  # noqa: PLW0603
+    _analyzer = Analyzer(settings)
+
+
+def _analyze_file(path: str) -> list[Finding] | OSError:
+    if _analyzer is None:
+        msg = "worker has no analyzer"
+        raise RuntimeError(msg)
+    try:
+        return _analyzer.analyze_file(path)
+    except OSError as error:
+        return error
+
+
+def _analyze_and_render(
+    analyzer: Analyzer,
+    render: Callable[[str, Sequence[Finding]], str] | None,
+    path: str,
+) -> FileResult:
+    try:
+        findings = analyzer.analyze_file(path)
+    except OSError as error:
+        return FileResult(path, error)
+    return FileResult(path, findings, render and render(path, findings))
+
+
+def free_threaded() -> bool:
+    """Whether this interpreter runs Python threads in parallel, without the GIL."""
+    return not sys._is_gil_enabled()  # pyright: ignore[reportPrivateUsage]  # noqa: SLF001
+
+
+def can_fork() -> bool:
+    """Whether workers can be forked from this process safely.
+
+    macOS system frameworks aren't fork-safe, and forking a process that
+    runs other threads can copy a lock another thread holds.
+    """
+    import multiprocessing  # noqa: PLC0415
+
+    return (
+        "fork" in multiprocessing.get_all_start_methods()
+        and sys.platform != "darwin"
+        and threading.active_count() == 1
+    )
+
+
+def create_pool(
+    analyzer: Analyzer, jobs: int, *, threads: bool | None = None
+) -> Executor:
+    """Start ``jobs`` workers that analyze files with ``analyzer``.
+
+    With ``threads``, which defaults to :func:`free_threaded`, the workers
+    are threads that call ``analyzer`` directly. Otherwise they're processes
+    that run :func:`_analyze_file`: forked from the warmed parent where
+    :func:`can_fork` allows it, and spawned with their own copy of the
+    analyzer otherwise.
+
+    Before forking, the parent's objects are moved into the permanent
+    generation with :func:`gc.freeze`; call :func:`gc.unfreeze` once the
+    pool has shut down.
+    """
+    return _start_pool(analyzer, jobs, threads=threads)[0]
+
+
+def _start_pool(
+    analyzer: Analyzer, jobs: int, *, threads: bool | None
+) -> tuple[Executor, bool]:
+    """Start a pool as :func:`create_pool` does, and say whether it froze objects."""
+    # Deferred, like the pool itself, until a run asks for workers: the
+    # executors and multiprocessing cost every serial ``aitells check``.
+    import multiprocessing  # noqa: PLC0415
+    from concurrent.futures import (  # noqa: PLC0415
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+    )
+
+    global _analyzer  # noqa: PLW0603
+    if free_threaded() if threads is None else threads:
+        pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="aitells")
+        return pool, False
+    if not can_fork():
+        pool = ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_build_analyzer,
+            initargs=(analyzer.settings,),
+        )
+        return pool, False
+    _analyzer = analyzer
+    # Collect garbage first so the frozen generation holds only live objects.
+    _ = gc.collect()
+    gc.freeze()
+    pool = ProcessPoolExecutor(
+        max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+    )
+    return pool, True
+
+
+def analyze_files(
+    analyzer: Analyzer,
+    paths: Iterable[str],
+    *,
+    jobs: int = 1,
+    threads: bool | None = None,
+    render: Callable[[str, Sequence[Finding]], str] | None = None,
+) -> Iterator[FileResult]:
+    """Analyze files and yield each one's findings, or its read error, in order.
+
+    With ``jobs`` above 1, files are analyzed in a pool of that many workers,
+    threads or processes as :func:`create_pool` chooses; results still
+    arrive in the order of ``paths``. Thread workers also ``render`` each
+    file's findings, so the caller only has to write the text. Objects are
+    unfrozen afterwards only if forking the pool froze them.
+    """
+    if jobs <= 1:
+        for path in paths:
+            yield _analyze_and_render(analyzer, None, path)
+        return
+    # The paths are needed twice: once to send and once to pair with results.
+    paths = list(paths)
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+    pool, frozen = _start_pool(analyzer, jobs, threads=threads)
+    try:
+        if isinstance(pool, ThreadPoolExecutor):
+            work = functools.partial(_analyze_and_render, analyzer, render)
+            yield from pool.map(work, paths)
+            return
+        results = pool.map(_analyze_file, paths, chunksize=CHUNK_SIZE)
+        for path, result in zip(paths, results, strict=True):
+            yield FileResult(path, result)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if frozen:
+            gc.unfreeze()
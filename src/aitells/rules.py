@@ -0,0 +1,147 @@
+"""Rule catalog and rule selection."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class Layer(Enum):
+    """Analysis layer responsible for a rule."""
+
+    PATTERN = "pattern"
+    NLP = "nlp"
+    LLM = "llm"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A detection rule.
+
+    Attributes:
+        code: Alphanumeric rule code, such as ``ST001``.
+        name: Kebab-case rule name, such as ``triads``.
+        summary: One-line description of what the rule detects.
+        layer: Analysis layer that evaluates the rule.
+    """
+
+    code: str
+    name: str
+    summary: str
+    layer: Layer
+
+    @property
+    def prefix(self) -> str:
+        """Category prefix of the rule code."""
+        return self.code.rstrip("0123456789")
+
+
+_P = Layer.PATTERN
+_N = Layer.NLP
+_L = Layer.LLM
+
+RULES: tuple[Rule, ...] = (
+    Rule("VF001", "overused-vocabulary", "Overused AI vocabulary", _P),
+    Rule("VF002", "formal-register", "Needlessly formal register", _P),
+    Rule("VF003", "formal-transitions", "Formal transition", _P),
+    Rule("VF004", "filler-phrases", "Filler phrase", _P),
+    Rule("VF005", "compound-cliches", "Compound cliche", _P),
+    Rule("VF006", "organic-consequence", "Organic consequence phrasing", _P),
+    Rule("VF007", "hedged-certainty", "Hedged certainty", _P),
+    Rule("RM001", "sycophancy", "Sycophantic phrase", _P),
+    Rule("RM002", "hedging-phrases", "Hedging phrase", _P),
+    Rule("RM003", "false-balance", "False balance", _P),
+    Rule("RM004", "conclusion-markers", "Conclusion marker", _P),
+    Rule("RM005", "opening-cliches", "Opening cliche", _P),
+    Rule("RM006", "metacommentary", "Metacommentary", _P),
+    Rule("RM007", "affirmative-formulas", "Affirmative formula", _P),
+    Rule("RM008", "contrastive-formulas", "Contrastive formula", _P),
+    Rule("RM009", "defensive-hedges", "Defensive hedge", _P),
+    Rule("RM010", "rhetorical-devices", "Rhetorical device", _P),
+    Rule("RM011", "self-answering-questions", "Self-answering question", _N),
+    Rule("RM012", "acknowledgment-before-pushback", "Acknowledgment ritual", _P),
+    Rule("FT001", "em-dash-overuse", "Em-dash parenthetical", _P),
+    Rule("FT002", "emphatic-copula", "Emphatic copula", _P),
+    Rule("ST001", "triads", "Rule-of-three abuse", _N),
+    Rule("ST002", "parallel", "Parallel structure overuse", _N),
+    Rule("ST003", "hedge-stacking", "Multiple hedges in close proximity", _N),
+    Rule("ST004", "transition-cadence", "Formal transitions at a steady cadence", _N),
+    Rule("ST005", "stacked-anaphora", "Repeated sentence starts", _N),
+    Rule("ST006", "sentence-uniformity", "Low variance in sentence length", _N),
+    Rule("ST007", "paragraph-formula", "Formulaic paragraph structure", _N),
+    Rule("ST008", "paragraph-uniformity", "Low variance in paragraph length", _N),
+    Rule("ST009", "repeated-openers", "Repeated paragraph openers", _N),
+    Rule("ST010", "premature-summarization", "Premature summarization", _N),
+    Rule("ST011", "unnecessary-enumeration", "Unnecessary enumeration", _N),
+    Rule("SE001", "empty-conclusion", "Conclusion without insight", _L),
+    Rule("SE002", "artificial-balance", "Artificial balance", _L),
+    Rule("SE003", "context-sycophancy", "Excessive validation", _L),
+    Rule("SE004", "generic-examples", "Generic examples", _L),
+    Rule("SE005", "excessive-hedging", "Excessive hedging", _L),
+    Rule("SE006", "diplomatic-evasion", "Diplomatic evasion", _L),
+)
+
+DEFAULT_SELECT: tuple[str, ...] = ("VF", "RM", "FT", "ST")
+
+_BY_CODE: dict[str, Rule] = {rule.code: rule for rule in RULES}
+_BY_NAME: dict[str, Rule] = {rule.name: rule for rule in RULES}
+
+
+class UnknownRuleError(ValueError):
+    """Raised when a selector matches no known rule code, prefix, or name."""
+
+    def __init__(self, selector: str) -> None:
+        """Initialize the error with the offending selector."""
+        super().__init__(f"Unknown rule or prefix: {selector!r}")
+        self.selector: str = selector
+
+
+def get_rule(key: str) -> Rule:
+    """Look up a rule by code or kebab-case name.
+
+    Raises:
+        UnknownRuleError: If no rule has that code or name.
+    """
+    rule = _BY_CODE.get(key.upper()) or _BY_NAME.get(key.lower())
+    if rule is None:
+        raise UnknownRuleError(key)
+    return rule
+
+
+def _matches(rule: Rule, selector: str) -> bool:
+    return rule.code.startswith(selector.upper()) or rule.name == selector.lower()
+
+
+def _check_selectors(selectors: Iterable[str]) -> None:
+    for selector in selectors:
+        if not any(_matches(rule, selector) for rule in RULES):
+            raise UnknownRuleError(selector)
+
+
+def select_rules(
+    select: Iterable[str] = DEFAULT_SELECT,
+    ignore: Iterable[str] = (),
+) -> tuple[Rule, ...]:
+    """Resolve rule selectors to the rules to run, in catalog order.
+
+    Selectors are rule codes (``ST001``), code prefixes (``ST``), or rule
+    names (``triads``). A rule runs when it matches some ``select`` selector
+    and no ``ignore`` selector.
+
+    Raises:
+        UnknownRuleError: If a selector matches no rule.
+    """
+    select = tuple(select)
+    ignore = tuple(ignore)
+    _check_selectors(select)
+    _check_selectors(ignore)
+    return tuple(
+        rule
+        for rule in RULES
+        if any(_matches(rule, s) for s in select)
+        and not any(_matches(rule, s) for s in ignore)
+    )
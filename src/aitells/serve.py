@@ -0,0 +1,341 @@
+"""HTTP analysis service with dynamic micro-batching.
+
+Request threads put documents on a bounded queue. A dispatcher thread takes
+the first waiting document, keeps gathering until the batch is full or the
+first document has waited ``max_latency`` seconds, and hands the whole batch
+to a worker process. Each worker builds one :class:`~aitells.analyzer.Analyzer`
+when it starts, so compiled patterns and any models load once per worker
+rather than once per request.
+
+At most one batch per worker is in flight. When every worker is busy the
+queue fills, and requests that find it full get ``429 Too Many Requests``
+instead of waiting without bound, which keeps latency predictable under load.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, ClassVar, cast, final, override
+from urllib.parse import parse_qs, urlsplit
+
+from aitells.analyzer import DEFAULT_PATH, Analyzer
+from aitells.output import finding_to_dict
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+    from aitells.config import Settings
+    from aitells.findings import Finding
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_LATENCY = 0.01
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_MAX_BODY = 10 * 1024 * 1024
+REQUEST_TIMEOUT = 60.0
+
+
+class QueueFullError(Exception):
+    """Raised when the request queue is full."""
+
+
+class ShutdownError(Exception):
+    """Raised for requests that arrive or wait while the service stops."""
+
+
+_analyzer: Analyzer | None = None
+
+
+def start_worker(settings: Settings) -> None:
+    """Build the analyzer that :func:`analyze_batch` uses in this worker."""
+    global _analyzer  # noqa: PLW0603
+    _analyzer = Analyzer(settings)
+
+
+def analyze_batch(documents: Sequence[tuple[str, str]]) -> list[list[Finding]]:
+    """Analyze a batch of ``(path, text)`` documents in a worker."""
+    if _analyzer is None:
+        msg = "worker was not initialized"
+        raise RuntimeError(msg)
+    return [_analyzer.analyze(text, path=path) for path, text in documents]
+
+
+def create_executor(settings: Settings, workers: int) -> Executor:
+    """Start a pool of worker processes that each hold an analyzer.
+
+    Workers start from a fork server where the platform has one, otherwise by
+    spawning; forking the threaded server process directly isn't safe.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=start_worker,
+        initargs=(settings,),
+    )
+
+
+@dataclass
+class _Job:
+    path: str
+    text: str
+    arrived: float = field(default_factory=time.monotonic)
+    result: Future[list[Finding]] = field(default_factory=Future)
+
+
+@final
+class Batcher:
+    """Gathers concurrent documents into batches for an executor."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        *,
+        slots: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """Start dispatching batches to ``executor``, at most ``slots`` at a time."""
+        self._executor: Executor = executor
+        self._slots: threading.Semaphore = threading.Semaphore(slots)
+        self._batch_size: int = batch_size
+        self._max_latency: float = max_latency
+        self._queue: queue.Queue[_Job | None] = queue.Queue(queue_size)
+        self._closed: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._dispatch, name="aitells-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, text: str, path: str = DEFAULT_PATH) -> Future[list[Finding]]:
+        """Queue a document and return a future for its findings.
+
+        Raises:
+            QueueFullError: If the queue is full.
+            ShutdownError: If the batcher is closed.
+        """
+        if self._closed.is_set():
+            raise ShutdownError
+        job = _Job(path, text)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise QueueFullError from None
+        return job.result
+
+    def _dispatch(self) -> None:
+        stopping = False
+        while not stopping and (first := self._queue.get()) is not None:
+            batch = [first]
+            deadline = first.arrived + self._max_latency
+            while len(batch) < self._batch_size:
+                try:
+                    job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            _ = self._slots.acquire()
+            self._run(batch)
+        # Only documents that raced past ``submit``'s check while the batcher
+        # was closing are still queued.
+        self._fail_waiting()
+
+    def _run(self, batch: list[_Job]) -> None:
+        try:
+            future = self._executor.submit(
+                analyze_batch, [(job.path, job.text) for job in batch]
+            )
+        except RuntimeError as error:  # The executor has shut down.
+            self._slots.release()
+            for job in batch:
+                _ = job.result.set_exception(ShutdownError(str(error)))
+            return
+
+        def complete(done: Future[list[list[Finding]]]) -> None:
+            self._slots.release()
+            if (error := done.exception()) is not None:
+                for job in batch:
+                    job.result.set_exception(error)
+                return
+            for job, findings in zip(batch, done.result(), strict=True):
+                job.result.set_result(findings)
+
+        future.add_done_callback(complete)
+
+    def _fail_waiting(self) -> None:
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None:
+                job.result.set_exception(ShutdownError())
+
+    def close(self) -> None:
+        """Stop accepting documents, and return once those queued are dispatched.
+
+        Documents queued before the call still go to the executor; their
+        futures resolve when it finishes them.
+        """
+        self._closed.set()
+        self._queue.put(None)
+        self._thread.join()
+
+
+def _read_document(handler: BaseHTTPRequestHandler, body: bytes) -> tuple[str, str]:
+    """Decode a request body as a JSON document or a raw file upload.
+
+    Raises:
+        ValueError: If a JSON body is malformed.
+    """
+    query = parse_qs(urlsplit(handler.path).query)
+    content_type = handler.headers.get_content_type()
+    if content_type != "application/json":
+        path = query.get("path", [DEFAULT_PATH])[0]
+        return path, body.decode("utf-8", errors="replace")
+    document = cast("object", json.loads(body))
+    if not isinstance(document, dict):
+        msg = "Request body must be a JSON object"
+        raise ValueError(msg)  # noqa: TRY004
+    fields = cast("dict[str, object]", document)
+    text = fields.get("text")
+    path = fields.get("path", DEFAULT_PATH)
+    if not isinstance(text, str) or not isinstance(path, str):
+        msg = "'text' and 'path' must be strings"
+        raise ValueError(msg)  # noqa: TRY004
+    return path, text
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to the batcher of the server that owns the handler."""
+
+    server_version: ClassVar[str] = "aitells"  # pyright: ignore[reportIncompatibleVariableOverride]
+    server: AnalysisServer  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    def do_GET(self) -> None:
+        """Report liveness on ``/health``."""
+        if urlsplit(self.path).path != "/health":
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        self._send(HTTPStatus.OK, {"status": "ok"})
+
+    def do_POST(self) -> None:
+        """Analyze one document posted to ``/analyze``."""
+        if urlsplit(self.path).path != "/analyze":
+            self._send(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        body = self._read_body()
+        if body is None:
+            return
+        try:
+            path, text = _read_document(self, body)
+        except ValueError as error:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+            return
+        findings = self._analyze(path, text)
+        if findings is None:
+            return
+        self._send(
+            HTTPStatus.OK,
+            {
+                "findings": [finding_to_dict(f) for f in findings],
+                "summary": {"files": 1, "findings": len(findings)},
+            },
+        )
+
+    def _analyze(self, path: str, text: str) -> list[Finding] | None:
+        """Analyze a document, or answer with an error and return ``None``."""
+        try:
+            return self.server.batcher.submit(text, path).result(REQUEST_TIMEOUT)
+        except QueueFullError:
+            self._send(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                {"error": "Too many requests"},
+                {"Retry-After": "1"},
+            )
+        except ShutdownError:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Shutting down"})
+        except TimeoutError:
+            self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Analysis timed out"},
+                {"Retry-After": "1"},
+            )
+        except Exception as error:  # noqa: BLE001
+            self.log_error("analysis failed: %r", error)
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Analysis failed"})
+        return None
+
+    def _read_body(self) -> bytes | None:
+        """Read the request body, or answer with an error and return ``None``."""
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._send(HTTPStatus.LENGTH_REQUIRED, {"error": "Content-Length required"})
+            return None
+        if not (length.isascii() and length.isdigit()):
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"})
+            return None
+        if int(length) > self.server.max_body:
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"})
+            return None
+        return self.rfile.read(int(length))
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: dict[str, object],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        _ = self.wfile.write(payload)
+
+    @override
+    def log_message(self, format: str, *args: object) -> None:
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+
+@final
+class AnalysisServer(ThreadingHTTPServer):
+    """Threaded HTTP server that feeds a :class:`Batcher`."""
+
+    daemon_threads: bool = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        batcher: Batcher,
+        *,
+        log_requests: bool = True,
+        max_body: int = DEFAULT_MAX_BODY,
+    ) -> None:
+        """Bind to ``address`` and route analysis requests to ``batcher``.
+
+        Request bodies larger than ``max_body`` bytes get ``413 Content Too
+        Large`` without being read.
+        """
+        super().__init__(address, _Handler)
+        self.batcher: Batcher = batcher
+        self.max_body: int = max_body
+        self.log_requests: bool = log_requests
@@ -0,0 +1,218 @@
+"""Splitting a run across CI runners and merging their reports.
+
+``aitells check --shard i/n`` analyzes the ``i``-th of ``n`` shards of the
+discovered files. Every runner discovers the same files from the same
+checkout, so each computes the same split independently. Files go to
+shards largest first, each to the shard with the fewest bytes so far, which
+keeps shard sizes within one file of each other.
+
+``aitells merge`` reads the per-shard JSON, NDJSON, or SARIF reports back
+into findings and file counts, so the combined report has the same summary
+as a single run would.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, cast
+
+from aitells.findings import Finding
+from aitells.rules import UnknownRuleError, get_rule
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of ``count`` shards, numbered from 1."""
+
+    index: int
+    count: int
+
+
+def parse_shard(value: str) -> Shard:
+    """Parse a shard written as ``index/count``, such as ``3/8``.
+
+    Raises:
+        ValueError: If the value isn't two integers with
+            ``1 <= index <= count``.
+    """
+    index, _, count = value.partition("/")
+    try:
+        shard = Shard(int(index), int(count))
+    except ValueError:
+        shard = None
+    if shard is None or not 1 <= shard.index <= shard.count:
+        msg = f"Invalid shard {value!r}: expected i/n with 1 <= i <= n"
+        raise ValueError(msg)
+    return shard
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size  # noqa: PTH116
+    except OSError:
+        # Unreadable files cost nothing; the shard that gets them reports them.
+        return 0
+
+
+def shard_files(
+    paths: Iterable[str], shard: Shard, size: Callable[[str], int] = _size
+) -> list[str]:
+    """Return the paths in ``shard``, in their original order.
+
+    Shards are balanced by total ``size``. The split depends only on the
+    set of paths and their sizes, not on the order they arrive in.
+    """
+    sizes = {path: size(path) for path in paths}
+    files = sorted(sizes.items(), key=_largest_first)
+    loads = [(0, index) for index in range(1, shard.count + 1)]
+    mine: set[str] = set()
+    for path, length in files:
+        load, index = heapq.heappop(loads)
+        if index == shard.index:
+            mine.add(path)
+        heapq.heappush(loads, (load + length, index))
+    return [path for path in sizes if path in mine]
+
+
+def _largest_first(item: tuple[str, int]) -> tuple[int, str]:
+    path, length = item
+    return -length, path
+
+
+class ReportError(ValueError):
+    """Raised when a report can't be read for merging."""
+
+
+@dataclass
+class Report:
+    """Findings and file count read from one or more reports.
+
+    Attributes:
+        files: Number of files analyzed.
+        findings: Findings, in the order read.
+    """
+
+    files: int = 0
+    findings: list[Finding] = field(default_factory=list[Finding])
+
+    def merge(self, other: Report) -> None:
+        """Add another report's files and findings to this one."""
+        self.files += other.files
+        self.findings.extend(other.findings)
+
+
+def parse_report(text: str) -> Report:
+    """Parse a JSON, NDJSON, or SARIF report written by ``aitells check``.
+
+    Raises:
+        ReportError: If the text isn't one of those formats.
+    """
+    try:
+        document = cast("object", json.loads(text))
+    except json.JSONDecodeError:
+        return _parse_ndjson(text)
+    if not isinstance(document, dict):
+        msg = "Not a JSON, NDJSON, or SARIF report"
+        raise ReportError(msg)
+    fields = cast("dict[str, object]", document)
+    if "type" in fields:
+        # An NDJSON report for no files is a lone summary record.
+        return _parse_ndjson(text)
+    parse = _parse_sarif if "runs" in fields else _parse_json
+    try:
+        return parse(fields)
+    except (KeyError, TypeError, ValueError) as error:
+        msg = f"Malformed report: missing or invalid {error}"
+        raise ReportError(msg) from error
+
+
+def _finding(record: dict[str, object]) -> Finding:
+    # Interning shares one path and code string among a file's findings.
+    return Finding(
+        path=sys.intern(str(record["file"])),
+        line=int(cast("int", record["line"])),
+        column=int(cast("int", record["column"])),
+        code=sys.intern(str(record["code"])),
+        name=sys.intern(str(record["rule"])),
+        message=str(record["message"]),
+    )
+
+
+def _parse_json(document: dict[str, object]) -> Report:
+    records = cast("list[dict[str, object]]", document["findings"])
+    summary = cast("dict[str, int]", document["summary"])
+    return Report(int(summary["files"]), [_finding(record) for record in records])
+
+
+def _parse_ndjson(text: str) -> Report:
+    report = Report()
+    summaries = 0
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = cast("dict[str, object]", json.loads(line))
+            if record["type"] == "finding":
+                report.findings.append(_finding(record))
+            elif record["type"] == "summary":
+                report.files += int(cast("int", record["files"]))
+                summaries += 1
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as error:
+            msg = f"Malformed report at line {number}: {error}"
+            raise ReportError(msg) from error
+    if not summaries:
+        msg = "Report has no summary record; was the run cut short?"
+        raise ReportError(msg)
+    return report
+
+
+def _parse_sarif(log: dict[str, object]) -> Report:
+    report = Report()
+    for run in cast("list[dict[str, object]]", log["runs"]):
+        driver = cast(
+            "dict[str, object]", cast("dict[str, object]", run["tool"])["driver"]
+        )
+        names = {
+            str(rule["id"]): str(rule.get("name") or "")
+            for rule in cast("list[dict[str, object]]", driver.get("rules", []))
+        }
+        paths: set[str] = set()
+        for result in cast("list[dict[str, object]]", run["results"]):
+            location = cast("list[dict[str, dict[str, object]]]", result["locations"])[
+                0
+            ]
+            physical = location["physicalLocation"]
+            artifact = cast("dict[str, str]", physical["artifactLocation"])
+            region = cast("dict[str, int]", physical["region"])
+            # SARIF makes the column optional; a missing one means column 1.
+            code = sys.intern(str(result["ruleId"]))
+            path = sys.intern(artifact["uri"])
+            paths.add(path)
+            report.findings.append(
+                Finding(
+                    path=path,
+                    line=int(region["startLine"]),
+                    column=int(region.get("startColumn", 1)),
+                    code=code,
+                    name=sys.intern(names.get(code) or _rule_name(code)),
+                    message=str(cast("dict[str, object]", result["message"])["text"]),
+                )
+            )
+        properties = cast("dict[str, object]", run.get("properties", {}))
+        # Logs from other tools lack the file count; count files with results.
+        report.files += int(cast("int", properties.get("files", len(paths))))
+    return report
+
+
+def _rule_name(code: str) -> str:
+    try:
+        return get_rule(code).name
+    except UnknownRuleError:
+        return code
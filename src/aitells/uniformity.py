@@ -0,0 +1,123 @@
+"""Sliding-window length statistics for uniformity rules.
+
+A uniformity rule flags runs of sentences or paragraphs whose lengths barely
+vary: the coefficient of variation (standard deviation over mean) of the
+word counts in ``window`` consecutive units is at most ``max_variation``.
+Each window keeps a ring buffer of lengths with running sums of lengths and
+squared lengths, so every unit is constant work.
+
+Like density rules, new uniformity rules are declarations in
+:data:`UNIFORMITY_RULES`.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, final
+
+from aitells.density import Unit
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True)
+class UniformityRule:
+    """Declaration of a uniformity rule.
+
+    Attributes:
+        code: Code of the rule, such as ``ST006``.
+        unit: Unit whose lengths are compared.
+        window: Number of consecutive units compared.
+        max_variation: Highest coefficient of variation that counts as uniform.
+    """
+
+    code: str
+    unit: Unit
+    window: int
+    max_variation: float
+
+
+# Calibrated on notebooks/samples: eight-sentence windows in the AI samples
+# reach a variation of 0.19, while the human samples stay at 0.21 or above.
+UNIFORMITY_RULES: dict[str, UniformityRule] = {
+    rule.code: rule
+    for rule in (
+        UniformityRule("ST006", Unit.SENTENCE, window=8, max_variation=0.2),
+        UniformityRule("ST008", Unit.PARAGRAPH, window=5, max_variation=0.15),
+    )
+}
+
+
+@final
+class _Lengths:
+    """Ring buffer of unit lengths with running sums for one uniformity rule."""
+
+    __slots__ = ("lengths", "rule", "squares", "total", "uniform")
+
+    def __init__(self, rule: UniformityRule) -> None:
+        self.rule: UniformityRule = rule
+        self.lengths: deque[int] = deque(maxlen=rule.window)
+        self.total: int = 0
+        self.squares: int = 0
+        self.uniform: bool = False
+
+    def add(self, length: int) -> bool:
+        """Add a unit and return whether the window just became uniform."""
+        if len(self.lengths) == self.rule.window:
+            oldest = self.lengths[0]
+            self.total -= oldest
+            self.squares -= oldest * oldest
+        self.lengths.append(length)
+        self.total += length
+        self.squares += length * length
+        was_uniform = self.uniform
+        self.uniform = self._is_uniform()
+        return self.uniform and not was_uniform
+
+    def _is_uniform(self) -> bool:
+        count = len(self.lengths)
+        if count < self.rule.window or not self.total:
+            return False
+        # variance / mean² <= max², scaled by count² to stay in integers.
+        spread = count * self.squares - self.total * self.total
+        return spread <= (self.rule.max_variation * self.total) ** 2
+
+    @property
+    def message(self) -> str:
+        unit = self.rule.unit.value
+        low, high = min(self.lengths), max(self.lengths)
+        return f"{self.rule.window} {unit}s of {low} to {high} words"
+
+
+@final
+class UniformityCounter:
+    """Windowed length statistics for a set of uniformity rules over one document.
+
+    Call :meth:`sentence` for every sentence and :meth:`paragraph` for every
+    paragraph, in source order. A rule reports once when a run of uniform
+    windows begins, not again for every window in the run.
+    """
+
+    def __init__(self, rules: Iterable[UniformityRule]) -> None:
+        """Set up windows for ``rules``."""
+        windows = [_Lengths(rule) for rule in rules]
+        self._sentences: list[_Lengths] = [
+            w for w in windows if w.rule.unit is Unit.SENTENCE
+        ]
+        self._paragraphs: list[_Lengths] = [
+            w for w in windows if w.rule.unit is Unit.PARAGRAPH
+        ]
+
+    def sentence(self, words: int) -> list[tuple[str, str]]:
+        """Add a sentence and return ``(code, message)`` for each rule it triggers."""
+        return _add(self._sentences, words)
+
+    def paragraph(self, words: int) -> list[tuple[str, str]]:
+        """Add a paragraph and return ``(code, message)`` for each rule it triggers."""
+        return _add(self._paragraphs, words)
+
+
+def _add(windows: list[_Lengths], length: int) -> list[tuple[str, str]]:
+    return [(w.rule.code, w.message) for w in windows if w.add(length)]
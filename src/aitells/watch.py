@@ -0,0 +1,325 @@
+"""Watch mode: re-analyze changed files with a warm pipeline.
+
+The pipeline (compiled patterns and any loaded models) is built once when
+watching starts. Each burst of file-system events is debounced into one
+batch, and only the files in that batch are analyzed again.
+
+On Linux, change notification uses inotify through :mod:`ctypes`. Elsewhere,
+or when inotify is unavailable, a polling watcher compares modification times.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, cast, final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from aitells.discovery import FileFinder
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class Watcher(Protocol):
+    """Source of changed file paths."""
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Block until files change or ``timeout`` seconds pass.
+
+        Returns the absolute paths of changed files, empty on timeout.
+        """
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the watcher."""
+        ...
+
+
+@final
+class _Targets:
+    """Decides which changed paths belong to the watched set.
+
+    Membership goes through the same glob and git-ignore checks as discovery,
+    so both watchers report exactly the files ``aitells check`` would analyze.
+    """
+
+    def __init__(self, finder: FileFinder, paths: Iterable[str]) -> None:
+        self._finder: FileFinder = finder
+        self._files: set[str] = set()
+        self._directories: list[str] = []
+        for path in paths:
+            absolute = _absolute(path)
+            if Path(absolute).is_dir():
+                self._directories.append(absolute)
+            else:
+                self._files.add(absolute)
+
+    def _top(self, path: str) -> str | None:
+        """Return the watched directory that ``path`` is below, if any."""
+        for directory in self._directories:
+            if path.startswith(f"{directory}{os.sep}"):
+                return directory
+        return None
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, str):
+            return False
+        if path in self._files:
+            return True
+        top = self._top(path)
+        return top is not None and self._finder.includes(path, top)
+
+    def walks(self, directory: str) -> bool:
+        """Whether discovery walks ``directory``, given below a watched one."""
+        top = self._top(directory)
+        return top is not None and not self._finder.excludes_directory(directory, top)
+
+
+@final
+class PollingWatcher:
+    """Detects changes by comparing file modification times.
+
+    Each poll re-runs discovery, so new files are picked up and excluded
+    directories stay pruned.
+    """
+
+    def __init__(
+        self,
+        finder: FileFinder,
+        paths: Sequence[str],
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """Take an initial snapshot of the files under ``paths``."""
+        self._finder: FileFinder = finder
+        self._paths: Sequence[str] = paths
+        self._interval: float = interval
+        self._snapshot: dict[str, int] = self._scan()
+
+    def _scan(self) -> dict[str, int]:
+        snapshot: dict[str, int] = {}
+        for path in self._finder.discover(self._paths):
+            try:
+                snapshot[_absolute(path)] = Path(path).stat().st_mtime_ns
+            except OSError:
+                continue
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Poll until a file changes or ``timeout`` seconds pass."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path
+                for path in current.keys() | self._snapshot.keys()
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            pause = self._interval
+            if deadline is not None:
+                pause = min(pause, max(0.0, deadline - time.monotonic()))
+            time.sleep(pause)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class _Libc(Protocol):
+    def inotify_init1(self, flags: int, /) -> int: ...
+    def inotify_add_watch(self, fd: int, path: bytes, mask: int, /) -> int: ...
+
+
+def _load_libc() -> _Libc | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    name = ctypes.util.find_library("c")
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc  # pyright: ignore[reportReturnType]
+
+
+@final
+class InotifyWatcher:
+    """Linux inotify watcher over every directory that discovery walks.
+
+    Directories created while watching are added as they appear.
+    """
+
+    def __init__(self, libc: _Libc, finder: FileFinder, paths: Sequence[str]) -> None:
+        """Create the inotify instance and watch the directory trees."""
+        self._libc: _Libc = libc
+        self._finder: FileFinder = finder
+        self._paths: Sequence[str] = paths
+        self._targets: _Targets = _Targets(finder, paths)
+        self._directories: dict[int, str] = {}
+        self._fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        for path in paths:
+            absolute = Path(path).absolute()
+            if absolute.is_dir():
+                self._watch_tree(str(absolute))
+            else:
+                self._watch(str(absolute.parent))
+
+    def _watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._directories[wd] = directory
+
+    def _watch_tree(self, top: str) -> None:
+        for directory in self._finder.directories(top):
+            self._watch(directory)
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Wait for events and return the files they touch."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return changed
+            if self._parse(data, changed):
+                return self._everything()
+
+    def _parse(self, data: bytes, changed: set[str]) -> bool:
+        """Add changed files from raw events; return whether the queue overflowed."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = cast(
+                "tuple[int, int, int, int]", _EVENT.unpack_from(data, offset)
+            )
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                return True
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = str(Path(directory, name))
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and self._targets.walks(path):
+                    self._watch_tree(path)
+                    changed.update(_files_under(self._finder, path))
+            elif not mask & _IN_CREATE:
+                # Creation is followed by a write; the write event suffices.
+                changed.add(path)
+        return False
+
+    def _everything(self) -> set[str]:
+        return {_absolute(path) for path in self._finder.discover(self._paths)}
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        os.close(self._fd)
+
+
+def _absolute(path: str) -> str:
+    return str(Path(path).absolute())
+
+
+def _files_under(finder: FileFinder, directory: str) -> set[str]:
+    return {_absolute(path) for path in finder.discover([directory])}
+
+
+def create_watcher(
+    finder: FileFinder, paths: Sequence[str], *, poll: bool = False
+) -> Watcher:
+    """Create an inotify watcher where available, else a polling watcher."""
+    if not poll and (libc := _load_libc()) is not None:
+        try:
+            return InotifyWatcher(libc, finder, paths)
+        except OSError:
+            pass
+    return PollingWatcher(finder, paths)
+
+
+def collect(
+    watcher: Watcher, debounce: float, timeout: float | None = None
+) -> set[str]:
+    """Wait for a change, then gather further changes until ``debounce`` passes quietly.
+
+    Editors often write a file several times per save (temporary file, rename,
+    metadata update). Debouncing folds such a burst into a single batch.
+    """
+    changed = watcher.wait(timeout)
+    while changed:
+        more = watcher.wait(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+@final
+class Session:
+    """A running watch session over a set of paths."""
+
+    def __init__(
+        self,
+        finder: FileFinder,
+        paths: Sequence[str],
+        analyze: Callable[[Sequence[str]], object],
+        watcher: Watcher,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> None:
+        """Set up a session that passes batches of changed files to ``analyze``."""
+        self._analyze: Callable[[Sequence[str]], object] = analyze
+        self._targets: _Targets = _Targets(finder, paths)
+        self._watcher: Watcher = watcher
+        self._debounce: float = debounce
+
+    def step(self, timeout: float | None = None) -> list[str]:
+        """Wait for one debounced batch and analyze the changed files in it.
+
+        Returns the analyzed paths, relative to the current directory when
+        they are below it. Deleted files are skipped.
+        """
+        changed = collect(self._watcher, self._debounce, timeout)
+        batch = sorted(
+            _display(path)
+            for path in changed
+            if path in self._targets and Path(path).is_file()
+        )
+        if batch:
+            _ = self._analyze(batch)
+        return batch
+
+
+def _display(path: str) -> str:
+    cwd = f"{Path.cwd()}{os.sep}"
+    return path.removeprefix(cwd)
@@ -0,0 +1,34 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aitells.documents import PlainTextAdapter
+from aitells.pipeline import Pipeline
+from aitells.rules import select_rules
+
+if TYPE_CHECKING:
+    from pytest_codspeed import BenchmarkFixture
+
+_PARAGRAPHS = (
+    "Arguably, the approach works. In many cases it helps. Plain sentence.",
+    "Moreover, the results hold. To some extent they vary across runs.",
+    "A plain paragraph with several sentences. Nothing here. Still nothing.",
+    "Furthermore, it scales. Generally speaking, that matters.",
+)
+_TEXT = "\n\n".join(_PARAGRAPHS * 2_500)
+
+
+def _analyze(pipeline: Pipeline) -> None:
+    _ = pipeline.analyze_segments(PlainTextAdapter().segments("a.txt", _TEXT))
+
+
+@pytest.mark.benchmark
+def test_pattern_rules(benchmark: "BenchmarkFixture") -> None:
+    pipeline = Pipeline(select_rules(["VF", "RM"]))
+    benchmark(lambda: _analyze(pipeline))
+
+
+@pytest.mark.benchmark
+def test_pattern_and_density_rules(benchmark: "BenchmarkFixture") -> None:
+    pipeline = Pipeline(select_rules(["VF", "RM", "ST003", "ST004"]))
+    benchmark(lambda: _analyze(pipeline))
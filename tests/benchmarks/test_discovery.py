@@ -0,0 +1,99 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aitells.config import PathSettings
+from aitells.discovery import FileFinder
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_codspeed import BenchmarkFixture
+
+# Shape of one synthetic package: prose and source files next to a dependency
+# directory that dominates the entry count, as in a JavaScript monorepo.
+_PACKAGE_ENTRIES = 10_000
+_DOCS = 40
+_SOURCES = 200
+_MODULE_FILES = 49
+
+
+def _build_package(root: "Path") -> None:
+    docs = root / "docs"
+    src = root / "src"
+    docs.mkdir(parents=True)
+    src.mkdir()
+    for i in range(_DOCS):
+        (docs / f"page{i}.md").touch()
+    for i in range(_SOURCES):
+        (src / f"module{i}.ts").touch()
+    remaining = _PACKAGE_ENTRIES - _DOCS - _SOURCES - 3
+    modules = root / "node_modules"
+    modules.mkdir()
+    for m in range(remaining // (_MODULE_FILES + 1)):
+        module = modules / f"dep{m}"
+        module.mkdir()
+        for i in range(_MODULE_FILES):
+            (module / f"file{i}.md").touch()
+
+
+def _build_tree(root: "Path", entries: int) -> "Path":
+    for p in range(entries // _PACKAGE_ENTRIES):
+        _build_package(root / "packages" / f"pkg{p}")
+    return root
+
+
+@pytest.fixture(scope="module")
+def small_tree(tmp_path_factory: pytest.TempPathFactory) -> "Path":
+    return _build_tree(tmp_path_factory.mktemp("tree"), 20_000)
+
+
+@pytest.fixture(scope="module")
+def large_tree(tmp_path_factory: pytest.TempPathFactory) -> "Path":
+    return _build_tree(tmp_path_factory.mktemp("tree"), 1_000_000)
+
+
+def _discover(root: "Path") -> list[str]:
+    return list(FileFinder(PathSettings(), root).discover([root]))
+
+
+def _naive(root: "Path") -> list["Path"]:
+    return [
+        path
+        for path in root.rglob("*")
+        if path.suffix in {".md", ".txt", ".rst"}
+        and "node_modules" not in path.parts
+        and path.is_file()
+    ]
+
+
+@pytest.mark.benchmark
+def test_discovery(benchmark: "BenchmarkFixture", small_tree: "Path") -> None:
+    found = benchmark(_discover, small_tree)
+    assert len(found) == 2 * _DOCS
+
+
+@pytest.mark.benchmark
+def test_discovery_naive_rglob(
+    benchmark: "BenchmarkFixture", small_tree: "Path"
+) -> None:
+    found = benchmark(_naive, small_tree)
+    assert len(found) == 2 * _DOCS
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+def test_discovery_1m_entries(
+    benchmark: "BenchmarkFixture", large_tree: "Path"
+) -> None:
+    found = benchmark(_discover, large_tree)
+    assert len(found) == 100 * _DOCS
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+def test_discovery_1m_entries_naive_rglob(
+    benchmark: "BenchmarkFixture", large_tree: "Path"
+) -> None:
+    found = benchmark(_naive, large_tree)
+    assert len(found) == 100 * _DOCS
@@ -0,0 +1,67 @@
+import io
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aitells.analyzer import Analyzer
+from aitells.config import Settings
+from aitells.output import create_writer
+from aitells.pool import analyze_files
+
+if TYPE_CHECKING:
+    from pytest_codspeed import BenchmarkFixture
+
+# A corpus of mid-sized documents with pattern, density, and uniformity hits,
+# large enough that analysis rather than pool startup dominates.
+_FILES = 200
+_JOBS = 4
+_PARAGRAPHS = (
+    "Arguably, the approach works. In many cases it helps. Plain sentence.",
+    "Moreover, the results hold. To some extent they vary across runs.",
+    "A plain paragraph with several sentences. Nothing here. Still nothing.",
+    "We delve into the rich tapestry of the codebase. Generally speaking, fine.",
+)
+_SELECT = ("VF", "RM", "FT", "ST003", "ST004", "ST006", "ST008")
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> list[str]:
+    root = tmp_path_factory.mktemp("corpus")
+    text = "\n\n".join(_PARAGRAPHS * 100)
+    paths: list[str] = []
+    for i in range(_FILES):
+        path = root / f"doc{i}.md"
+        _ = path.write_text(text)
+        paths.append(str(path))
+    return paths
+
+
+def _run(paths: list[str], *, jobs: int, threads: bool) -> int:
+    """Analyze and format the corpus as ``aitells check`` does; return findings."""
+    analyzer = Analyzer(Settings(select=_SELECT))
+    writer = create_writer("json", io.StringIO())
+    writer.begin()
+    for path, findings, text in analyze_files(
+        analyzer, paths, jobs=jobs, threads=threads, render=writer.render
+    ):
+        assert not isinstance(findings, OSError)
+        writer.write(path, findings, text)
+    writer.end()
+    return writer.findings
+
+
+@pytest.mark.benchmark
+def test_serial(benchmark: "BenchmarkFixture", corpus: list[str]) -> None:
+    assert benchmark(lambda: _run(corpus, jobs=1, threads=False))
+
+
+@pytest.mark.benchmark
+def test_process_pool(benchmark: "BenchmarkFixture", corpus: list[str]) -> None:
+    assert benchmark(lambda: _run(corpus, jobs=_JOBS, threads=False))
+
+
+@pytest.mark.benchmark
+def test_thread_pool(benchmark: "BenchmarkFixture", corpus: list[str]) -> None:
+    # Threads only run in parallel on a free-threaded build with the GIL
+    # disabled; elsewhere this measures the GIL-bound baseline.
+    assert benchmark(lambda: _run(corpus, jobs=_JOBS, threads=True))
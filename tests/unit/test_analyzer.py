@@ -0,0 +1,101 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+import aitells
+from aitells.analyzer import Analyzer
+from aitells.config import Settings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from aitells.findings import Finding
+
+TEXT = "We delve into the tapestry.\n\nMoreover, it's worth noting the results.\n"
+
+
+def test_package_exports_analyzer():
+    assert aitells.Analyzer is Analyzer
+    with pytest.raises(AttributeError):
+        _ = aitells.Missing
+
+
+def test_analyze_returns_findings_in_source_order():
+    findings = Analyzer().analyze(TEXT)
+    assert [(f.line, f.code) for f in findings] == [
+        (1, "VF001"),
+        (1, "VF001"),
+        (3, "VF003"),
+        (3, "RM002"),
+    ]
+    assert {f.path for f in findings} == {"<text>"}
+
+
+def test_path_selects_adapter():
+    text = "```\nWe delve.\n```\n\nPlain prose.\n"
+    assert Analyzer().analyze(text, path="doc.txt")
+    assert not Analyzer().analyze(text, path="doc.md")
+
+
+def test_settings_select_rules():
+    analyzer = Analyzer(Settings(select=("VF003",)))
+    assert [rule.code for rule in analyzer.rules] == ["VF003"]
+    assert [f.code for f in analyzer.analyze(TEXT)] == ["VF003"]
+
+
+def test_from_config_applies_overrides(tmp_path: "Path"):
+    config = tmp_path / "aitells.toml"
+    _ = config.write_text('select = ["VF"]\nignore = ["VF003"]\n')
+    analyzer = Analyzer.from_config(config, ignore=["VF001"])
+    assert "VF003" in {rule.code for rule in analyzer.rules}
+    assert "VF001" not in {rule.code for rule in analyzer.rules}
+
+
+def test_analyze_many_streams_results_in_order(monkeypatch: pytest.MonkeyPatch):
+    analyzer = Analyzer()
+    texts = ["We delve.", "Nothing here.", "Moreover, yes."]
+    consumed: list[str] = []
+    analyzed: list[str] = []
+    analyze = analyzer.analyze
+
+    def source():
+        for text in texts:
+            consumed.append(text)
+            yield text
+
+    def record(text: str, *, path: str) -> "list[Finding]":
+        analyzed.append(text)
+        return analyze(text, path=path)
+
+    monkeypatch.setattr(analyzer, "analyze", record)
+    results = analyzer.analyze_many(source(), batch_size=2)
+    first = next(results)
+    assert [f.code for f in first] == ["VF001"]
+    assert consumed == texts[:2]
+    # The first result doesn't wait for the rest of its batch.
+    assert analyzed == texts[:1]
+    assert [[f.code for f in rest] for rest in results] == [[], ["VF003"]]
+
+
+def test_analyze_many_rejects_empty_batches():
+    with pytest.raises(ValueError, match="batch_size"):
+        _ = list(Analyzer().analyze_many(["text"], batch_size=0))
+
+
+def test_analyze_async_matches_sync():
+    analyzer = Analyzer()
+
+    async def run():
+        return await asyncio.gather(*(analyzer.analyze_async(TEXT) for _ in range(4)))
+
+    assert asyncio.run(run()) == [analyzer.analyze(TEXT)] * 4
+
+
+def test_shared_across_threads():
+    analyzer = Analyzer()
+    texts = [f"{TEXT}\n{'Furthermore, ' * n}done.\n" for n in range(50)]
+    expected = [analyzer.analyze(text) for text in texts]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(analyzer.analyze, texts)) == expected
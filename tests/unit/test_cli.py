@@ -0,0 +1,181 @@
+import json
+import subprocess
+import sys
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+from aitells.cli import EXIT_ERROR, EXIT_FINDINGS, EXIT_OK, main
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+# The results of a parsed SARIF run, down to each location's region.
+_Results = list[dict[str, list[dict[str, dict[str, dict[str, int]]]]]]
+
+
+@pytest.fixture
+def docs(tmp_path: "Path") -> "Path":
+    _ = (tmp_path / "clean.md").write_text("Plain words here.\n")
+    _ = (tmp_path / "tells.md").write_text("We delve into it.\n\nMoreover, it works.\n")
+    _ = (tmp_path / "skip.py").write_text("delve = 1\n")
+    return tmp_path
+
+
+def test_check_reports_findings(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", str(docs)]) == EXIT_FINDINGS
+    out = capsys.readouterr().out
+    assert f"{docs / 'tells.md'}:1:4: overused-vocabulary" in out
+    assert f"{docs / 'tells.md'}:3:1: formal-transitions" in out
+    assert "skip.py" not in out
+
+
+def test_check_clean_file(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", str(docs / "clean.md")]) == EXIT_OK
+    assert capsys.readouterr().out == ""
+
+
+def test_check_warns_that_semantic_rules_need_a_judge(
+    docs: "Path", capsys: pytest.CaptureFixture[str]
+):
+    assert main(["check", "--select", "VF001,SE005", str(docs)]) == EXIT_FINDINGS
+    assert "skipping SE005" in capsys.readouterr().err
+    assert main(["check", "--select", "VF001", str(docs)]) == EXIT_FINDINGS
+    assert capsys.readouterr().err == ""
+
+
+def test_check_ndjson(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", "--format", "ndjson", str(docs)]) == EXIT_FINDINGS
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records[-1] == {"type": "summary", "files": 2, "findings": 2}
+
+
+def test_check_select_and_ignore(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", "--select", "VF", "--ignore", "VF001", str(docs)]) == (
+        EXIT_FINDINGS
+    )
+    out = capsys.readouterr().out
+    assert "overused-vocabulary" not in out
+    assert "formal-transitions" in out
+
+
+def test_check_quiet(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", "--quiet", "--format", "json", str(docs)]) == EXIT_FINDINGS
+    assert capsys.readouterr().out == ""
+
+
+def test_check_unknown_rule(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", "--select", "ZZ9", str(docs)]) == EXIT_ERROR
+    assert "ZZ9" in capsys.readouterr().err
+
+
+def test_check_missing_file(tmp_path: "Path", capsys: pytest.CaptureFixture[str]):
+    assert main(["check", str(tmp_path / "missing.md")]) == EXIT_ERROR
+    assert "missing.md" in capsys.readouterr().err
+
+
+# Modules that only some subcommands use, which plain `aitells check` skips.
+_DEFERRED = (
+    "aitells.serve",
+    "http.server",
+    "aitells.watch",
+    "ctypes",
+    "aitells.shard",
+    "multiprocessing",
+    "concurrent.futures.process",
+)
+
+
+def test_cli_defers_subcommand_modules():
+    code = (
+        f"import sys, aitells.cli; print([m for m in {_DEFERRED} if m in sys.modules])"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout == "[]\n"
+
+
+def test_serve_rejects_bad_options(capsys: pytest.CaptureFixture[str]):
+    assert main(["serve", "--workers", "0"]) == EXIT_ERROR
+    assert "--workers must be at least 1" in capsys.readouterr().err
+    assert main(["serve", "--select", "XX999"]) == EXIT_ERROR
+    assert "XX999" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "sarif"])
+def test_sharded_runs_merge_into_one_report(
+    docs: "Path", capsys: pytest.CaptureFixture[str], output_format: str
+):
+    _ = (docs / "more.md").write_text("Furthermore, we delve deeper.\n")
+    check = ["check", "--format", output_format, str(docs)]
+    reports = {"whole": check, "shard1": [*check, "--shard", "1/2"]}
+    reports["shard2"] = [*check, "--shard", "2/2"]
+    for name, args in reports.items():
+        _ = main(args)
+        _ = (docs / f"{name}.out").write_text(capsys.readouterr().out)
+
+    def merge(*names: str) -> object:
+        paths = [str(docs / f"{name}.out") for name in names]
+        assert main(["merge", "--format", "json", *paths]) == EXIT_FINDINGS
+        return cast("object", json.loads(capsys.readouterr().out))
+
+    whole = merge("whole")
+    assert whole == merge("shard1", "shard2")
+    assert cast("dict[str, object]", whole)["summary"] == {"files": 3, "findings": 4}
+
+
+def test_merge_without_findings(tmp_path: "Path", capsys: pytest.CaptureFixture[str]):
+    report = tmp_path / "report.ndjson"
+    _ = report.write_text('{"type": "summary", "files": 4, "findings": 0}\n')
+    assert main(["merge", "--format", "markdown", str(report), str(report)]) == EXIT_OK
+    assert capsys.readouterr().out.endswith("0 findings in 8 files.\n")
+
+
+def test_merge_writes_sarif_with_rules_from_other_tools(
+    tmp_path: "Path", capsys: pytest.CaptureFixture[str]
+):
+    result = {
+        "ruleId": "E501",
+        "message": {"text": "Line too long"},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": "setup.py"},
+                    "region": {"startLine": 3},
+                }
+            }
+        ],
+    }
+    driver = {"name": "flake8", "rules": [{"id": "E501"}]}
+    log = {
+        "version": "2.1.0",
+        "runs": [{"tool": {"driver": driver}, "results": [result]}],
+    }
+    report = tmp_path / "flake8.sarif"
+    _ = report.write_text(json.dumps(log))
+    assert main(["merge", "--format", "sarif", str(report)]) == EXIT_FINDINGS
+    log = cast("dict[str, object]", json.loads(capsys.readouterr().out))
+    run = cast("list[dict[str, object]]", log["runs"])[0]
+    driver = cast("dict[str, dict[str, object]]", run["tool"])["driver"]
+    assert driver["rules"] == [{"id": "E501", "name": "E501"}]
+    results = cast("_Results", run["results"])
+    region = results[0]["locations"][0]["physicalLocation"]["region"]
+    assert region == {"startLine": 3, "startColumn": 1}
+
+
+def test_merge_rejects_bad_reports(
+    tmp_path: "Path", capsys: pytest.CaptureFixture[str]
+):
+    report = tmp_path / "report.txt"
+    _ = report.write_text("docs/a.md:1:1: x - y\n")
+    assert main(["merge", str(report)]) == EXIT_ERROR
+    assert "report.txt" in capsys.readouterr().err
+    assert main(["merge", str(tmp_path / "missing.json")]) == EXIT_ERROR
+
+
+def test_check_rejects_bad_shard(docs: "Path", capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit):
+        _ = main(["check", "--shard", "3/2", str(docs)])
+    assert "Invalid shard" in capsys.readouterr().err
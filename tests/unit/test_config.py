@@ -0,0 +1,139 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aitells.config import (
+    DEFAULT_EXCLUDE,
+    ConfigError,
+    Settings,
+    load_settings,
+    parse_settings,
+    with_overrides,
+)
+from aitells.escalation import Budget
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_defaults():
+    settings = parse_settings({})
+    assert settings == Settings()
+    assert settings.paths.all_excludes == DEFAULT_EXCLUDE
+
+
+def test_paths_table():
+    settings = parse_settings(
+        {
+            "paths": {
+                "include": ["docs/**/*.md"],
+                "extend-exclude": ["CHANGELOG.md"],
+                "respect-gitignore": False,
+            }
+        }
+    )
+    assert settings.paths.include == ("docs/**/*.md",)
+    assert settings.paths.all_excludes == (*DEFAULT_EXCLUDE, "CHANGELOG.md")
+    assert not settings.paths.respect_gitignore
+
+
+def test_rules_combine_select_and_extend_options():
+    settings = parse_settings(
+        {"select": ["ST"], "extend-select": ["SE001"], "extend-ignore": ["ST001"]}
+    )
+    codes = {rule.code for rule in settings.rules()}
+    assert "SE001" in codes
+    assert "ST001" not in codes
+    assert not any(code.startswith("VF") for code in codes)
+
+
+def test_rule_thresholds_by_name_or_code():
+    settings = parse_settings(
+        {"rules": {"hedge-stacking": {"threshold": 2}, "ST004": {"threshold": 4}}}
+    )
+    assert settings.thresholds == {"ST003": 2, "ST004": 4}
+
+
+def test_llm_table():
+    settings = parse_settings(
+        {
+            "llm": {"enabled": True, "max-tokens": 50_000, "max-seconds": 90},
+            "rules": {"SE005": {"threshold": 4}},
+        }
+    )
+    assert settings.llm.enabled
+    assert settings.llm.budget == Budget(max_tokens=50_000, max_seconds=90)
+    assert settings.thresholds == {"SE005": 4}
+    assert Settings().llm.budget == Budget()
+
+
+@pytest.mark.parametrize(
+    ("table", "message"),
+    [
+        ({"selct": ["ST"]}, "selct"),
+        ({"paths": {"inclde": []}}, "paths.inclde"),
+        ({"select": "ST"}, "list of strings"),
+        ({"output": {"quiet": "yes"}}, "true or false"),
+        ({"paths": []}, "table"),
+        (
+            {"rules": {"hedge-stacking": {"treshold": 2}}},
+            "rules.hedge-stacking.treshold",
+        ),
+        ({"rules": {"hedge-stackin": {}}}, "Unknown rule"),
+        ({"rules": {"triads": {"threshold": 2}}}, "only to density and semantic rules"),
+        ({"rules": {"ST003": {"threshold": 0}}}, "positive integer"),
+        ({"rules": {"ST003": 3}}, "'rules.ST003' must be a table"),
+        ({"llm": {"max-token": 1}}, "llm.max-token"),
+        ({"llm": {"max-tokens": 1.5}}, "positive integer"),
+        ({"llm": {"max-seconds": 0}}, "positive number"),
+        ({"llm": {"max-seconds": True}}, "positive number"),
+    ],
+)
+def test_invalid_settings(table: dict[str, object], message: str):
+    with pytest.raises(ConfigError, match=message):
+        _ = parse_settings(table)
+
+
+def test_load_finds_aitells_toml_in_parents(tmp_path: "Path"):
+    _ = (tmp_path / "aitells.toml").write_text('select = ["VF"]\n')
+    nested = tmp_path / "docs" / "guide"
+    nested.mkdir(parents=True)
+    settings = load_settings(start=nested)
+    assert settings.select == ("VF",)
+    assert settings.root == tmp_path.resolve()
+
+
+def test_load_reads_tool_table_from_pyproject(tmp_path: "Path"):
+    _ = (tmp_path / "pyproject.toml").write_text(
+        '[tool.aitells.output]\nformat = "json"\n'
+    )
+    assert load_settings(start=tmp_path).output_format == "json"
+
+
+def test_load_skips_pyproject_without_tool_table(tmp_path: "Path"):
+    _ = (tmp_path / "pyproject.toml").write_text('[project]\nname = "x"\n')
+    assert load_settings(start=tmp_path).root is None
+
+
+def test_load_explicit_path(tmp_path: "Path"):
+    config = tmp_path / "custom.toml"
+    _ = config.write_text('ignore = ["VF003"]\n')
+    assert load_settings(config).ignore == ("VF003",)
+
+
+def test_load_invalid_toml(tmp_path: "Path"):
+    config = tmp_path / "aitells.toml"
+    _ = config.write_text("select = [\n")
+    with pytest.raises(ConfigError, match="Invalid TOML"):
+        _ = load_settings(config)
+
+
+def test_load_missing_file(tmp_path: "Path"):
+    with pytest.raises(ConfigError, match="Cannot read"):
+        _ = load_settings(tmp_path / "missing.toml")
+
+
+def test_with_overrides_skips_none():
+    settings = with_overrides(Settings(), select=("VF",), ignore=None)
+    assert settings.select == ("VF",)
+    assert settings.ignore == ()
@@ -0,0 +1,120 @@
+from typing import TYPE_CHECKING
+
+from aitells.density import DENSITY_RULES, DensityCounter, DensityRule, Unit
+from aitells.documents import PlainTextAdapter, read_segments
+from aitells.pipeline import Pipeline
+from aitells.rules import get_rule, select_rules
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+HEDGE = DensityRule("ST003", frozenset({"RM002"}), "hedge", Unit.SENTENCE, 2, 2)
+
+
+def test_counter_reports_crossing_once():
+    counter = DensityCounter([HEDGE], {})
+    counter.paragraph()
+    assert counter.add("RM002") == []
+    assert counter.add("VF003") == []
+    assert counter.add("RM002") == [("ST003", "2 hedges within 2 sentences")]
+    assert counter.add("RM002") == []
+
+
+def test_counter_window_slides():
+    counter = DensityCounter([HEDGE], {})
+    counter.paragraph()
+    assert counter.add("RM002") == []
+    counter.sentence()
+    counter.sentence()
+    assert counter.add("RM002") == []
+    counter.paragraph()
+    assert counter.add("RM002") == [("ST003", "2 hedges within 2 sentences")]
+
+
+def test_counter_threshold_override():
+    counter = DensityCounter([HEDGE], {"ST003": 1})
+    counter.paragraph()
+    assert counter.add("RM002") == [("ST003", "1 hedge within 2 sentences")]
+
+
+def test_paragraph_windows_ignore_sentences():
+    rule = DensityRule("ST004", frozenset({"VF003"}), "turn", Unit.PARAGRAPH, 2, 2)
+    counter = DensityCounter([rule], {})
+    counter.paragraph()
+    assert counter.add("VF003") == []
+    counter.sentence()
+    counter.sentence()
+    counter.paragraph()
+    assert counter.add("VF003") == [("ST004", "2 turns within 2 paragraphs")]
+
+
+def test_density_rules_are_catalogued():
+    for code, rule in DENSITY_RULES.items():
+        assert get_rule(code).code == rule.code
+        assert all(get_rule(source) for source in rule.sources)
+
+
+def _analyze(pipeline: Pipeline, text: str) -> list[tuple[int, str]]:
+    segments = PlainTextAdapter().segments("a.txt", text)
+    return [(f.line, f.code) for f in pipeline.analyze_segments(segments)]
+
+
+STACKED = (
+    "Arguably, this works. In many cases it helps.\n"
+    "To some extent, results vary. Nothing else.\n"
+)
+
+
+def test_hedge_stacking_flags_clustered_hedges():
+    pipeline = Pipeline(select_rules(["RM002", "ST003"]))
+    assert _analyze(pipeline, STACKED) == [
+        (1, "RM002"),
+        (1, "RM002"),
+        (2, "RM002"),
+        (2, "ST003"),
+    ]
+
+
+def test_hedge_stacking_ignores_spread_out_hedges():
+    pipeline = Pipeline(select_rules(["ST003"]))
+    text = "Arguably, one. Two. Three.\n\nFour. In many cases, five. Six. Seven.\n"
+    text += "\nEight. Nine. To some extent, ten.\n"
+    assert _analyze(pipeline, text) == []
+    assert _analyze(Pipeline(select_rules(["ST003"]), {"ST003": 1}), text) == [
+        (1, "ST003"),
+        (3, "ST003"),
+        (5, "ST003"),
+    ]
+
+
+def test_sources_are_counted_without_being_reported():
+    pipeline = Pipeline(select_rules(["ST003"]))
+    assert "RM002" in pipeline.matcher.codes
+    findings = pipeline.analyze_segments(PlainTextAdapter().segments("a.txt", STACKED))
+    assert [(f.code, f.message) for f in findings] == [
+        ("ST003", "Multiple hedges in close proximity: 3 hedges within 3 sentences")
+    ]
+
+
+def test_transition_cadence_spans_paragraphs():
+    pipeline = Pipeline(select_rules(["ST004"]))
+    text = "Moreover, a.\n\nPlain.\n\nFurthermore, b.\n\nAdditionally, c.\n"
+    assert _analyze(pipeline, text) == [(7, "ST004")]
+    assert pipeline.context == DENSITY_RULES["ST004"].window
+
+
+def test_chunked_density_matches_whole_file(tmp_path: "Path"):
+    path = tmp_path / "book.txt"
+    paragraphs = [
+        "Arguably, one. In many cases, two.",
+        "To some extent, three. Moreover, four.",
+        "Plain.",
+        "Furthermore, five.",
+        "Additionally, six. Generally speaking, seven.",
+    ]
+    _ = path.write_text("\n\n".join(paragraphs * 40) + "\n")
+    pipeline = Pipeline(select_rules())
+    expected = pipeline.analyze_segments(read_segments(path))
+    assert {f.code for f in expected} >= {"ST003", "ST004"}
+    for chunk_size in (1, 100, 1000):
+        assert pipeline.analyze_file(path, chunk_size=chunk_size) == expected
@@ -0,0 +1,175 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from aitells.config import PathSettings
+from aitells.discovery import FileFinder, GitIgnore, GlobMatcher
+
+
+def _touch(root: Path, *names: str) -> None:
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ = path.write_text("")
+
+
+def _relative(root: Path, paths: list[str]) -> list[str]:
+    return [Path(path).relative_to(root).as_posix() for path in paths]
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    _touch(
+        tmp_path,
+        "README.md",
+        "setup.py",
+        "docs/guide.md",
+        "docs/api/index.rst",
+        "docs/notes.txt",
+        "vendor/lib/README.md",
+        "node_modules/pkg/README.md",
+        "site/generated.md",
+        "CHANGELOG.md",
+    )
+    return tmp_path
+
+
+def test_glob_matcher_basename_and_anchored_patterns():
+    matcher = GlobMatcher(["*.md", "docs/**/*.rst"], ["vendor/", "*.min.md"])
+    assert matcher.includes_file("a/b/c.md")
+    assert matcher.includes_file("docs/x/y.rst")
+    assert not matcher.includes_file("other/y.rst")
+    assert not matcher.includes_file("a/page.min.md")
+    assert matcher.excludes_dir("a/vendor")
+    assert not matcher.excludes_dir("a/vendored")
+    assert GlobMatcher(["*"], ["vendor/"]).includes_file("vendor")
+
+
+def test_walk_prunes_excluded_directories(tree: Path):
+    settings = PathSettings(extend_exclude=("vendor/", "CHANGELOG.md"))
+    found = _relative(tree, list(FileFinder(settings, tree).discover([tree])))
+    assert found == [
+        "README.md",
+        "docs/guide.md",
+        "docs/notes.txt",
+        "docs/api/index.rst",
+        "site/generated.md",
+    ]
+
+
+def test_walk_order_is_deterministic(tree: Path):
+    finder = FileFinder(PathSettings(), tree)
+    found = _relative(tree, list(finder.discover([tree])))
+    assert found == [
+        "CHANGELOG.md",
+        "README.md",
+        "docs/guide.md",
+        "docs/notes.txt",
+        "docs/api/index.rst",
+        "site/generated.md",
+        "vendor/lib/README.md",
+    ]
+
+
+def test_excluded_directories_are_never_opened(
+    tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    opened: list[str] = []
+    scandir = os.scandir
+
+    def spy(path: str) -> object:
+        opened.append(Path(path).name)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", spy)
+    _ = list(FileFinder(PathSettings(), tree).discover([tree]))
+    assert "node_modules" not in opened
+    assert "pkg" not in opened
+
+
+def test_include_patterns_are_relative_to_project_root(tree: Path):
+    settings = PathSettings(include=("docs/**/*.rst",))
+    found = list(FileFinder(settings, tree).discover([tree / "docs"]))
+    assert _relative(tree, found) == ["docs/api/index.rst"]
+
+
+def test_explicit_files_bypass_filters(tree: Path):
+    finder = FileFinder(PathSettings(), tree)
+    assert list(finder.discover([tree / "setup.py"])) == [str(tree / "setup.py")]
+
+
+def test_current_directory_yields_bare_paths(
+    tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tree / "docs")
+    found = list(FileFinder(PathSettings(), tree).discover(["."]))
+    assert found[:2] == ["guide.md", "notes.txt"]
+
+
+def test_respects_gitignore(tree: Path):
+    (tree / ".git").mkdir()
+    _ = (tree / ".gitignore").write_text("# build output\nsite/\n*.txt\n")
+    _ = (tree / "docs" / ".gitignore").write_text("api/\n")
+    found = _relative(tree, list(FileFinder(PathSettings(), tree).discover([tree])))
+    assert "site/generated.md" not in found
+    assert "docs/notes.txt" not in found
+    assert "docs/api/index.rst" not in found
+    assert "docs/guide.md" in found
+
+
+def test_gitignore_of_ancestors_applies_to_nested_walk(tree: Path):
+    (tree / ".git").mkdir()
+    _ = (tree / ".gitignore").write_text("docs/api/\n")
+    found = list(FileFinder(PathSettings(), tree).discover([tree / "docs"]))
+    assert "docs/api/index.rst" not in _relative(tree, found)
+
+
+def test_gitignore_can_be_disabled(tree: Path):
+    (tree / ".git").mkdir()
+    _ = (tree / ".gitignore").write_text("*.md\n")
+    settings = PathSettings(respect_gitignore=False)
+    assert "README.md" in _relative(
+        tree, list(FileFinder(settings, tree).discover([tree]))
+    )
+
+
+def test_gitignore_negation_and_directory_patterns():
+    ignore = GitIgnore("", ["*.md", "!keep.md", "build/"])
+    assert ignore.match("a/drop.md", is_dir=False)
+    assert ignore.match("a/keep.md", is_dir=False) is False
+    assert ignore.match("a/build", is_dir=True)
+    assert ignore.match("a/build", is_dir=False) is None
+
+
+def test_gitignore_in_subdirectory_only_applies_below_it():
+    ignore = GitIgnore("docs", ["/draft.md"])
+    assert ignore.match("docs/draft.md", is_dir=False)
+    assert ignore.match("docs/sub/draft.md", is_dir=False) is None
+    assert ignore.match("draft.md", is_dir=False) is None
+
+
+def test_includes(tree: Path):
+    finder = FileFinder(PathSettings(), tree)
+    assert finder.includes(tree / "docs" / "guide.md")
+    assert not finder.includes(tree / "node_modules" / "pkg" / "README.md")
+    assert not finder.includes(tree / "setup.py")
+    assert not finder.includes(tree.parent / "elsewhere.md")
+
+
+def test_includes_applies_gitignore_like_discovery(tree: Path):
+    (tree / ".git").mkdir()
+    _ = (tree / ".gitignore").write_text("site/\n")
+    _ = (tree / "docs" / ".gitignore").write_text("*.txt\n")
+    finder = FileFinder(PathSettings(), tree)
+    found = {Path(path) for path in finder.discover([tree])}
+    for path in (tree / "site" / "generated.md", tree / "docs" / "notes.txt"):
+        assert path not in found
+        assert not finder.includes(path)
+    assert finder.excludes_directory(tree / "site" / "nested")
+    # A walk that starts inside an ignored directory still covers it.
+    assert finder.includes(tree / "site" / "generated.md", tree / "site")
+    assert list(finder.directories(tree / "docs")) == [
+        str(tree / "docs"),
+        str(tree / "docs" / "api"),
+    ]
@@ -0,0 +1,183 @@
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aitells.documents import (
+    MarkdownAdapter,
+    PlainTextAdapter,
+    Segment,
+    adapter_for,
+    read_chunks,
+    read_segments,
+)
+from aitells.pipeline import Pipeline
+from aitells.rules import select_rules
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_segment_position_maps_offsets_to_lines_and_columns():
+    segment = Segment("a.txt", "one two\nthree four", line=3, column=5)
+    assert segment.position(4) == (3, 9)
+    assert segment.position(14) == (4, 7)
+
+
+def test_segments_are_views_of_one_source():
+    text = "# Title\n\n- One `code` item.\n\nA [link](http://x) here.\n"
+    segments = list(MarkdownAdapter().segments("a.md", text))
+    assert [s.text for s in segments] == [
+        "Title",
+        "One        item.",
+        "A [link]           here.",
+    ]
+    assert all(s.source is segments[0].source for s in segments)
+    assert len(segments[0].source) == len(text)
+    detached = segments[2].detached()
+    assert detached.source == detached.text == segments[2].text
+    assert detached.position(9) == segments[2].position(9) == (5, 10)
+
+
+def test_plain_text_splits_on_blank_lines():
+    text = "First para\ncontinues.\n\n  \n  Second para.\n"
+    segments = list(PlainTextAdapter().segments("a.txt", text))
+    assert [(s.text, s.line, s.column) for s in segments] == [
+        ("First para\ncontinues.", 1, 1),
+        ("Second para.", 5, 3),
+    ]
+
+
+def test_markdown_skips_code_front_matter_and_html():
+    text = "\n".join(
+        [
+            "---",
+            "title: Delve",
+            "---",
+            "# Heading",
+            "",
+            "Prose with `code` and [a link](https://delve.example).",
+            "",
+            "```python",
+            "delve = 1",
+            "```",
+            "",
+            "<div>",
+            "raw html",
+            "</div>",
+            "",
+            "    indented code",
+        ]
+    )
+    segments = list(MarkdownAdapter().segments("a.md", text))
+    assert [(s.context, s.line) for s in segments] == [
+        ("heading", 4),
+        ("paragraph", 6),
+    ]
+    heading, paragraph = segments
+    assert (heading.text, heading.column) == ("Heading", 3)
+    assert "code" not in paragraph.text
+    assert "https" not in paragraph.text
+    assert paragraph.text.index("link") == "Prose with `code` and [a link]".index(
+        "link"
+    )
+
+
+def test_markdown_list_items_and_block_quotes():
+    text = "- first item\n  continues\n- second item\n\n> quoted\n> more\n"
+    segments = list(MarkdownAdapter().segments("a.md", text))
+    assert [(s.context, s.line, s.column) for s in segments] == [
+        ("list_item", 1, 3),
+        ("list_item", 3, 3),
+        ("block_quote", 5, 3),
+    ]
+
+
+def test_adapter_for_suffix():
+    assert isinstance(adapter_for("README.md"), MarkdownAdapter)
+    assert isinstance(adapter_for("notes.txt"), PlainTextAdapter)
+    assert isinstance(adapter_for("unknown.xyz"), PlainTextAdapter)
+
+
+def _book(paragraphs: int) -> str:
+    lines = [
+        "Moreover, we delve into the tapestry of ideas.",
+        "Plain prose about cafés; it is worth\r\nnoting naïve readers.",
+        "  \t",
+        "It's worth noting\nthat hedges span lines.",
+    ]
+    return "\n\n".join(lines[i % len(lines)] for i in range(paragraphs)) + "\n"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 1000])
+@pytest.mark.parametrize("overlap", [0, 3])
+def test_chunked_analysis_matches_whole_file(
+    tmp_path: "Path", chunk_size: int, overlap: int
+):
+    path = tmp_path / "book.txt"
+    _ = path.write_bytes(_book(200).encode())
+    pipeline = Pipeline(select_rules(["VF", "RM", "FT"]))
+    pipeline.context = overlap
+    expected = pipeline.analyze_segments(read_segments(path))
+    assert expected
+    assert pipeline.analyze_file(path, chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [20, 1000])
+def test_crlf_line_breaks_are_not_blank_lines(tmp_path: "Path", chunk_size: int):
+    path = tmp_path / "book.txt"
+    paragraph = "Moreover, it is worth\r\nnoting this. Furthermore, it\r\nmatters."
+    paragraphs = 50
+    _ = path.write_bytes("\r\n\r\n".join([paragraph] * paragraphs).encode())
+    pipeline = Pipeline(select_rules(["RM002", "ST004"]))
+    pipeline.context = 2
+    expected = pipeline.analyze_segments(read_segments(path))
+    assert sum(f.code == "RM002" for f in expected) == paragraphs
+    assert pipeline.analyze_file(path, chunk_size=chunk_size) == expected
+
+
+def test_chunks_cut_at_blank_lines_and_repeat_lead(tmp_path: "Path"):
+    path = tmp_path / "book.txt"
+    _ = path.write_text("one\n\ntwo\nlines\n\nthree\n\nfour\n")
+    chunks = list(read_chunks(path, overlap=1, chunk_size=1))
+    assert [[s.text for s in c.segments] for c in chunks] == [
+        ["one"],
+        ["one", "two\nlines"],
+        ["two\nlines", "three"],
+        ["three", "four"],
+    ]
+    assert [c.lead for c in chunks] == [0, 1, 1, 1]
+    assert [s.line for s in chunks[-1].segments] == [6, 8]
+    assert not chunks[1].owns(1, 1)
+    assert chunks[1].owns(3, 1)
+
+
+def test_small_and_markdown_files_are_one_chunk(tmp_path: "Path"):
+    notes = tmp_path / "notes.md"
+    _ = notes.write_text("One.\n\nTwo.\n")
+    assert [c.lead for c in read_chunks(notes, overlap=2, chunk_size=1)] == [0]
+    assert [s.text for s in next(read_chunks(notes)).segments] == ["One.", "Two."]
+
+
+def test_chunked_memory_stays_flat(tmp_path: "Path"):
+    path = tmp_path / "big.txt"
+    paragraph = "Plain words in a plain paragraph without any tells at all.\n\n"
+    _ = path.write_text(paragraph * 10_000)  # About 600 kB.
+    pipeline = Pipeline(select_rules(["VF", "RM", "FT", "ST003", "ST004"]))
+    tracemalloc.start()
+    try:
+        assert pipeline.analyze_file(path, chunk_size=16 * 1024) == []
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 256 * 1024
+
+
+@pytest.mark.limit_memory("8 MB")
+def test_markdown_memory_stays_near_file_size(tmp_path: "Path"):
+    path = tmp_path / "big.md"
+    block = "Arguably, the `code` in [this](http://x) works.\n\n- One item.\n\n"
+    _ = path.write_text(block * 15_000)  # About 1 MB.
+    pipeline = Pipeline(select_rules(["VF", "RM", "FT", "ST003", "ST006", "ST008"]))
+    findings = pipeline.analyze_file(path)
+    assert sum(f.code == "RM002" for f in findings) == 15_000  # noqa: PLR2004
@@ -0,0 +1,141 @@
+from typing import TYPE_CHECKING
+
+from aitells.analyzer import Analyzer
+from aitells.config import LlmSettings, Settings
+from aitells.density import DENSITY_RULES
+from aitells.documents import PlainTextAdapter, Segment
+from aitells.escalation import (
+    ESCALATION_RULES,
+    Budget,
+    Candidate,
+    Verdict,
+    escalate,
+    estimate_tokens,
+    score_segment,
+)
+from aitells.patterns import PATTERNS
+from aitells.pipeline import Pipeline
+from aitells.rules import Layer, get_rule, select_rules
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from aitells.rules import Rule
+
+HEDGED = "It could be argued that this arguably works, to some extent."
+FLATTERING = "You make a great point, but that's a great question!"
+PLAIN = "The sky is blue."
+
+
+class FakeJudge:
+    """Flags every segment and charges a fixed number of tokens per call."""
+
+    def __init__(self, tokens: int = 500) -> None:
+        self.tokens: int = tokens
+        self.calls: list[tuple[str, str]] = []
+
+    def __call__(self, rule: "Rule", segment: Segment) -> Verdict:
+        self.calls.append((rule.code, segment.text))
+        return Verdict("flagged", self.tokens)
+
+
+def _candidate(score: int, line: int, text: str = PLAIN) -> Candidate:
+    return Candidate(score, "SE005", Segment("a.txt", text, line))
+
+
+def test_escalation_rules_are_catalogued():
+    for code, rule in ESCALATION_RULES.items():
+        assert get_rule(code).layer is Layer.LLM
+        assert all(get_rule(source).layer is not Layer.LLM for source in rule.weights)
+
+
+def test_escalation_sources_are_implemented():
+    # A source without a detector never scores, so its weight would be dead.
+    implemented = PATTERNS.keys() | DENSITY_RULES.keys()
+    for rule in ESCALATION_RULES.values():
+        assert set(rule.weights) <= implemented, rule.code
+
+
+def test_score_segment_applies_weights_and_thresholds():
+    segment = Segment("a.txt", HEDGED, 1)
+    rules = [ESCALATION_RULES["SE005"]]
+    assert score_segment(segment, ["RM002", "VF003"], rules, {}) == []
+    hits = ["RM002", "RM002", "ST003"]
+    assert score_segment(segment, hits, rules, {}) == [Candidate(4, "SE005", segment)]
+    assert score_segment(segment, hits, rules, {"SE005": 5}) == []
+
+
+def test_pipeline_collects_candidates_without_reporting_sources():
+    pipeline = Pipeline(select_rules(["SE"], []))
+    text = f"{HEDGED}\n\n{PLAIN}\n\n{FLATTERING}\n"
+    candidates: list[Candidate] = []
+    segments = PlainTextAdapter().segments("a.txt", text)
+    assert pipeline.analyze_segments(segments, candidates=candidates) == []
+    assert [(c.code, c.segment.line) for c in candidates] == [
+        ("SE005", 1),
+        ("SE003", 5),
+    ]
+
+
+def test_chunked_files_collect_each_candidate_once(tmp_path: "Path"):
+    path = tmp_path / "big.txt"
+    _ = path.write_text(f"{HEDGED}\n\n{PLAIN}\n\n" * 200)
+    pipeline = Pipeline(select_rules(["SE005"], []))
+    whole: list[Candidate] = []
+    chunked: list[Candidate] = []
+    _ = pipeline.analyze_file(path, candidates=whole)
+    _ = pipeline.analyze_file(path, chunk_size=4096, candidates=chunked)
+    assert len(whole) == 200  # noqa: PLR2004
+    assert chunked == whole
+
+
+def test_escalate_ranks_by_score():
+    judge = FakeJudge()
+    candidates = [_candidate(3, 1, "low"), _candidate(7, 9, "high")]
+    result = escalate(candidates, judge, Budget())
+    assert [text for _, text in judge.calls] == ["high", "low"]
+    # Findings still come back in source order.
+    assert [f.line for f in result.findings] == [1, 9]
+    assert result.findings[0].message == "Excessive hedging: flagged"
+    assert (result.judged, result.skipped, result.exhausted) == (2, 0, None)
+
+
+def test_escalate_stops_when_tokens_run_out():
+    judge = FakeJudge(tokens=600)
+    candidates = [_candidate(score, score) for score in range(10, 0, -1)]
+    result = escalate(candidates, judge, Budget(max_tokens=1500))
+    # Two calls leave 300 tokens, less than any further call needs.
+    assert result.judged == 2  # noqa: PLR2004
+    assert result.skipped == 8  # noqa: PLR2004
+    assert (result.tokens, result.exhausted) == (1200, "tokens")
+
+
+def test_escalate_skips_candidates_too_large_for_the_tokens_left():
+    judge = FakeJudge(tokens=100)
+    long = "word " * 2000
+    candidates = [_candidate(9, 1, long), _candidate(5, 2, "short")]
+    result = escalate(candidates, judge, Budget(max_tokens=1000))
+    assert estimate_tokens(candidates[0].segment) > 1000  # noqa: PLR2004
+    assert [text for _, text in judge.calls] == ["short"]
+    assert (result.judged, result.skipped, result.exhausted) == (1, 1, "tokens")
+
+
+def test_escalate_stops_when_seconds_run_out():
+    ticks = iter(range(100))
+    judge = FakeJudge()
+    candidates = [_candidate(score, score) for score in range(5)]
+    result = escalate(
+        candidates, judge, Budget(max_seconds=3), clock=lambda: next(ticks)
+    )
+    assert (result.judged, result.skipped, result.exhausted) == (2, 3, "seconds")
+    assert result.seconds >= 3  # noqa: PLR2004
+
+
+def test_analyzer_escalates_within_the_configured_budget():
+    settings = Settings(select=("SE",), llm=LlmSettings(max_tokens=1))
+    analyzer = Analyzer(settings)
+    candidates: list[Candidate] = []
+    assert analyzer.analyze(HEDGED, candidates=candidates) == []
+    result = analyzer.escalate(candidates, FakeJudge())
+    assert result.findings == []
+    assert (result.judged, result.skipped) == (0, 1)
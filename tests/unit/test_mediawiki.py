@@ -0,0 +1,181 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, ClassVar, override
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from scripts.mediawiki import (
+    BATCH_SIZE,
+    MediaWikiClient,
+    MediaWikiError,
+    page_title,
+    page_url,
+    wikitext_paragraphs,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+PROSE = "It is a sentence of prose about the book. " * 5
+BOOK = {f"Guide/Chapter {n}": f"== Chapter {n} ==\n{PROSE}\n" for n in range(120)}
+PAGES = {
+    "Guide": "'''Guide''' is a book.\n",
+    **BOOK,
+    "Other/Page": PROSE,
+    "Old name": "#REDIRECT [[Guide/Chapter 1]]",
+}
+CATEGORY = ["Guide/Chapter 3", "Other/Page"]
+
+
+class _Wiki(BaseHTTPRequestHandler):
+    """Stand-in for the subset of ``api.php`` that the client uses."""
+
+    requests: ClassVar[list[dict[str, str]]] = []
+
+    def do_GET(self) -> None:
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        type(self).requests.append(params)
+        body = json.dumps(self._query(params)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        _ = self.wfile.write(body)
+
+    def _query(self, params: dict[str, str]) -> dict[str, object]:
+        assert params["action"] == "query"
+        assert params["formatversion"] == "2"
+        if params.get("list") == "allpages":
+            return self._list(
+                "allpages",
+                [t for t in PAGES if t.startswith(params["apprefix"])],
+                params,
+                "ap",
+            )
+        if params.get("list") == "categorymembers":
+            assert params["cmtitle"] == "Category:Guide"
+            return self._list("categorymembers", CATEGORY, params, "cm")
+        return self._revisions(params["titles"].split("|"))
+
+    @staticmethod
+    def _list(
+        key: str, titles: list[str], params: dict[str, str], prefix: str
+    ) -> dict[str, object]:
+        # Serve long lists in pages of 100 to exercise continuation.
+        start = int(params.get(f"{prefix}continue", "0"))
+        result: dict[str, object] = {
+            "query": {key: [{"title": t} for t in titles[start : start + 100]]}
+        }
+        if start + 100 < len(titles):
+            result["continue"] = {f"{prefix}continue": str(start + 100)}
+        return result
+
+    @staticmethod
+    def _revisions(titles: list[str]) -> dict[str, object]:
+        if len(titles) > BATCH_SIZE:
+            return {"error": {"code": "toomanyvalues", "info": "Too many titles"}}
+        normalized = [
+            {"from": t, "to": t[0].upper() + t[1:]} for t in titles if t[0].islower()
+        ]
+        titles = [t[0].upper() + t[1:] for t in titles]
+        redirects = [{"from": "Old name", "to": "Guide/Chapter 1"}]
+        redirects = [r for r in redirects if r["from"] in titles]
+        titles = ["Guide/Chapter 1" if t == "Old name" else t for t in titles]
+        pages = [
+            {"title": t, "revisions": [{"slots": {"main": {"content": PAGES[t]}}}]}
+            if t in PAGES
+            else {"title": t, "missing": True}
+            for t in titles
+        ]
+        return {
+            "query": {"normalized": normalized, "redirects": redirects, "pages": pages}
+        }
+
+    @override
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def client() -> "Iterator[MediaWikiClient]":
+    _Wiki.requests.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Wiki)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield MediaWikiClient(f"http://{host!s}:{port}/w/api.php", user_agent="test")
+    server.shutdown()
+    server.server_close()
+
+
+def test_book_pages_follow_continuation(client: MediaWikiClient):
+    titles = client.book_pages("Guide")
+    assert titles == ["Guide", *BOOK]
+    assert client.requests == 2  # noqa: PLR2004
+    assert _Wiki.requests[1]["apcontinue"] == "100"
+
+
+def test_category_pages(client: MediaWikiClient):
+    assert client.category_pages("Category:Guide") == CATEGORY
+
+
+def test_wikitext_batches_titles(client: MediaWikiClient):
+    pages = client.wikitext(BOOK)
+    assert pages == BOOK
+    assert client.requests == 3  # noqa: PLR2004
+    assert [len(r["titles"].split("|")) for r in _Wiki.requests] == [50, 50, 20]
+    assert 0 < client.bytes_received < len(json.dumps(BOOK)) / 4
+
+
+def test_wikitext_follows_normalization_and_redirects(client: MediaWikiClient):
+    pages = client.wikitext(["guide", "Old name", "Missing", "guide"])
+    assert pages == {"guide": PAGES["Guide"], "Old name": PAGES["Guide/Chapter 1"]}
+    assert client.requests == 1
+
+
+def test_api_errors_raise(client: MediaWikiClient):
+    with pytest.raises(MediaWikiError, match="toomanyvalues"):
+        _ = client._get({"action": "query", "titles": "|".join(BOOK)})  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+
+
+def test_whole_book_in_a_few_round_trips(client: MediaWikiClient):
+    pages = client.wikitext(client.book_pages("Guide"))
+    assert len(pages) == len(BOOK) + 1
+    assert client.requests == 5  # noqa: PLR2004
+
+
+def test_page_titles_and_urls():
+    url = "https://en.wikibooks.org/wiki/Python_Programming/Overview"
+    assert page_title(url) == "Python Programming/Overview"
+    assert page_title("https://en.wikibooks.org/wiki/Cookbook:Bread%27s") == (
+        "Cookbook:Bread's"
+    )
+    assert page_url("Python Programming/Overview") == url
+
+
+def test_wikitext_paragraphs():
+    wikitext = """{{Infobox|name={{PAGENAME}}|language={{w|Python}}}}
+== Overview ==
+'''Python''' is a [[w:Programming language|language]] with
+[[dynamic typing]] by {{w|Guido van Rossum}}.<ref name="a">Citation.</ref> See
+[https://example.org the site].
+[[File:Logo.png|thumb|The [[logo]]]]
+* A list item
+{| class="wikitable"
+| A cell
+|}
+Second <!-- hidden --> paragraph on {{W|ABC (programming language)|ABC}} with
+<code>code</code>.<ref name="a"/>
+
+[[Category:Python]]
+"""
+    assert wikitext_paragraphs(wikitext) == [
+        "Python is a language with dynamic typing by Guido van Rossum. See the site.",
+        "Second paragraph on ABC with code.",
+    ]
@@ -0,0 +1,152 @@
+import json
+from itertools import combinations
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from scripts.near_duplicates import (
+    Deduplicator,
+    LSHIndex,
+    MinHasher,
+    excerpt_body,
+    shingles,
+    similarity,
+)
+
+SAMPLES = Path(__file__).parents[2] / "notebooks" / "samples" / "human_written"
+
+
+def _excerpt(name: str) -> str:
+    return excerpt_body((SAMPLES / name).read_text())
+
+
+def _edit(text: str, every: int = 25) -> str:
+    """Append a letter to every ``every``-th word, as a light copy edit would."""
+    words = text.split()
+    return " ".join(w + "s" if i % every == 0 else w for i, w in enumerate(words))
+
+
+def test_shingles():
+    assert shingles("The cat sat on the mat.", size=4) == {
+        "the cat sat on",
+        "cat sat on the",
+        "sat on the mat",
+    }
+    assert shingles("Short text", size=4) == {"short text"}
+    assert shingles("", size=4) == set()
+
+
+def test_signature_estimates_jaccard_similarity():
+    hasher = MinHasher()
+    words = _excerpt("essay_hazlitt.txt").split()
+    first, second = " ".join(words[:200]), " ".join(words[100:300])
+    shared = shingles(first) & shingles(second)
+    actual = len(shared) / len(shingles(first) | shingles(second))
+    estimate = similarity(hasher.signature(first), hasher.signature(second))
+    assert estimate == pytest.approx(actual, abs=0.1)
+    assert hasher.signature(first) == MinHasher().signature(first)
+
+
+def test_corpus_has_no_near_duplicates():
+    hasher = MinHasher()
+    signatures = [
+        hasher.signature(excerpt_body(p.read_text())) for p in SAMPLES.glob("*.txt")
+    ]
+    assert max(similarity(a, b) for a, b in combinations(signatures, 2)) < 0.1  # noqa: PLR2004
+
+
+def test_index_finds_only_banded_candidates():
+    hasher = MinHasher()
+    index = LSHIndex()
+    for path in SAMPLES.glob("*.txt"):
+        index.add(path.name, hasher.signature(excerpt_body(path.read_text())))
+    edited = hasher.signature(_edit(_excerpt("nature_muir.txt")))
+    assert index.candidates(edited) == {"nature_muir.txt"}
+    match = index.nearest(edited)
+    assert match is not None
+    assert match[0] == "nature_muir.txt"
+    assert index.nearest(edited, exclude="nature_muir.txt") is None
+    index.remove("nature_muir.txt")
+    assert index.candidates(edited) == set()
+
+
+def test_deduplicator_drops_near_duplicates(tmp_path: Path):
+    dedupe = Deduplicator(tmp_path / "signatures.json")
+    _ = dedupe.load(sorted(SAMPLES.glob("*.txt")))
+    match = dedupe.duplicate_of("copy.txt", _edit(_excerpt("essay_thoreau.txt")))
+    assert match is not None
+    assert match[0] == "essay_thoreau.txt"
+    assert "copy.txt" not in dedupe.index.signatures
+    # A refetch of the same sample replaces its own signature.
+    assert (
+        dedupe.duplicate_of("essay_thoreau.txt", _excerpt("essay_thoreau.txt")) is None
+    )
+    assert dedupe.duplicate_of("new.txt", "Entirely different words here.") is None
+    assert "new.txt" in dedupe.index.signatures
+
+
+def test_stored_signatures_skip_rehashing(tmp_path: Path):
+    store = tmp_path / "signatures.json"
+    samples = sorted(SAMPLES.glob("*.txt"))
+    first = Deduplicator(store)
+    assert first.load(samples[:-1]) == len(samples) - 1
+    first.save()
+
+    second = Deduplicator(store)
+    assert second.load(samples) == 1
+    assert second.index.signatures == {
+        **first.index.signatures,
+        samples[-1].name: first.hasher.signature(excerpt_body(samples[-1].read_text())),
+    }
+
+    data = cast("dict[str, dict[str, int]]", json.loads(store.read_text()))
+    data["parameters"]["seed"] += 1
+    _ = store.write_text(json.dumps(data))
+    assert Deduplicator(store).load(samples) == len(samples)
+
+
+def test_changed_samples_are_rehashed(tmp_path: Path):
+    store = tmp_path / "signatures.json"
+    sample = tmp_path / "sample.txt"
+    _ = sample.write_text("# Source: X\n\nThe first version of this excerpt.\n")
+    first = Deduplicator(store)
+    assert first.load([sample]) == 1
+    first.save()
+    assert Deduplicator(store).load([sample]) == 0
+
+    _ = sample.write_text("# Source: X\n\nA second version with other words.\n")
+    second = Deduplicator(store)
+    assert second.load([sample]) == 1
+    assert second.index.signatures["sample.txt"] == second.hasher.signature(
+        "A second version with other words."
+    )
+
+
+def test_rejections_persist(tmp_path: Path):
+    store = tmp_path / "signatures.json"
+    samples = sorted(SAMPLES.glob("*.txt"))
+    first = Deduplicator(store)
+    _ = first.load(samples)
+    assert first.duplicate_of("copy.txt", _edit(_excerpt("essay_thoreau.txt")))
+    first.save()
+
+    second = Deduplicator(store)
+    assert second.load(samples) == 0
+    assert second.is_rejected("copy.txt")
+    assert second.rejected == {"copy.txt": "essay_thoreau.txt"}
+    # A forced refetch that no longer duplicates anything clears the rejection.
+    assert second.duplicate_of("copy.txt", "Entirely different words here.") is None
+    assert not second.is_rejected("copy.txt")
+
+    # Rejections lapse once the duplicated sample leaves the corpus.
+    third = Deduplicator(store)
+    _ = third.load(p for p in samples if p.name != "essay_thoreau.txt")
+    assert not third.is_rejected("copy.txt")
+
+
+def test_excerpt_body_strips_header():
+    assert (
+        excerpt_body("# Source: X\n# URL: y\n\nFirst.\n\nSecond.\n")
+        == "First.\n\nSecond."
+    )
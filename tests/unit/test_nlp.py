@@ -0,0 +1,48 @@
+import pytest
+
+from aitells.nlp import RuleSegmenter, Sentence, sentence_starts
+
+
+def test_sentence_starts():
+    text = 'One. "Two!" Three? four... Five… Six'
+    assert [text[i:] for i in sentence_starts(text)] == [
+        '"Two!" Three? four... Five… Six',
+        "Three? four... Five… Six",
+        "Five… Six",
+        "Six",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "See Dr. Smith today.",
+        "Use a tool, e.g. Python or Ruby.",
+        "Written by J. R. R. Tolkien in 1937.",
+        "Pi is about 3.14 here.",
+        "Mr. and Mrs. Dursley said so.",
+    ],
+)
+def test_abbreviations_and_initials_do_not_end_sentences(text: str):
+    assert list(sentence_starts(text)) == []
+
+
+def test_rule_segmenter_counts_words():
+    text = "It's well-known. Don't stop — ever!  \n Last one"
+    assert RuleSegmenter().sentences(text) == [
+        Sentence(0, 16, 2),
+        Sentence(17, 35, 3),
+        Sentence(39, 47, 2),
+    ]
+
+
+def test_rule_segmenter_splits_a_range_in_place():
+    text = "Before. One two. Three four five.  After."
+    assert RuleSegmenter().sentences(text, 8, 33) == [
+        Sentence(8, 16, 2),
+        Sentence(17, 33, 3),
+    ]
+
+
+def test_rule_segmenter_empty_text():
+    assert RuleSegmenter().sentences("") == []
@@ -0,0 +1,137 @@
+import io
+import json
+from typing import cast
+
+import pytest
+
+from aitells.findings import Finding
+from aitells.output import FORMATS, SarifWriter, Writer, create_writer
+
+# The results of a parsed SARIF run, down to each location's region.
+_Results = list[dict[str, list[dict[str, dict[str, dict[str, int]]]]]]
+
+_FINDINGS = [
+    Finding("docs/a.md", 3, 1, "VF001", "overused-vocabulary", 'Overused: "delve"'),
+    Finding("docs/a.md", 7, 5, "RM002", "hedging-phrases", 'Hedging: "arguably"'),
+]
+
+
+def _run(writer: Writer) -> None:
+    writer.begin()
+    writer.write("docs/a.md", _FINDINGS)
+    writer.write("docs/empty.md", [])
+    writer.write(
+        "docs/b.md", [Finding("docs/b.md", 1, 1, "VF003", "formal-transitions", "x")]
+    )
+    writer.end()
+
+
+def _render(output_format: str) -> str:
+    stream = io.StringIO()
+    _run(create_writer(output_format, stream))
+    return stream.getvalue()
+
+
+def test_text_format():
+    assert _render("text").splitlines()[:2] == [
+        'docs/a.md:3:1: overused-vocabulary - Overused: "delve"',
+        'docs/a.md:7:5: hedging-phrases - Hedging: "arguably"',
+    ]
+
+
+def test_github_format():
+    assert _render("github").splitlines()[0] == (
+        "::warning file=docs/a.md,line=3,col=1,title=overused-vocabulary::"
+        'Overused: "delve"'
+    )
+
+
+def test_github_format_escapes_commands():
+    finding = Finding("a,b:c.md", 1, 1, "VF001", "overused-vocabulary", "50%\r\nnext")
+    stream = io.StringIO()
+    create_writer("github", stream).write(finding.path, [finding])
+    assert stream.getvalue() == (
+        "::warning file=a%2Cb%3Ac.md,line=1,col=1,title=overused-vocabulary::"
+        "50%25%0D%0Anext\n"
+    )
+
+
+def test_writers_must_render():
+    class Incomplete(Writer):  # pyright: ignore[reportImplicitAbstractClass]
+        pass
+
+    with pytest.raises(TypeError, match="render"):
+        _ = Incomplete(io.StringIO())  # pyright: ignore[reportAbstractUsage]
+
+
+def test_json_is_one_document_with_summary():
+    document = cast("dict[str, object]", json.loads(_render("json")))
+    assert document["summary"] == {"files": 3, "findings": 3}
+    assert cast("list[object]", document["findings"])[0] == {
+        "file": "docs/a.md",
+        "line": 3,
+        "column": 1,
+        "code": "VF001",
+        "rule": "overused-vocabulary",
+        "message": 'Overused: "delve"',
+    }
+
+
+@pytest.mark.parametrize("output_format", ["json", "sarif"])
+def test_documents_are_valid_without_findings(output_format: str):
+    stream = io.StringIO()
+    writer = create_writer(output_format, stream)
+    writer.begin()
+    writer.write("docs/empty.md", [])
+    writer.end()
+    _ = cast("object", json.loads(stream.getvalue()))
+
+
+def test_ndjson_streams_records_and_ends_with_summary():
+    records = [
+        cast("dict[str, object]", json.loads(line))
+        for line in _render("ndjson").splitlines()
+    ]
+    assert [record["type"] for record in records] == ["finding"] * 3 + ["summary"]
+    assert records[-1] == {"type": "summary", "files": 3, "findings": 3}
+
+
+def test_ndjson_writes_each_file_before_the_run_ends():
+    stream = io.StringIO()
+    writer = create_writer("ndjson", stream)
+    writer.begin()
+    writer.write("docs/a.md", _FINDINGS)
+    assert len(stream.getvalue().splitlines()) == len(_FINDINGS)
+
+
+def test_sarif_rule_table_lists_rules_with_results():
+    stream = io.StringIO()
+    _run(SarifWriter(stream))
+    log = cast("dict[str, object]", json.loads(stream.getvalue()))
+    run = cast("list[dict[str, object]]", log["runs"])[0]
+    driver = cast("dict[str, dict[str, list[dict[str, str]]]]", run["tool"])["driver"]
+    assert log["version"] == "2.1.0"
+    assert [rule["id"] for rule in driver["rules"]] == ["RM002", "VF001", "VF003"]
+    results = cast("_Results", run["results"])
+    assert results[0]["locations"][0]["physicalLocation"]["region"] == {
+        "startLine": 3,
+        "startColumn": 1,
+    }
+
+
+def test_markdown_sections_only_for_files_with_findings():
+    report = _render("markdown")
+    assert report.startswith("## AI writing analysis\n")
+    assert "### docs/a.md" in report
+    assert "docs/empty.md" not in report
+    assert '- **Line 7**: hedging-phrases - Hedging: "arguably"' in report
+    assert report.endswith("3 findings in 3 files.\n")
+
+
+def test_all_formats_registered():
+    assert set(FORMATS) == {"text", "json", "ndjson", "sarif", "markdown", "github"}
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="yaml"):
+        _ = create_writer("yaml", io.StringIO())
@@ -0,0 +1,41 @@
+from aitells.patterns import PATTERNS, Hit, PatternMatcher
+
+
+def test_scan_reports_hits_in_offset_order():
+    matcher = PatternMatcher(PATTERNS)
+    text = "It's worth noting that we delve deeper. Moreover, it works."
+    hits = list(matcher.scan(text))
+    assert [hit.code for hit in hits] == ["RM002", "VF001", "VF003"]
+    assert hits[0] == Hit("RM002", 0, 17)
+    assert [hit.start for hit in hits] == sorted(hit.start for hit in hits)
+
+
+def test_scan_respects_word_boundaries():
+    matcher = PatternMatcher(["VF001"])
+    assert list(matcher.scan("The realms of realmless delving.")) == [
+        Hit("VF001", 24, 31)
+    ]
+
+
+def test_scan_searches_a_range_in_place():
+    matcher = PatternMatcher(["VF001", "VF003"])
+    text = "We delve.\n\nMoreover, a tapestry.\n\nWe delve."
+    assert list(matcher.scan(text, 11, 32)) == [
+        Hit("VF003", 11, 19),
+        Hit("VF001", 23, 31),
+    ]
+
+
+def test_phrases_match_across_line_breaks():
+    matcher = PatternMatcher(["VF004"])
+    assert [hit.code for hit in matcher.scan("in order\nto win")] == ["VF004"]
+
+
+def test_only_selected_codes_match():
+    matcher = PatternMatcher(["VF003", "ST001"])
+    assert matcher.codes == ("VF003",)
+    assert list(matcher.scan("We delve.")) == []
+
+
+def test_empty_matcher():
+    assert list(PatternMatcher([]).scan("delve")) == []
@@ -0,0 +1,146 @@
+import gc
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aitells import pool
+from aitells.analyzer import Analyzer
+from aitells.config import Settings
+from aitells.output import create_writer
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from aitells.findings import Finding
+
+
+@pytest.fixture
+def files(tmp_path: "Path") -> list[str]:
+    paths: list[str] = []
+    for n in range(20):
+        path = tmp_path / f"doc{n:02}.md"
+        _ = path.write_text("We delve into it.\n\nMoreover, it works.\n" * (n % 3))
+        paths.append(str(path))
+    paths.insert(5, str(tmp_path / "missing.md"))
+    return paths
+
+
+def _summarize(results: list[pool.FileResult]) -> list[tuple[str, object]]:
+    return [
+        (path, result.errno if isinstance(result, OSError) else result)
+        for path, result, _ in results
+    ]
+
+
+@pytest.mark.parametrize("threads", [False, True])
+def test_workers_match_a_serial_run(files: list[str], threads: bool):  # noqa: FBT001
+    analyzer = Analyzer()
+    serial = list(pool.analyze_files(analyzer, files))
+    parallel = list(pool.analyze_files(analyzer, files, jobs=3, threads=threads))
+    assert _summarize(parallel) == _summarize(serial)
+    assert isinstance(serial[5].findings, FileNotFoundError)
+    assert gc.get_freeze_count() == 0
+
+
+def test_thread_workers_share_the_analyzer_and_render(files: list[str]):
+    analyzer = Analyzer()
+    writer = create_writer("json", io.StringIO())
+    seen: set[int] = set()
+    render = writer.render
+
+    def record(path: str, findings: "Sequence[Finding]") -> str:
+        seen.add(threading.get_ident())
+        return render(path, findings)
+
+    results = list(
+        pool.analyze_files(analyzer, files, jobs=3, threads=True, render=record)
+    )
+    assert threading.get_ident() not in seen
+    for path, findings, text in results:
+        if not isinstance(findings, OSError):
+            assert text == writer.render(path, findings)
+
+
+@pytest.mark.parametrize("threads", [False, True])
+def test_unforked_pools_leave_frozen_objects_alone(
+    files: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    threads: bool,  # noqa: FBT001
+):
+    monkeypatch.setattr(pool, "can_fork", lambda: False)
+    gc.freeze()
+    frozen = gc.get_freeze_count()
+    try:
+        _ = list(pool.analyze_files(Analyzer(), files[:8], jobs=2, threads=threads))
+        assert gc.get_freeze_count() == frozen
+    finally:
+        gc.unfreeze()
+
+
+def test_pool_uses_threads_when_the_gil_is_disabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(pool, "free_threaded", lambda: True)
+    executor = pool.create_pool(Analyzer(), 2)
+    executor.shutdown()
+    assert isinstance(executor, ThreadPoolExecutor)
+    assert gc.get_freeze_count() == 0
+
+
+def test_spawn_fallback_builds_analyzer_per_worker(
+    files: list[str], monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(pool, "can_fork", lambda: False)
+    analyzer = Analyzer(Settings(select=("VF001",)))
+    results = list(pool.analyze_files(analyzer, files[:8], jobs=2))
+    assert [result.path for result in results] == files[:8]
+    codes = {f.code for _, r, _ in results if not isinstance(r, OSError) for f in r}
+    assert codes == {"VF001"}
+
+
+def _worker_state() -> tuple[int, int, int]:
+    assert pool._analyzer is not None  # pyright: ignore[reportPrivateUsage]  # noqa: SLF001
+    return os.getpid(), id(pool._analyzer), gc.get_freeze_count()  # pyright: ignore[reportPrivateUsage]  # noqa: SLF001
+
+
+def test_forked_workers_inherit_the_frozen_analyzer():
+    if not pool.can_fork():
+        pytest.skip("fork isn't safe here")
+    analyzer = Analyzer()
+    executor = pool.create_pool(analyzer, 2, threads=False)
+    try:
+        pid, address, frozen = executor.submit(_worker_state).result(30)
+    finally:
+        executor.shutdown()
+        gc.unfreeze()
+    assert pid != os.getpid()
+    # The worker uses the parent's object in place rather than a copy.
+    assert address == id(analyzer)
+    assert frozen > 0
+
+
+def _memory_kib() -> tuple[int, int]:
+    """Return this process's resident and private memory in KiB, after a file."""
+    _ = pool._analyze_file(__file__)  # pyright: ignore[reportPrivateUsage]  # noqa: SLF001
+    fields: dict[str, int] = {}
+    with open("/proc/self/smaps_rollup") as smaps:  # noqa: PTH123
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return fields["Rss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def test_forked_workers_share_most_pages_with_the_parent():
+    if not pool.can_fork() or not os.path.exists("/proc/self/smaps_rollup"):  # noqa: PTH110
+        pytest.skip("needs fork and /proc/self/smaps_rollup")
+    executor = pool.create_pool(Analyzer(), 1, threads=False)
+    try:
+        resident, private = executor.submit(_memory_kib).result(30)
+    finally:
+        executor.shutdown()
+        gc.unfreeze()
+    assert private < resident / 4
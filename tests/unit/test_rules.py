@@ -0,0 +1,37 @@
+import pytest
+
+from aitells.rules import RULES, UnknownRuleError, get_rule, select_rules
+
+
+def test_codes_and_names_are_unique():
+    assert len({rule.code for rule in RULES}) == len(RULES)
+    assert len({rule.name for rule in RULES}) == len(RULES)
+
+
+def test_get_rule_by_code_or_name():
+    assert get_rule("st003") is get_rule("hedge-stacking")
+    assert get_rule("ST003").prefix == "ST"
+
+
+def test_get_rule_unknown():
+    with pytest.raises(UnknownRuleError, match="XX999"):
+        _ = get_rule("XX999")
+
+
+def test_default_selection_excludes_semantic_rules():
+    codes = {rule.prefix for rule in select_rules()}
+    assert codes == {"VF", "RM", "FT", "ST"}
+
+
+def test_select_and_ignore():
+    rules = select_rules(["ST", "SE001"], ["ST003", "triads"])
+    codes = [rule.code for rule in rules]
+    assert "SE001" in codes
+    assert "ST002" in codes
+    assert "ST001" not in codes
+    assert "ST003" not in codes
+
+
+def test_select_unknown_prefix():
+    with pytest.raises(UnknownRuleError):
+        _ = select_rules(["ZZ"])
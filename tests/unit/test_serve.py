@@ -0,0 +1,314 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.client import HTTPConnection
+from typing import TYPE_CHECKING, cast
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from aitells import serve
+from aitells.config import Settings
+from aitells.serve import AnalysisServer, Batcher, QueueFullError, ShutdownError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from http.client import HTTPResponse
+
+    from aitells.findings import Finding
+
+TEXT = "We delve into the tapestry.\n\nMoreover, it's worth noting the results.\n"
+
+
+@pytest.fixture
+def executor() -> "Iterator[ThreadPoolExecutor]":
+    with ThreadPoolExecutor(
+        max_workers=1, initializer=serve.start_worker, initargs=(Settings(),)
+    ) as pool:
+        yield pool
+
+
+@pytest.fixture
+def server(executor: ThreadPoolExecutor) -> "Iterator[AnalysisServer]":
+    batcher = Batcher(executor, slots=1)
+    server = AnalysisServer(("127.0.0.1", 0), batcher, log_requests=False)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    batcher.close()
+
+
+def _open(request: Request) -> "HTTPResponse":
+    return cast("HTTPResponse", urlopen(request))  # noqa: S310
+
+
+def _request(
+    server: AnalysisServer, path: str, body: bytes | None = None, **headers: str
+) -> tuple[int, dict[str, object]]:
+    host, port = server.server_address[:2]
+    request = Request(f"http://{host!s}:{port}{path}", body, headers)
+    try:
+        with _open(request) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_health(server: AnalysisServer):
+    assert _request(server, "/health") == (HTTPStatus.OK, {"status": "ok"})
+
+
+def test_analyze_json(server: AnalysisServer):
+    body = json.dumps({"text": TEXT, "path": "doc.md"}).encode()
+    status, result = _request(
+        server, "/analyze", body, **{"Content-Type": "application/json"}
+    )
+    assert status == HTTPStatus.OK
+    findings = cast("list[dict[str, object]]", result["findings"])
+    assert [f["code"] for f in findings] == ["VF001", "VF001", "VF003", "RM002"]
+    assert {f["file"] for f in findings} == {"doc.md"}
+    assert result["summary"] == {"files": 1, "findings": 4}
+
+
+def test_analyze_raw_file(server: AnalysisServer):
+    text = "```\nWe delve.\n```\n\nPlain prose.\n"
+    status, result = _request(server, "/analyze?path=doc.md", text.encode())
+    assert (status, result["findings"]) == (HTTPStatus.OK, [])
+    status, result = _request(server, "/analyze?path=doc.txt", text.encode())
+    assert status == HTTPStatus.OK
+    assert result["summary"] == {"files": 1, "findings": 1}
+
+
+@pytest.mark.parametrize(
+    "body", [b"not json", b"[]", b'{"text": 1}', b'{"text": "x", "path": 2}']
+)
+def test_analyze_rejects_bad_json(server: AnalysisServer, body: bytes):
+    status, result = _request(
+        server, "/analyze", body, **{"Content-Type": "application/json"}
+    )
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "error" in result
+
+
+def _post_raw(server: AnalysisServer, body: bytes, length: str | None) -> int:
+    """POST ``body`` with ``length`` as its raw ``Content-Length`` header."""
+    host, port = server.server_address[:2]
+    connection = HTTPConnection(str(host), port, timeout=5)
+    try:
+        connection.putrequest("POST", "/analyze")
+        if length is not None:
+            connection.putheader("Content-Length", length)
+        connection.endheaders(body)
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(
+    ("length", "status"),
+    [
+        (None, HTTPStatus.LENGTH_REQUIRED),
+        ("many", HTTPStatus.BAD_REQUEST),
+        ("-1", HTTPStatus.BAD_REQUEST),
+        ("+4", HTTPStatus.BAD_REQUEST),
+    ],
+)
+def test_analyze_requires_a_valid_content_length(
+    server: AnalysisServer, length: str | None, status: HTTPStatus
+):
+    assert _post_raw(server, b"text", length) == status
+
+
+def test_analyze_refuses_bodies_over_the_limit(server: AnalysisServer):
+    server.max_body = 4
+    assert _post_raw(server, b"text", "4") == HTTPStatus.OK
+    assert _post_raw(server, b"texts", "5") == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+def test_unknown_path(server: AnalysisServer):
+    assert _request(server, "/missing")[0] == HTTPStatus.NOT_FOUND
+    assert _request(server, "/missing", b"")[0] == HTTPStatus.NOT_FOUND
+
+
+def test_concurrent_documents_share_a_batch(
+    executor: ThreadPoolExecutor, monkeypatch: pytest.MonkeyPatch
+):
+    batches: list[int] = []
+    analyze = serve.analyze_batch
+
+    def record(documents: "Sequence[tuple[str, str]]") -> "list[list[Finding]]":
+        batches.append(len(documents))
+        return analyze(documents)
+
+    monkeypatch.setattr(serve, "analyze_batch", record)
+    batcher = Batcher(executor, slots=1, batch_size=8, max_latency=1.0)
+    futures = [batcher.submit(text) for text in ("We delve.", "Nothing.", TEXT)]
+    results = [future.result(5) for future in futures]
+    batcher.close()
+    assert batches == [3]
+    assert [len(findings) for findings in results] == [1, 0, 4]
+
+
+def test_full_batch_dispatches_without_waiting(executor: ThreadPoolExecutor):
+    batcher = Batcher(executor, slots=1, batch_size=2, max_latency=60.0)
+    futures = [batcher.submit("We delve.") for _ in range(2)]
+    assert all(len(future.result(5)) == 1 for future in futures)
+    batcher.close()
+
+
+def test_full_queue_is_refused(
+    executor: ThreadPoolExecutor, monkeypatch: pytest.MonkeyPatch
+):
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(documents: "Sequence[tuple[str, str]]") -> "list[list[Finding]]":
+        started.set()
+        _ = release.wait(5)
+        return [[] for _ in documents]
+
+    monkeypatch.setattr(serve, "analyze_batch", block)
+    batcher = Batcher(executor, slots=1, batch_size=1, max_latency=0, queue_size=1)
+    running = batcher.submit("first")
+    assert started.wait(5)
+    # The only slot is busy, so the dispatcher holds the next document while
+    # waiting for it, and one more fills the queue.
+    held = batcher.submit("second")
+    queued = None
+    for _ in range(100):
+        try:
+            queued = batcher.submit("third")
+            break
+        except QueueFullError:
+            _ = release.wait(0.01)
+    assert queued is not None
+    with pytest.raises(QueueFullError):
+        _ = batcher.submit("fourth")
+    release.set()
+    assert running.result(5) == held.result(5) == queued.result(5) == []
+    batcher.close()
+
+
+def test_server_returns_429_when_queue_is_full(
+    executor: ThreadPoolExecutor, monkeypatch: pytest.MonkeyPatch
+):
+    def refuse(_text: str, _path: str) -> object:
+        raise QueueFullError
+
+    batcher = Batcher(executor, slots=1)
+    monkeypatch.setattr(batcher, "submit", refuse)
+    server = AnalysisServer(("127.0.0.1", 0), batcher, log_requests=False)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        request = Request(f"http://{host!s}:{port}/analyze", b"text")
+        with pytest.raises(HTTPError) as raised:
+            _open(request).close()
+        assert raised.value.code == HTTPStatus.TOO_MANY_REQUESTS
+        assert raised.value.headers["Retry-After"] == "1"
+        raised.value.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+def test_server_returns_503_when_a_batch_stalls(
+    executor: ThreadPoolExecutor, monkeypatch: pytest.MonkeyPatch
+):
+    release = threading.Event()
+
+    def stall(documents: "Sequence[tuple[str, str]]") -> "list[list[Finding]]":
+        _ = release.wait(5)
+        return [[] for _ in documents]
+
+    monkeypatch.setattr(serve, "analyze_batch", stall)
+    monkeypatch.setattr(serve, "REQUEST_TIMEOUT", 0.05)
+    batcher = Batcher(executor, slots=1)
+    server = AnalysisServer(("127.0.0.1", 0), batcher, log_requests=False)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        request = Request(f"http://{host!s}:{port}/analyze", b"text")
+        with pytest.raises(HTTPError) as raised:
+            _open(request).close()
+        assert raised.value.code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert raised.value.headers["Retry-After"] == "1"
+        assert json.loads(raised.value.read()) == {"error": "Analysis timed out"}
+        raised.value.close()
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+def test_closed_batcher_refuses_documents(executor: ThreadPoolExecutor):
+    batcher = Batcher(executor, slots=1)
+    batcher.close()
+    with pytest.raises(ShutdownError):
+        _ = batcher.submit("We delve.")
+
+
+def test_close_dispatches_queued_documents(
+    executor: ThreadPoolExecutor, monkeypatch: pytest.MonkeyPatch
+):
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(documents: "Sequence[tuple[str, str]]") -> "list[list[Finding]]":
+        started.set()
+        _ = release.wait(5)
+        return [[] for _ in documents]
+
+    monkeypatch.setattr(serve, "analyze_batch", block)
+    batcher = Batcher(executor, slots=1, batch_size=1, max_latency=0)
+    futures = [batcher.submit("first")]
+    assert started.wait(5)
+    futures += [batcher.submit("second"), batcher.submit("third")]
+    closing = threading.Thread(target=batcher.close)
+    closing.start()
+    # Release the worker only once the batcher refuses new documents, so the
+    # queued ones are still waiting when it starts closing.
+    for _ in range(500):
+        try:
+            futures.append(batcher.submit("late"))
+        except ShutdownError:
+            break
+        _ = release.wait(0.01)
+    release.set()
+    closing.join(5)
+    assert not closing.is_alive()
+    assert all(future.result(5) == [] for future in futures)
+
+
+def test_worker_errors_reach_every_document(
+    executor: ThreadPoolExecutor, monkeypatch: pytest.MonkeyPatch
+):
+    def fail(_documents: "Sequence[tuple[str, str]]") -> "list[list[Finding]]":
+        raise ValueError
+
+    monkeypatch.setattr(serve, "analyze_batch", fail)
+    batcher = Batcher(executor, slots=1, max_latency=1.0, batch_size=2)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    for future in futures:
+        with pytest.raises(ValueError):  # noqa: PT011
+            _ = future.result(5)
+    batcher.close()
+
+
+def test_process_pool_workers():
+    executor = serve.create_executor(Settings(select=("VF001",)), workers=1)
+    batcher = Batcher(executor, slots=1)
+    try:
+        findings = batcher.submit(TEXT).result(60)
+    finally:
+        batcher.close()
+        executor.shutdown()
+    assert [f.code for f in findings] == ["VF001", "VF001"]
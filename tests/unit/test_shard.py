@@ -0,0 +1,113 @@
+import io
+import json
+from typing import cast
+
+import pytest
+
+from aitells.findings import Finding
+from aitells.output import create_writer, finding_to_dict
+from aitells.shard import ReportError, Shard, parse_report, parse_shard, shard_files
+
+# The results of a parsed SARIF run, down to each location's region.
+_Results = list[dict[str, list[dict[str, dict[str, dict[str, int]]]]]]
+
+_SIZES = {f"doc{n}.md": size for n, size in enumerate([90, 10, 40, 40, 30, 70, 5, 5])}
+_FINDINGS = [
+    Finding("a.md", 3, 1, "VF001", "overused-vocabulary", 'Overused: "delve"'),
+    Finding("b.md", 1, 4, "RM002", "hedging-phrases", 'Hedging: "arguably"'),
+]
+
+
+def _shards(count: int, paths: list[str] | None = None) -> list[list[str]]:
+    return [
+        shard_files(paths or list(_SIZES), Shard(index, count), _SIZES.__getitem__)
+        for index in range(1, count + 1)
+    ]
+
+
+def test_parse_shard():
+    assert parse_shard("3/8") == Shard(3, 8)
+    for value in ("0/8", "9/8", "3", "a/b", "1/0"):
+        with pytest.raises(ValueError, match="Invalid shard"):
+            _ = parse_shard(value)
+
+
+def test_shards_partition_the_files():
+    shards = _shards(3)
+    assert sorted(path for shard in shards for path in shard) == sorted(_SIZES)
+    # Each shard keeps the discovery order.
+    assert all(shard == sorted(shard, key=list(_SIZES).index) for shard in shards)
+
+
+def test_shards_are_balanced_by_size():
+    totals = [sum(_SIZES[path] for path in shard) for shard in _shards(3)]
+    assert sorted(totals) == [95, 95, 100]
+
+
+def test_shards_ignore_discovery_order():
+    assert _shards(3) == [
+        sorted(shard, key=list(_SIZES).index)
+        for shard in _shards(3, sorted(_SIZES, reverse=True))
+    ]
+
+
+def test_more_shards_than_files():
+    shards = _shards(10)
+    assert sum(map(len, shards)) == len(_SIZES)
+    assert shards[-1] == []
+
+
+def _render(output_format: str, files: int = 3) -> str:
+    stream = io.StringIO()
+    writer = create_writer(output_format, stream)
+    writer.begin()
+    writer.write("a.md", _FINDINGS[:1])
+    writer.write("b.md", _FINDINGS[1:])
+    writer.count_clean(files - 2)
+    writer.end()
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "sarif"])
+def test_parse_report_round_trips(output_format: str):
+    report = parse_report(_render(output_format))
+    assert report.findings == _FINDINGS
+    assert report.files == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "sarif"])
+def test_parse_empty_report(output_format: str):
+    stream = io.StringIO()
+    writer = create_writer(output_format, stream)
+    writer.begin()
+    writer.end()
+    report = parse_report(stream.getvalue())
+    assert (report.files, report.findings) == (0, [])
+
+
+def test_sarif_from_other_tools_counts_files_with_results():
+    log = cast("dict[str, list[dict[str, object]]]", json.loads(_render("sarif")))
+    del log["runs"][0]["properties"]
+    assert parse_report(json.dumps(log)).files == 2  # noqa: PLR2004
+
+
+def test_sarif_column_defaults_to_1():
+    log = cast("dict[str, list[dict[str, object]]]", json.loads(_render("sarif")))
+    for result in cast("_Results", log["runs"][0]["results"]):
+        del result["locations"][0]["physicalLocation"]["region"]["startColumn"]
+    assert {f.column for f in parse_report(json.dumps(log)).findings} == {1}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[]",
+        '{"findings": [{"file": "a.md"}], "summary": {"files": 1}}',
+        '{"type": "finding", "file": "a.md"}\nnot json\n',
+        # Findings without the closing summary record: a truncated run.
+        json.dumps({"type": "finding", **finding_to_dict(_FINDINGS[0])}) + "\n",
+    ],
+)
+def test_parse_report_rejects_malformed_reports(text: str):
+    with pytest.raises(ReportError):
+        _ = parse_report(text)
@@ -0,0 +1,86 @@
+from typing import TYPE_CHECKING
+
+from aitells.density import Unit
+from aitells.documents import MarkdownAdapter, PlainTextAdapter, read_segments
+from aitells.pipeline import Pipeline
+from aitells.rules import select_rules
+from aitells.uniformity import UniformityCounter, UniformityRule
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+RULE = UniformityRule("ST006", Unit.SENTENCE, window=3, max_variation=0.2)
+
+
+def test_counter_reports_start_of_uniform_run():
+    counter = UniformityCounter([RULE])
+    assert counter.sentence(10) == []
+    assert counter.sentence(11) == []
+    assert counter.sentence(10) == [("ST006", "3 sentences of 10 to 11 words")]
+    assert counter.sentence(12) == []
+    assert counter.sentence(3) == []
+    assert counter.paragraph(10) == []
+
+
+def test_counter_reports_again_after_varied_window():
+    counter = UniformityCounter([RULE])
+    lengths = [10, 10, 10, 30, 10, 10, 10]
+    results = [counter.sentence(length) for length in lengths]
+    assert [bool(result) for result in results] == [
+        False,
+        False,
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_counter_ignores_empty_windows():
+    counter = UniformityCounter([RULE])
+    assert [counter.sentence(0) for _ in range(4)] == [[], [], [], []]
+
+
+def _sentence(words: int) -> str:
+    return " ".join(["word"] * words).capitalize() + "."
+
+
+def test_sentence_uniformity_in_pipeline():
+    pipeline = Pipeline(select_rules(["ST006"]))
+    assert pipeline.segmenter is not None
+    assert Pipeline(select_rules(["VF", "ST003"])).segmenter is not None
+    assert Pipeline(select_rules(["VF", "ST004"])).segmenter is None
+    uniform = " ".join(_sentence(12) for _ in range(8))
+    varied = " ".join(_sentence(n) for n in (3, 20, 8, 15, 4, 25, 30, 2))
+    text = f"{varied}\n\n{uniform}\n"
+    findings = pipeline.analyze_segments(PlainTextAdapter().segments("a.txt", text))
+    assert [(f.line, f.code, f.message) for f in findings] == [
+        (
+            3,
+            "ST006",
+            "Low variance in sentence length: 8 sentences of 12 to 12 words",
+        )
+    ]
+
+
+def test_paragraph_uniformity_skips_headings():
+    pipeline = Pipeline(select_rules(["ST008"]))
+    paragraph = _sentence(30)
+    text = "\n\n".join(f"# Heading {i}\n\n{paragraph}" for i in range(5))
+    findings = pipeline.analyze_segments(MarkdownAdapter().segments("a.md", text))
+    assert [(f.line, f.code) for f in findings] == [(19, "ST008")]
+
+
+def test_chunked_uniformity_matches_whole_file(tmp_path: "Path"):
+    path = tmp_path / "book.txt"
+    lengths = [12, 12, 13, 12, 30, 4, 12, 12, 11, 12, 12, 12, 2, 40]
+    paragraphs = [
+        " ".join(_sentence(n) for n in lengths[i : i + 3]) for i in range(len(lengths))
+    ]
+    _ = path.write_text("\n\n".join(paragraphs * 20) + "\n")
+    pipeline = Pipeline(select_rules())
+    expected = pipeline.analyze_segments(read_segments(path))
+    assert {f.code for f in expected} >= {"ST006", "ST008"}
+    for chunk_size in (1, 100, 1000):
+        assert pipeline.analyze_file(path, chunk_size=chunk_size) == expected
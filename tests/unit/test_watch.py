@@ -0,0 +1,194 @@
+import os
+import sys
+from typing import TYPE_CHECKING, override
+
+import pytest
+
+from aitells.cli import EXIT_OK, main
+from aitells.config import PathSettings
+from aitells.discovery import FileFinder
+from aitells.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    Session,
+    Watcher,
+    collect,
+    create_watcher,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+
+class FakeWatcher:
+    def __init__(self, *batches: set[str]) -> None:
+        self.batches: list[set[str]] = list(batches)
+        self.timeouts: list[float | None] = []
+
+    def wait(self, timeout: float | None) -> set[str]:
+        self.timeouts.append(timeout)
+        return self.batches.pop(0) if self.batches else set()
+
+    def close(self) -> None:
+        pass
+
+
+def _bump(path: "Path") -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def project(tmp_path: "Path") -> "Path":
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "node_modules").mkdir()
+    _ = (tmp_path / "docs" / "guide.md").write_text("Plain.\n")
+    _ = (tmp_path / "node_modules" / "dep.md").write_text("Plain.\n")
+    return tmp_path
+
+
+@pytest.fixture
+def finder(project: "Path") -> FileFinder:
+    return FileFinder(PathSettings(), project)
+
+
+def test_collect_folds_a_burst_into_one_batch():
+    watcher = FakeWatcher({"a"}, {"b"}, {"a", "c"}, set(), {"d"})
+    assert collect(watcher, debounce=0.1) == {"a", "b", "c"}
+    assert watcher.timeouts == [None, 0.1, 0.1, 0.1]
+
+
+def test_collect_times_out_empty():
+    assert collect(FakeWatcher(), debounce=0.1, timeout=0) == set()
+
+
+def test_session_analyzes_only_watched_existing_files(
+    project: "Path", finder: FileFinder
+):
+    guide = str(project / "docs" / "guide.md")
+    events = {
+        guide,
+        str(project / "docs" / "deleted.md"),
+        str(project / "node_modules" / "dep.md"),
+        str(project / "docs" / "image.png"),
+    }
+    batches: list[Sequence[str]] = []
+    session = Session(finder, [str(project)], batches.append, FakeWatcher(events))
+    assert session.step(timeout=0) == [guide]
+    assert batches == [[guide]]
+
+
+def test_session_skips_empty_batches(project: "Path", finder: FileFinder):
+    batches: list[Sequence[str]] = []
+    session = Session(finder, [str(project)], batches.append, FakeWatcher())
+    assert session.step(timeout=0) == []
+    assert batches == []
+
+
+def test_polling_watcher_reports_changes(project: "Path", finder: FileFinder):
+    watcher = PollingWatcher(finder, [str(project)], interval=0.01)
+    guide = project / "docs" / "guide.md"
+    new = project / "docs" / "new.md"
+    _bump(guide)
+    _ = new.write_text("New.\n")
+    _bump(project / "node_modules" / "dep.md")
+    assert watcher.wait(timeout=1) == {str(guide), str(new)}
+    guide.unlink()
+    assert watcher.wait(timeout=1) == {str(guide)}
+    assert watcher.wait(timeout=0.02) == set()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+def test_inotify_watcher_reports_writes_and_new_directories(
+    project: "Path", finder: FileFinder
+):
+    watcher = create_watcher(finder, [str(project)])
+    assert isinstance(watcher, InotifyWatcher)
+    try:
+        guide = project / "docs" / "guide.md"
+        _ = guide.write_text("Changed.\n")
+        assert str(guide) in collect(watcher, debounce=0.05, timeout=2)
+
+        _ = (project / "node_modules" / "dep.md").write_text("Changed.\n")
+        assert collect(watcher, debounce=0.05, timeout=0.1) == set()
+
+        nested = project / "docs" / "nested"
+        nested.mkdir()
+        assert collect(watcher, debounce=0.05, timeout=0.1) == set()
+        page = nested / "page.md"
+        _ = page.write_text("New.\n")
+        assert str(page) in collect(watcher, debounce=0.05, timeout=2)
+    finally:
+        watcher.close()
+
+
+@pytest.mark.parametrize(
+    "poll",
+    [
+        True,
+        pytest.param(
+            False,
+            marks=pytest.mark.skipif(
+                not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+            ),
+        ),
+    ],
+)
+def test_watchers_skip_gitignored_files(project: "Path", poll: bool):  # noqa: FBT001
+    (project / ".git").mkdir()
+    _ = (project / ".gitignore").write_text("gen/\n")
+    (project / "gen").mkdir()
+    generated = project / "gen" / "b.md"
+    _ = generated.write_text("Plain.\n")
+    finder = FileFinder(PathSettings(), project)
+    paths = [str(project)]
+    assert str(generated) not in finder.discover(paths)
+    watcher = create_watcher(finder, paths, poll=poll)
+    assert isinstance(watcher, PollingWatcher if poll else InotifyWatcher)
+    session = Session(finder, paths, lambda _: None, watcher, debounce=0.05)
+    guide = project / "docs" / "guide.md"
+
+    def change(path: "Path") -> None:
+        # Inotify reports the write; the poller needs the later mtime.
+        _ = path.write_text("Changed.\n")
+        _bump(path)
+
+    try:
+        change(generated)
+        assert session.step(timeout=0.2) == []
+        change(guide)
+        change(generated)
+        (project / "gen" / "new").mkdir()
+        _ = (project / "gen" / "new" / "c.md").write_text("New.\n")
+        assert session.step(timeout=2) == [str(guide)]
+    finally:
+        watcher.close()
+
+
+def test_create_watcher_can_force_polling(project: "Path", finder: FileFinder):
+    watcher: Watcher = create_watcher(finder, [str(project)], poll=True)
+    assert isinstance(watcher, PollingWatcher)
+
+
+def test_watch_command_runs_initial_check(
+    project: "Path", monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    class Interrupt(FakeWatcher):
+        @override
+        def wait(self, timeout: float | None) -> set[str]:
+            del timeout
+            raise KeyboardInterrupt
+
+    _ = (project / "docs" / "tells.md").write_text("We delve.\n")
+
+    def create_watcher(*_args: object, **_kwargs: object) -> Interrupt:
+        return Interrupt()
+
+    monkeypatch.setattr("aitells.watch.create_watcher", create_watcher)
+    assert main(["watch", str(project / "docs")]) == EXIT_OK
+    captured = capsys.readouterr()
+    assert "tells.md:1:4: overused-vocabulary" in captured.out
+    assert "checked 2 files, 1 finding" in captured.err